@@ -0,0 +1,219 @@
+"""
+Per-host circuit breakers and adaptive read timeouts for upstream providers.
+Installed as a transport wrapper on the shared clients (app.http_client), so every fetcher that
+goes through get_client() is covered: RSS / Nitter / Apify / YouTube / article pages.
+
+- Closed: requests go through; outcomes and latencies are recorded per host.
+- Open: after circuit_failure_threshold consecutive failures, or an error rate of at least
+  circuit_error_rate over the last circuit_window requests, requests fail immediately with
+  CircuitOpenError for circuit_open_seconds.
+- Half-open: after that, a single probe request is let through; success closes the circuit,
+  failure opens it again.
+
+Once a host has enough samples, requests that use the client's default timeout get a read
+timeout of p99 latency * adaptive_timeout_multiplier (at least adaptive_timeout_min_seconds, never
+more than the default). Requests with an explicit timeout are left alone, and a read timeout
+caused by a tightened deadline is not counted as a host failure.
+
+Long polls opt out explicitly with extensions=NO_ADAPTIVE_TIMEOUT (their latency is the server's
+wait, not the host's health).
+
+CircuitOpenError subclasses httpx.TransportError, so existing `except httpx.HTTPError` handlers
+treat an open circuit like any other network failure.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+
+import httpx
+
+from app.config import settings
+
+# Latencies kept per host for the p99 estimate; hosts need this many before timeouts adapt
+_LATENCY_SAMPLES = 200
+_MIN_LATENCY_SAMPLES = 20
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# Request extension: pass extensions=NO_ADAPTIVE_TIMEOUT to keep the caller's read timeout as is
+ADAPTIVE_TIMEOUT_EXTENSION = "adaptive_timeout"
+NO_ADAPTIVE_TIMEOUT = {ADAPTIVE_TIMEOUT_EXTENSION: False}
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request to a host whose circuit is open."""
+
+
+class HostBreaker:
+    """Breaker state and latency stats for one upstream host (thread-safe)."""
+
+    __slots__ = (
+        "host", "state", "opened_at", "consecutive_failures", "outcomes", "latencies",
+        "probe_in_flight", "_lock",
+    )
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self.outcomes: deque[bool] = deque(maxlen=max(1, settings.circuit_window))
+        self.latencies: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self.probe_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a request may be sent now (in half-open, only one probe at a time)."""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN:
+                if time.monotonic() - self.opened_at < settings.circuit_open_seconds:
+                    return False
+                self.state = HALF_OPEN
+            if self.probe_in_flight:
+                return False
+            self.probe_in_flight = True
+            return True
+
+    def release_probe(self) -> None:
+        with self._lock:
+            self.probe_in_flight = False
+
+    def _open(self) -> None:
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.probe_in_flight = False
+
+    def record(self, ok: bool, latency: float | None = None) -> None:
+        with self._lock:
+            if latency is not None:
+                self.latencies.append(latency)
+            if self.state == HALF_OPEN:
+                self.probe_in_flight = False
+                if ok:
+                    self.state = CLOSED
+                    self.consecutive_failures = 0
+                    self.outcomes.clear()
+                else:
+                    self._open()
+                return
+            self.outcomes.append(ok)
+            self.consecutive_failures = 0 if ok else self.consecutive_failures + 1
+            if self.state != CLOSED:
+                return
+            if self.consecutive_failures >= settings.circuit_failure_threshold:
+                self._open()
+                return
+            if len(self.outcomes) >= settings.circuit_min_requests:
+                errors = self.outcomes.count(False)
+                if errors / len(self.outcomes) >= settings.circuit_error_rate:
+                    self._open()
+
+    def p99(self) -> float | None:
+        with self._lock:
+            if len(self.latencies) < _MIN_LATENCY_SAMPLES:
+                return None
+            ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+
+    def read_timeout(self, requested: float | None) -> float | None:
+        """Adaptive read timeout for this host, capped by the caller's own timeout."""
+        p99 = self.p99()
+        if p99 is None:
+            return requested
+        adaptive = max(settings.adaptive_timeout_min_seconds, p99 * settings.adaptive_timeout_multiplier)
+        return adaptive if requested is None else min(requested, adaptive)
+
+    def snapshot(self) -> dict:
+        p99 = self.p99()
+        with self._lock:
+            total = len(self.outcomes)
+            return {
+                "state": self.state,
+                "requests": total,
+                "error_rate": round(self.outcomes.count(False) / total, 3) if total else 0.0,
+                "consecutive_failures": self.consecutive_failures,
+                "p99_seconds": round(p99, 3) if p99 is not None else None,
+            }
+
+
+_breakers: dict[str, HostBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(host: str) -> HostBreaker:
+    host = (host or "").lower()
+    breaker = _breakers.get(host)
+    if breaker is not None:
+        return breaker
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = HostBreaker(host)
+            _breakers[host] = breaker
+        return breaker
+
+
+def breaker_stats() -> dict[str, dict]:
+    """Current state per upstream host (for /health/upstreams)."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.host: b.snapshot() for b in breakers}
+
+
+def _is_failure(status_code: int) -> bool:
+    return status_code >= 500 or status_code == 429
+
+
+class BreakerTransport(httpx.BaseTransport):
+    """
+    Wraps an httpx transport with the per-host breaker and adaptive read timeout.
+    default_timeout must be the wrapping client's timeout: only requests still using it are
+    tightened (httpx.Client's own default when not given).
+    """
+
+    def __init__(self, transport: httpx.BaseTransport, default_timeout: httpx.Timeout | None = None) -> None:
+        self._transport = transport
+        self._default_timeout = (default_timeout or httpx.Timeout(5.0)).as_dict()
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        if not settings.circuit_breaker_enabled:
+            return self._transport.handle_request(request)
+        breaker = get_breaker(request.url.host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {breaker.host}", request=request)
+        tightened = False
+        timeout = dict(request.extensions.get("timeout") or {})
+        adaptive = request.extensions.get(ADAPTIVE_TIMEOUT_EXTENSION, True)
+        if adaptive and timeout and timeout == self._default_timeout:
+            read = breaker.read_timeout(timeout.get("read"))
+            if read != timeout.get("read"):
+                request.extensions["timeout"] = {**timeout, "read": read}
+                tightened = True
+        start = time.monotonic()
+        try:
+            response = self._transport.handle_request(request)
+        except httpx.ReadTimeout:
+            if tightened:
+                # Our own deadline, not evidence that the host is unhealthy
+                breaker.release_probe()
+            else:
+                breaker.record(False)
+            raise
+        except httpx.TransportError:
+            breaker.record(False)
+            raise
+        except BaseException:
+            # Not the host's fault (e.g. cancelled): record nothing, but free a half-open probe
+            breaker.release_probe()
+            raise
+        # Latency to response headers; bodies are streamed by the caller. Opted-out requests
+        # (long polls) are not latency samples, or they would inflate p99 for ordinary calls.
+        breaker.record(not _is_failure(response.status_code), time.monotonic() - start if adaptive else None)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
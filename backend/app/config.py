@@ -24,12 +24,93 @@ class Settings(BaseSettings):
 
     # YouTube Data API v3 (metadata for YouTube; get key at https://console.cloud.google.com/apis/credentials)
     youtube_api_key: str = ""
+    # Daily YouTube Data API units (Google default 10000); background work leaves the reserve for users
+    youtube_daily_quota: int = 10000
+    youtube_quota_interactive_reserve: int = 2000
+    # Usage is written to the database at most this often (and on day rollover / shutdown)
+    youtube_quota_persist_interval_seconds: float = 30.0
 
     # Nitter instance for X/Twitter RSS (e.g. https://nitter.net or https://nitter.mint.lgbt)
     nitter_base_url: str = "https://nitter.net"
+    # Optional pool of instances (comma-separated), ranked by health and latency; overrides nitter_base_url
+    nitter_base_urls: str = ""
+    # Send a hedged request to the next-best instance if the first has not answered after N seconds
+    nitter_hedge_after_seconds: float = 1.5
 
     # Apify (e.g. for LinkedIn profile posts). Get token at https://console.apify.com/account/integrations
     apify_api_token: str = ""
+    # LinkedIn profiles requested within this window share one Apify run (up to max profiles)
+    apify_batch_window_seconds: float = 0.5
+    apify_batch_max_profiles: int = 50
+    # How long to wait for an asynchronous Apify run to finish
+    apify_run_max_wait_seconds: float = 180.0
+    # Apify actor runs in flight at once across the process (each holds an Apify memory allocation)
+    apify_max_concurrent_runs: int = 8
+    # Posts per LinkedIn profile per run. Apify bills per result, so every extra post multiplies
+    # the cost of each target; only raise it if profiles post more than once between polls
+    apify_linkedin_max_posts: int = 1
+
+    # Concurrent source fetching: max in-flight upstream fetches overall, and per upstream host
+    fetch_max_concurrency: int = 16
+    fetch_max_per_host: int = 4
+
+    # Shared HTTP client pool (seconds / connection counts)
+    http_connect_timeout: float = 5.0
+    http_read_timeout: float = 15.0
+    http_max_connections: int = 100
+    http_max_keepalive: int = 20
+    # Feeds: stop downloading after this many bytes (entries past the cap are not read)
+    feed_max_bytes: int = 2_000_000
+
+    # Per-host circuit breaker: open after N consecutive failures or error rate over the window,
+    # fail fast for circuit_open_seconds, then let one probe through
+    circuit_breaker_enabled: bool = True
+    circuit_failure_threshold: int = 5
+    circuit_error_rate: float = 0.5
+    circuit_min_requests: int = 10
+    circuit_window: int = 50
+    circuit_open_seconds: float = 30.0
+    # Adaptive read timeout per host: p99 latency * multiplier (floor in seconds)
+    adaptive_timeout_multiplier: float = 3.0
+    adaptive_timeout_min_seconds: float = 2.0
+
+    # RSS discovery cache: revalidate a found feed / a "no feed" result after this many hours
+    feed_discovery_ttl_hours: int = 168
+    feed_discovery_negative_ttl_hours: int = 24
+
+    # Background ingestion: poll due sources into the items table every N seconds
+    ingestion_enabled: bool = True
+    ingestion_interval_seconds: int = 300
+    # A source whose last fetch failed is retried after this long instead of its full frequency interval
+    ingestion_error_retry_minutes: int = 30
+    # Entries read per source fetch; ingestion walks them newest-first until it reaches a known item
+    ingestion_max_items_per_fetch: int = 20
+
+    # Latest-item cache for live source fetches: fresh for TTL, then served stale while refreshing
+    latest_cache_ttl_seconds: int = 120
+    latest_cache_stale_seconds: int = 900
+    latest_cache_max_entries: int = 20000
+
+    # Google News topic feeds, shared across users by normalized topic + locale
+    topic_feed_cache_ttl_seconds: int = 600
+    topic_feed_cache_stale_seconds: int = 1800
+    # Entries kept per topic feed (requests for more bypass the cache)
+    topic_feed_cache_articles: int = 20
+    # X post per topic (Apify search / Nitter), cached per normalized topic
+    x_topic_cache_ttl_seconds: int = 300
+    # YouTube search results per normalized topic (each search costs 100 quota units)
+    youtube_topic_cache_ttl_seconds: int = 1800
+
+    # Article pages whose local extraction scores at least this (0-1) skip the Gemini call
+    local_extraction_min_confidence: float = 0.7
+    # Gemini extraction: page text trimmed to this many (estimated) tokens; output capped per call
+    extraction_input_token_budget: int = 12000
+    extraction_max_output_tokens: int = 8192
+    # Batched extraction (multi-URL summaries): pages per Gemini call, within this input budget
+    extraction_batch_token_budget: int = 30000
+    extraction_batch_max_pages: int = 8
+    # Article pages: stop reading the body after this many bytes
+    page_max_bytes: int = 1_500_000
 
     class Config:
         env_file = ".env"
@@ -44,14 +44,59 @@ def _add_cached_briefing_audio_transcript_if_missing():
         conn.commit()
 
 
+def _add_sources_last_fetch_error_if_missing():
+    """Add last_fetch_error column to sources if it does not exist (one-off migration)."""
+    with engine.connect() as conn:
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            conn.execute(text("ALTER TABLE sources ADD COLUMN IF NOT EXISTS last_fetch_error VARCHAR(1024)"))
+        elif dialect == "sqlite":
+            r = conn.execute(
+                text("SELECT COUNT(*) FROM pragma_table_info('sources') WHERE name = 'last_fetch_error'")
+            ).scalar()
+            if r == 0:
+                conn.execute(text("ALTER TABLE sources ADD COLUMN last_fetch_error VARCHAR(1024)"))
+        conn.commit()
+
+
+def _add_extracted_summaries_content_hash_if_missing():
+    """Add content_hash column (and its index) to extracted_summaries if missing (one-off migration)."""
+    with engine.connect() as conn:
+        dialect = engine.dialect.name
+        if dialect == "postgresql":
+            conn.execute(text("ALTER TABLE extracted_summaries ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)"))
+        elif dialect == "sqlite":
+            r = conn.execute(
+                text("SELECT COUNT(*) FROM pragma_table_info('extracted_summaries') WHERE name = 'content_hash'")
+            ).scalar()
+            if r == 0:
+                conn.execute(text("ALTER TABLE extracted_summaries ADD COLUMN content_hash VARCHAR(64)"))
+        if dialect in ("postgresql", "sqlite"):
+            conn.execute(
+                text(
+                    "CREATE INDEX IF NOT EXISTS ix_extracted_summaries_content_hash "
+                    "ON extracted_summaries (content_hash)"
+                )
+            )
+        conn.commit()
+
+
 def init_db():
     from app.models.database import (  # noqa: F401 - register models
         Base,
         Bookmark,
         CachedBriefingAudio,
+        DiscoveredFeed,
         ExtractedSummary,
+        GoogleNewsLink,
+        Item,
+        Source,
         UserSetting,
         UserTopicPreference,
+        YoutubeChannel,
+        YoutubeQuotaUsage,
     )
     Base.metadata.create_all(bind=engine)
     _add_cached_briefing_audio_transcript_if_missing()
+    _add_sources_last_fetch_error_if_missing()
+    _add_extracted_summaries_content_hash_if_missing()
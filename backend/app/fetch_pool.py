@@ -0,0 +1,157 @@
+"""
+Bounded concurrent fan-out for blocking upstream fetches (httpx, feedparser, Apify).
+Runs a function over many items on worker threads, caps in-flight work globally and per
+upstream host, and returns results in the original order.
+
+Only top-level fetches should pass host_of (one slot per source); nested fan-outs inside a
+worker (e.g. probing candidate feed paths) run without slots so they can never deadlock.
+"""
+from __future__ import annotations
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Callable, Iterable, Iterator, TypeVar
+from urllib.parse import urlparse
+
+from app.config import settings
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+_global_slots = threading.BoundedSemaphore(max(1, settings.fetch_max_concurrency))
+_host_slots: dict[str, threading.BoundedSemaphore] = {}
+_host_slots_lock = threading.Lock()
+
+
+def host_of_url(url: str) -> str:
+    """Lowercased host of a URL ("" if it cannot be parsed)."""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if "://" not in url:
+        url = "https://" + url
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except ValueError:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def _host_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _host_slots_lock:
+        sem = _host_slots.get(host)
+        if sem is None:
+            sem = threading.BoundedSemaphore(max(1, settings.fetch_max_per_host))
+            _host_slots[host] = sem
+        return sem
+
+
+def _run_with_slots(fn: Callable[[T], R], item: T, host: str | None) -> R:
+    """
+    Run fn(item) while holding a global slot and, if host is set, a per-host slot.
+    host None: no slots at all (the item only waits on work running elsewhere, e.g. a batch run).
+    """
+    if host is None:
+        return fn(item)
+    if not host:
+        with _global_slots:
+            return fn(item)
+    # Host slot first: work queued behind a busy host must not sit on global slots other hosts need
+    with _host_semaphore(host):
+        with _global_slots:
+            return fn(item)
+
+
+def _with_slots(fn: Callable[[T], R], host_of: Callable[[T], str | None] | None) -> Callable[[T], R]:
+    if host_of is None:
+        return fn
+    return lambda item: _run_with_slots(fn, item, host_of(item))
+
+
+def _submit(executor: ThreadPoolExecutor, call: Callable[[T], R], item: T) -> Future:
+    # Run in a copy of the caller's context so context variables (e.g. quota priority) carry over
+    return executor.submit(contextvars.copy_context().run, call, item)
+
+
+def map_concurrent(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    host_of: Callable[[T], str | None] | None = None,
+    max_workers: int | None = None,
+) -> list[R]:
+    """
+    Call fn on every item concurrently and return the results in input order.
+    host_of: when given, each call holds a global slot and a slot for host_of(item), so one
+    slow provider cannot take every worker; items it maps to None take no slot.
+    Exceptions from fn propagate to the caller.
+    """
+    items = list(items)
+    if not items:
+        return []
+    call = _with_slots(fn, host_of)
+    workers = min(len(items), max_workers or settings.fetch_max_concurrency)
+    if workers <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch") as executor:
+        futures = [_submit(executor, call, item) for item in items]
+        return [f.result() for f in futures]
+
+
+def iter_concurrent(
+    fn: Callable[[T], R],
+    items: Iterable[T],
+    *,
+    host_of: Callable[[T], str | None] | None = None,
+    max_workers: int | None = None,
+) -> Iterator[tuple[int, R]]:
+    """
+    Like map_concurrent, but yields (index, result) as each call finishes, so callers can
+    stream results instead of waiting for the slowest item. Closing the iterator early
+    cancels calls that have not started yet.
+    """
+    items = list(items)
+    if not items:
+        return
+    call = _with_slots(fn, host_of)
+    workers = min(len(items), max_workers or settings.fetch_max_concurrency)
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="fetch")
+    try:
+        futures = {_submit(executor, call, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls that share a key into one: the first caller runs fn, callers that
+    arrive while it is in flight wait for and share its result (or exception).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], R]) -> R:
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
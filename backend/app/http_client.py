@@ -0,0 +1,92 @@
+"""
+Process-wide pooled HTTP clients shared by every fetch helper (YouTube, RSS, Nitter, Apify, pages).
+One httpx.Client per kind of upstream keeps connections alive per host instead of paying a fresh
+TCP + TLS handshake per call. googleapis.com gets its own client with HTTP/2 when h2 is installed.
+
+Every request gets a connect and a read deadline; pass timeout=request_timeout(read=...) for
+calls that legitimately take longer (e.g. Apify run-sync). Requests also pass through a per-host
+circuit breaker (app.circuit_breaker), which fails fast while a host is down and tightens the
+default read deadline (not explicit request_timeout ones) to the host's observed p99 latency.
+
+Import: from app.http_client import get_client, request_timeout
+"""
+from __future__ import annotations
+
+import threading
+
+import httpx
+
+from app.circuit_breaker import BreakerTransport
+from app.config import settings
+from app.fetch_pool import host_of_url
+
+# Hosts served over the HTTP/2 client (many small JSON calls to the same origin multiplex well)
+_HTTP2_HOST_SUFFIXES = ("googleapis.com",)
+
+_clients: dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def request_timeout(read: float | None = None) -> httpx.Timeout:
+    """Timeout with the configured connect deadline and the given (or default) read deadline."""
+    read = settings.http_read_timeout if read is None else read
+    return httpx.Timeout(
+        connect=settings.http_connect_timeout,
+        read=read,
+        write=read,
+        pool=settings.http_connect_timeout,
+    )
+
+
+def _build_client(http2: bool) -> httpx.Client:
+    transport = httpx.HTTPTransport(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive,
+            keepalive_expiry=30.0,
+        ),
+    )
+    timeout = request_timeout()
+    return httpx.Client(timeout=timeout, transport=BreakerTransport(transport, default_timeout=timeout))
+
+
+def get_client(url: str | None = None) -> httpx.Client:
+    """
+    Shared client for requests to url (thread-safe; never close it yourself).
+    googleapis.com goes through the HTTP/2 client when available; everything else through HTTP/1.1.
+    """
+    http2 = False
+    if url and _http2_available():
+        host = host_of_url(url)
+        http2 = any(host == s or host.endswith("." + s) for s in _HTTP2_HOST_SUFFIXES)
+    name = "http2" if http2 else "default"
+    client = _clients.get(name)
+    if client is not None:
+        return client
+    with _clients_lock:
+        client = _clients.get(name)
+        if client is None:
+            client = _build_client(http2)
+            _clients[name] = client
+        return client
+
+
+def close_clients() -> None:
+    """Close all pooled clients (app shutdown)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception:
+            pass
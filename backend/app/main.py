@@ -139,15 +139,26 @@ async def lifespan(app: FastAPI):
             try:
                 init_db()
                 logger.info("init_db completed successfully")
-                return
+                break
             except Exception as e:
                 if attempt == 3:
                     logger.exception("init_db failed after 3 attempts; DB routes may 500 until DB is ready")
                     return
                 logger.warning("init_db attempt %s failed: %s; retrying in 2s ...", attempt, e)
                 await asyncio.sleep(2)
+        # Tables exist now; start polling sources into the items table
+        from app.services.ingestion import start_ingestion_scheduler
+
+        start_ingestion_scheduler()
     asyncio.create_task(init_db_background())
     yield
+    from app.http_client import close_clients
+    from app.services.ingestion import stop_ingestion_scheduler
+    from app.services.youtube_quota import flush as flush_youtube_quota
+
+    stop_ingestion_scheduler()
+    flush_youtube_quota()
+    close_clients()
 
 
 app = FastAPI(
@@ -171,6 +182,31 @@ def root():
 def health():
     return {"status": "ok"}
 
+
+@app.get("/health/upstreams")
+def health_upstreams():
+    """Circuit breaker state, error rate and p99 latency per upstream host, and Nitter pool ranking."""
+    from app.circuit_breaker import breaker_stats
+    from app.services.nitter_pool import pool_stats
+
+    return {"upstreams": breaker_stats(), "nitter": pool_stats()}
+
+
+@app.get("/quota/youtube")
+def get_youtube_quota():
+    """YouTube Data API units used and remaining today (quota day resets at midnight Pacific time)."""
+    from app.services.youtube_quota import quota_status
+
+    return quota_status()
+
+
+@app.get("/extraction/usage")
+def get_extraction_usage():
+    """Gemini page-extraction calls and token counts (prompt / completion) since startup."""
+    from app.models.scrapper.text_content_extractor import extraction_usage
+
+    return extraction_usage()
+
 # CORS: set CORS_ORIGINS to your frontend URL(s), or "*" to allow any origin (e.g. for demos).
 _origins = [o.strip() for o in settings.cors_origins.split(",") if o.strip()]
 _allow_any_origin = _origins == ["*"]
@@ -886,11 +922,12 @@ def get_sources_latest(
     db: Session = Depends(get_db),
 ):
     """
-    For each source the user follows, fetch the latest post / video / article URL.
+    For each source the user follows, the latest post / video / article URL.
     YouTube: latest video from channel. News/Podcast: latest item from RSS feed.
-    LinkedIn/X: not supported yet (returns error per source).
+    X: latest post via Nitter. LinkedIn: latest post via Apify.
+    Read from the items table kept up to date by background ingestion.
     """
-    from app.services.latest_from_sources import fetch_latest_for_sources
+    from app.services.ingestion import latest_for_sources_from_db
 
     sources = (
         db.query(Source)
@@ -900,10 +937,33 @@ def get_sources_latest(
     )
     if not sources:
         return {"sources": [], "message": "No sources to fetch. Add sources first."}
-    results = fetch_latest_for_sources(sources)
+    results = latest_for_sources_from_db(db, sources)
     return {"sources": results}
 
 
+@app.post("/sources/refresh")
+def refresh_sources_now(
+    source_id: int | None = None,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+):
+    """
+    Fetch the user's sources (or just source_id) from upstream now and store new items.
+    The only way MANUAL sources are updated; other sources are also polled in the background.
+    Returns the refreshed latest results (same shape as /sources/latest).
+    """
+    from app.services.ingestion import latest_for_sources_from_db, refresh_sources
+
+    query = db.query(Source).filter(Source.user_id == user_id)
+    if source_id is not None:
+        query = query.filter(Source.id == source_id)
+    sources = query.order_by(Source.created_at.desc()).all()
+    if source_id is not None and not sources:
+        raise HTTPException(status_code=404, detail="Source not found")
+    new_items = refresh_sources(db, sources)
+    return {"sources": latest_for_sources_from_db(db, sources), "new_items": new_items}
+
+
 @app.get("/briefings")
 def get_briefings(
     user_id: int = Depends(get_current_user_id),
@@ -913,7 +973,7 @@ def get_briefings(
     Latest content from user's followed sources (same data as /sources/latest).
     Frontend can show these as briefing cards; when no sources, returns empty list.
     """
-    from app.services.latest_from_sources import fetch_latest_for_sources
+    from app.services.ingestion import latest_for_sources_from_db
 
     sources = (
         db.query(Source)
@@ -923,21 +983,76 @@ def get_briefings(
     )
     if not sources:
         return {"briefings": []}
-    results = fetch_latest_for_sources(sources)
-    # Shape for frontend: list of { title, url, source_type, source_url, published_at?, error? }
-    briefings = []
-    for r in results:
-        latest = r.get("latest") or {}
-        briefings.append({
-            "id": r.get("source_id"),
-            "title": latest.get("title") or "Latest update",
-            "url": latest.get("url") or r.get("source_url"),
-            "source_type": r.get("source_type"),
-            "source_url": r.get("source_url"),
-            "published_at": latest.get("published_at"),
-            "error": r.get("error"),
-        })
-    return {"briefings": briefings}
+    results = latest_for_sources_from_db(db, sources)
+    return {"briefings": [_briefing_card(r) for r in results]}
+
+
+def _briefing_card(r: dict) -> dict:
+    """Shape a latest-item result for the frontend: { title, url, source_type, source_url, published_at?, error? }."""
+    latest = r.get("latest") or {}
+    return {
+        "id": r.get("source_id"),
+        "title": latest.get("title") or "Latest update",
+        "url": latest.get("url") or r.get("source_url"),
+        "source_type": r.get("source_type"),
+        "source_url": r.get("source_url"),
+        "published_at": latest.get("published_at"),
+        "error": r.get("error"),
+    }
+
+
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _stream_latest(user_id: int, event: str, shape) -> StreamingResponse:
+    """
+    Server-sent events: one `event` per source as soon as its result is ready (see
+    iter_latest_for_sources_from_db), then a final `done` event with counts.
+    Uses its own DB session because the body is produced after the request's session is closed.
+    """
+    from app.db import SessionLocal
+    from app.services.ingestion import iter_latest_for_sources_from_db
+
+    def stream():
+        count = errors = 0
+        with SessionLocal() as db:
+            sources = (
+                db.query(Source)
+                .filter(Source.user_id == user_id)
+                .order_by(Source.created_at.desc())
+                .all()
+            )
+            for r in iter_latest_for_sources_from_db(db, sources):
+                count += 1
+                if r.get("error"):
+                    errors += 1
+                yield _sse_event(event, shape(r))
+        yield _sse_event("done", {"count": count, "errors": errors})
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive", "X-Accel-Buffering": "no"},
+    )
+
+
+@app.get("/sources/latest/stream")
+def stream_sources_latest(user_id: int = Depends(get_current_user_id)):
+    """
+    Streaming /sources/latest (text/event-stream): a `source` event with each source's result as
+    soon as it is available, in completion order, then `done` with {count, errors}.
+    """
+    return _stream_latest(user_id, "source", lambda r: r)
+
+
+@app.get("/briefings/stream")
+def stream_briefings(user_id: int = Depends(get_current_user_id)):
+    """
+    Streaming /briefings (text/event-stream): a `briefing` event per card as soon as its source is
+    ready, in completion order, then `done` with {count, errors}.
+    """
+    return _stream_latest(user_id, "briefing", _briefing_card)
 
 
 @app.post("/chat")
@@ -1207,13 +1322,13 @@ def _get_briefing_urls(
     gl: str = "US",
 ) -> list[str]:
     """Gather URLs for the personal briefing: latest from sources + one article per topic. Same logic as /briefing/generate."""
-    from app.services.feed_by_topics import fetch_articles_for_topic
-    from app.services.latest_from_sources import fetch_latest_for_sources
+    from app.services.feed_by_topics import fetch_articles_for_topics, pick_topic_article_urls
+    from app.services.ingestion import latest_for_sources_from_db
 
     urls: list[str] = []
     sources = db.query(Source).filter(Source.user_id == user_id).order_by(Source.created_at.desc()).all()
     if sources:
-        results = fetch_latest_for_sources(sources)
+        results = latest_for_sources_from_db(db, sources)
         for r in results:
             latest = r.get("latest")
             if latest and latest.get("url"):
@@ -1223,16 +1338,9 @@ def _get_briefing_urls(
     topics = [p.topic for p in db.query(UserTopicPreference).filter(UserTopicPreference.user_id == user_id).all()]
     if topics:
         per_topic = min(max(1, max_per_topic), 5)
-        for topic in topics:
-            topic = (topic or "").strip()
-            if not topic:
-                continue
-            articles = fetch_articles_for_topic(topic, max_articles=5, hl=hl, gl=gl)
-            for art in articles[:per_topic]:
-                u = (art.get("url") or "").strip()
-                if u and u not in urls:
-                    urls.append(u)
-                    break
+        # Topic feeds are fetched concurrently and undecoded; only the picked articles are decoded
+        topic_articles = fetch_articles_for_topics(topics, max_articles=5, hl=hl, gl=gl)
+        urls.extend(pick_topic_article_urls(topic_articles, exclude=urls, candidates_per_topic=per_topic))
     # Never pass news.google.com into briefing/preview (so any occurrence = bug elsewhere, e.g. sources)
     return [u for u in urls if "news.google.com" not in u]
 
@@ -1326,7 +1434,10 @@ async def generate_personal_briefing(
         with _progress_lock:
             if progress_token in _progress_store:
                 _progress_store[progress_token]["progress"] = 10
-    urls = _get_briefing_urls(user_id, db, max_per_topic=max_per_topic, hl=hl, gl=gl)
+    # Source/topic fetches block on the network; keep them off the event loop
+    urls = await asyncio.to_thread(
+        _get_briefing_urls, user_id, db, max_per_topic=max_per_topic, hl=hl, gl=gl
+    )
     if not urls:
         if progress_token:
             with _progress_lock:
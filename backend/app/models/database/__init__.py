@@ -15,6 +15,10 @@ from app.models.database.user_topic_preference import UserTopicPreference
 from app.models.database.user_setting import UserSetting
 from app.models.database.bookmark import Bookmark
 from app.models.database.cached_briefing_audio import CachedBriefingAudio
+from app.models.database.discovered_feed import DiscoveredFeed
+from app.models.database.google_news_link import GoogleNewsLink
+from app.models.database.youtube_channel import YoutubeChannel
+from app.models.database.youtube_quota_usage import YoutubeQuotaUsage
 
 __all__ = [
     "Base",
@@ -33,4 +37,8 @@ __all__ = [
     "UserSetting",
     "Bookmark",
     "CachedBriefingAudio",
+    "DiscoveredFeed",
+    "GoogleNewsLink",
+    "YoutubeChannel",
+    "YoutubeQuotaUsage",
 ]
@@ -0,0 +1,23 @@
+"""
+RSS/Atom feed URL discovered for a news/podcast site, shared by every user following that site.
+Saves re-downloading the homepage and probing common feed paths on every /briefings call.
+"""
+from datetime import datetime
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import Base
+
+
+class DiscoveredFeed(Base):
+    """
+    One row per site URL (normalized). feed_url is None when discovery found no feed;
+    checked_at drives periodic revalidation.
+    """
+
+    __tablename__ = "discovered_feeds"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    site_key: Mapped[str] = mapped_column(String(2048), nullable=False, unique=True, index=True)
+    feed_url: Mapped[str | None] = mapped_column(String(2048), nullable=True)
+    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
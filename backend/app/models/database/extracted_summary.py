@@ -1,6 +1,8 @@
 """
 Store summary JSON by the URL it was extracted from.
 Not limited to YouTube; works for any source URL (podcast, article, etc.).
+content_hash fingerprints a text page's main content, so URL variants of the same story
+(syndication, AMP, canonical) reuse one extraction.
 """
 from datetime import datetime
 from sqlalchemy import DateTime, String, Text
@@ -22,6 +24,7 @@ class ExtractedSummary(Base):
         String(2048), nullable=False, unique=True, index=True
     )
     summary_json: Mapped[str] = mapped_column(Text, nullable=False)  # JSON string
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True, index=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
@@ -0,0 +1,20 @@
+"""
+Article URL behind a Google News redirect link (news.google.com/rss/articles/...).
+The mapping never changes, so each link is decoded (one round-trip to Google) once for everyone.
+"""
+from datetime import datetime
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import Base
+
+
+class GoogleNewsLink(Base):
+    """Decoded article URL for one Google News link."""
+
+    __tablename__ = "google_news_links"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    google_url: Mapped[str] = mapped_column(String(2048), nullable=False, unique=True, index=True)
+    article_url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    decoded_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
@@ -36,6 +36,7 @@ class Source(Base):
         Enum(FetchFrequency), nullable=False, default=FetchFrequency.DAILY
     )
     last_fetched_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    last_fetch_error: Mapped[str | None] = mapped_column(String(1024), nullable=True)  # Set by ingestion
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
@@ -0,0 +1,22 @@
+"""
+Resolved YouTube channel per channel URL (shared by every user following it).
+Resolving an @handle costs a 100-unit search call; caching the channel ID and uploads playlist
+leaves a single playlistItems call per channel in steady state.
+"""
+from datetime import datetime
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import Base
+
+
+class YoutubeChannel(Base):
+    """Channel ID and uploads playlist ID for a normalized channel URL."""
+
+    __tablename__ = "youtube_channels"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    channel_key: Mapped[str] = mapped_column(String(512), nullable=False, unique=True, index=True)
+    channel_id: Mapped[str] = mapped_column(String(64), nullable=False, index=True)
+    uploads_playlist_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    resolved_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
@@ -0,0 +1,19 @@
+"""
+YouTube Data API units spent per quota day (Pacific time), so the budget survives restarts.
+"""
+from datetime import datetime
+from sqlalchemy import DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.database.base import Base
+
+
+class YoutubeQuotaUsage(Base):
+    """Units used on one quota day (YYYY-MM-DD, America/Los_Angeles)."""
+
+    __tablename__ = "youtube_quota_usage"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    day: Mapped[str] = mapped_column(String(10), nullable=False, unique=True, index=True)
+    units: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=datetime.utcnow)
@@ -0,0 +1,213 @@
+"""
+Local main-content extraction (boilerplate removal) for article pages, without an LLM call.
+
+Scores the page's block elements by text density (paragraph length and commas credited to their
+container), penalizes link-heavy blocks, and favours <article>/<main> and content-like class
+names; JSON-LD articleBody and og: metadata are used when present. Returns the title and text
+with a confidence in [0, 1], so callers can fall back to Gemini for pages it cannot handle
+(short posts, app shells, listing pages).
+
+Import: from app.models.scrapper.content_extractor import extract_main_content, strip_html_to_text
+"""
+from __future__ import annotations
+
+import json
+import re
+from html.parser import HTMLParser
+
+# Containers removed before scoring (never content)
+_DROP_TAGS = ("script", "style", "noscript", "template", "svg", "iframe", "form", "nav", "footer", "aside", "button")
+# class/id hints
+_NEGATIVE = re.compile(
+    r"comment|share|social|related|promo|cookie|consent|banner|sidebar|newsletter|subscribe|advert|"
+    r"\bads?\b|sponsor|popup|modal|breadcrumb|footer|menu|\bnav",
+    re.I,
+)
+_POSITIVE = re.compile(r"article|body|content|entry|main|post|story|text", re.I)
+# Paragraph-level blocks whose text makes up the extracted body
+_BLOCK_TAGS = ("p", "h2", "h3", "h4", "blockquote", "pre", "li")
+_MIN_PARAGRAPH_CHARS = 25
+_ARTICLE_TYPES = ("article", "newsarticle", "blogposting", "reportagenewsarticle")
+
+
+def _text(el) -> str:
+    return " ".join(el.get_text(" ", strip=True).split())
+
+
+def _link_density(el, text_len: int) -> float:
+    if not text_len:
+        return 1.0
+    link_len = sum(len(_text(a)) for a in el.find_all("a"))
+    return min(1.0, link_len / text_len)
+
+
+def _class_weight(el) -> float:
+    hint = " ".join(el.get("class") or []) + " " + (el.get("id") or "")
+    weight = 0.0
+    if _NEGATIVE.search(hint):
+        weight -= 25
+    if _POSITIVE.search(hint):
+        weight += 25
+    if el.name in ("article", "main"):
+        weight += 30
+    return weight
+
+
+def _meta(soup, *names: str) -> str:
+    for name in names:
+        tag = soup.find("meta", attrs={"property": name}) or soup.find("meta", attrs={"name": name})
+        if tag and (tag.get("content") or "").strip():
+            return tag["content"].strip()
+    return ""
+
+
+def _json_ld_article(soup) -> tuple[str, str]:
+    """(headline, articleBody) from JSON-LD Article markup, if any."""
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(script.string or "")
+        except (TypeError, ValueError):
+            continue
+        if isinstance(data, dict):
+            nodes = data.get("@graph") or [data]
+        else:
+            nodes = data if isinstance(data, list) else []
+        for node in nodes:
+            if not isinstance(node, dict):
+                continue
+            kind = node.get("@type")
+            kinds = kind if isinstance(kind, list) else [kind]
+            if any(str(k).lower() in _ARTICLE_TYPES for k in kinds) and node.get("articleBody"):
+                return (str(node.get("headline") or ""), " ".join(str(node["articleBody"]).split()))
+    return ("", "")
+
+
+def _drop_boilerplate(soup) -> None:
+    for el in soup.find_all(_DROP_TAGS):
+        el.decompose()
+    for el in soup.find_all(True):
+        if el.decomposed or el.name in ("html", "body", "article", "main"):
+            continue
+        # Layout wrappers with a negative hint ("has-sidebar") may still hold the article
+        if _class_weight(el) < 0 and el.find(("article", "main")) is None:
+            el.decompose()
+
+
+def _best_container(soup):
+    """Element with the highest density score (readability-style), or None."""
+    scores: dict[int, float] = {}
+    elements: dict[int, object] = {}
+    for p in soup.find_all(("p", "pre", "blockquote")):
+        text = _text(p)
+        if len(text) < _MIN_PARAGRAPH_CHARS:
+            continue
+        score = 1 + text.count(",") + min(len(text) / 100, 3)
+        for el, share in ((p.parent, 1.0), (p.parent.parent if p.parent else None, 0.5)):
+            if el is None or el.name in (None, "[document]"):
+                continue
+            if id(el) not in elements:
+                elements[id(el)] = el
+                scores[id(el)] = _class_weight(el)
+            scores[id(el)] += score * share
+    best, best_score = None, 0.0
+    for key, el in elements.items():
+        text_len = len(_text(el))
+        score = scores[key] * (1 - _link_density(el, text_len))
+        if score > best_score:
+            best, best_score = el, score
+    return best
+
+
+def _inside_block(block, container) -> bool:
+    for parent in block.parents:
+        if parent is container:
+            return False
+        if parent.name in _BLOCK_TAGS:
+            return True
+    return False
+
+
+def _paragraphs(container) -> list[str]:
+    out = []
+    for block in container.find_all(_BLOCK_TAGS):
+        # Nested blocks (p inside li / blockquote) are taken once, at the outer level
+        if _inside_block(block, container):
+            continue
+        text = _text(block)
+        if not text or (block.name == "li" and _link_density(block, len(text)) > 0.5):
+            continue
+        out.append(text)
+    return out
+
+
+def extract_main_content(html: str) -> dict:
+    """
+    Extract the main content of an HTML page locally.
+    Returns {"title", "text", "confidence"}; confidence is 0 when nothing usable was found.
+    """
+    from bs4 import BeautifulSoup
+
+    empty = {"title": "", "text": "", "confidence": 0.0}
+    if not html or not html.strip():
+        return empty
+    soup = BeautifulSoup(html, "html.parser")
+    ld_title, ld_body = _json_ld_article(soup)
+    og_type = _meta(soup, "og:type").lower()
+    title = _meta(soup, "og:title", "twitter:title") or ld_title
+    if not title:
+        h1 = soup.find("h1")
+        title = _text(h1) if h1 else (_text(soup.title) if soup.title else "")
+    is_article = bool(ld_body) or og_type == "article" or soup.find("article") is not None
+
+    _drop_boilerplate(soup)
+    container = _best_container(soup)
+    paragraphs = _paragraphs(container) if container is not None else []
+    text = "\n\n".join(paragraphs)
+    structure = 1.0 if is_article else 0.8
+    if len(ld_body) > len(text):
+        # Publisher-provided body: complete and boilerplate-free, only its length matters
+        return {"title": title, "text": ld_body, "confidence": round(min(1.0, len(ld_body.split()) / 300), 3)}
+    if not text:
+        return {**empty, "title": title}
+
+    link_density = _link_density(container, len(_text(container)))
+    confidence = (
+        min(1.0, len(text.split()) / 300)
+        * min(1.0, len(paragraphs) / 3)
+        * structure
+        * (1.0 - link_density)
+    )
+    return {"title": title, "text": text, "confidence": round(confidence, 3)}
+
+
+class _TextStripper(HTMLParser):
+    """Collect text outside script/style in one linear pass (entities decoded by HTMLParser)."""
+
+    _SKIP = ("script", "style", "noscript", "template")
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in self._SKIP:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag) -> None:
+        if tag in self._SKIP and self._skip_depth:
+            self._skip_depth -= 1
+
+    def handle_data(self, data) -> None:
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def strip_html_to_text(html: str) -> str:
+    """All visible text of an HTML page, whitespace collapsed (no boilerplate removal)."""
+    if not html:
+        return ""
+    stripper = _TextStripper()
+    stripper.feed(html)
+    stripper.close()
+    return " ".join(" ".join(stripper.parts).split())
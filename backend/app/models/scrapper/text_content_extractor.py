@@ -1,20 +1,47 @@
 #!/usr/bin/env python3
 """
 Extract main text content from text-based URLs (X/Twitter, LinkedIn, news articles).
-Fetches the page and uses Gemini to extract title + main body. No audio.
+Fetches the page and extracts title + main body locally (content_extractor); Gemini is only
+called when the local extraction is not confident (short posts, app shells). No audio.
 
 Import: from app.models.scrapper.text_content_extractor import extract_text_content
 CLI: python -m app.models.scrapper.text_content_extractor <url>
 """
 
+import codecs
+import hashlib
 import json
+import logging
 import os
 import re
 import sys
+import threading
+from typing import Callable
 
+logger = logging.getLogger(__name__)
 
-# Max chars of HTML/text to send to Gemini (to stay within context and save tokens)
+# Max chars of HTML/text to send to Gemini, whatever the token budget (to stay within context)
 MAX_INPUT_CHARS = 80_000
+# Local token estimate: ~4 characters per token for English prose
+CHARS_PER_TOKEN = 4
+# Output tokens for the JSON wrapper and title on top of the extracted text
+_OUTPUT_OVERHEAD_TOKENS = 256
+# Output token limit of the Gemini 2.5 models (batched calls may need more than one page's cap)
+_MODEL_MAX_OUTPUT_TOKENS = 65_536
+
+# Pages with fewer words than this are not fingerprinted
+MIN_FINGERPRINT_WORDS = 50
+_WORD = re.compile(r"\w+")
+
+_usage_lock = threading.Lock()
+_usage = {
+    "calls": 0,
+    "failures": 0,
+    "estimated_input_tokens": 0,
+    "prompt_tokens": 0,
+    "completion_tokens": 0,
+    "trimmed_chars": 0,
+}
 
 # User-Agent so we get desktop HTML; some sites serve different content for bots
 USER_AGENT = (
@@ -33,84 +60,463 @@ def _get_gemini_api_key() -> str:
     return key
 
 
+# Content types worth extracting text from; anything else (PDF, images, video) is not downloaded
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_.:-]+)""", re.I)
+
+
+def _max_page_bytes() -> int:
+    try:
+        from app.config import settings
+        return settings.page_max_bytes
+    except Exception:
+        return 1_500_000
+
+
+def _page_encoding(header_charset: str | None, head: bytes) -> str:
+    """Charset from the Content-Type header, else a <meta charset> in the first bytes, else UTF-8."""
+    m = _META_CHARSET.search(head[:4096])
+    for candidate in (header_charset, m.group(1).decode("ascii") if m else None):
+        if not candidate:
+            continue
+        try:
+            return codecs.lookup(candidate).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
 def _fetch_html(url: str) -> str | None:
-    """Fetch URL and return response text, or None on failure."""
+    """
+    Fetch URL and return its text, or None on failure or a non-HTML content type.
+    The body is streamed and decoded incrementally, and reading stops after settings.page_max_bytes
+    (the start of a page holds the article), so memory per fetch stays bounded.
+    """
     try:
-        import httpx
+        from app.http_client import get_client, request_timeout
     except ImportError as e:
         raise ImportError("httpx is required. Install with: pip install httpx") from e
+    max_bytes = _max_page_bytes()
     try:
-        with httpx.Client(
+        with get_client(url).stream(
+            "GET",
+            url,
+            headers={"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.1"},
             follow_redirects=True,
-            timeout=20.0,
-            headers={"User-Agent": USER_AGENT},
-        ) as client:
-            r = client.get(url)
+            timeout=request_timeout(20.0),
+        ) as r:
             r.raise_for_status()
-            return r.text
+            content_type = (r.headers.get("content-type") or "").split(";")[0].strip().lower()
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                return None
+            decoder = None
+            parts: list[str] = []
+            read = 0
+            for chunk in r.iter_bytes():
+                chunk = chunk[: max_bytes - read]
+                read += len(chunk)
+                if decoder is None:
+                    decoder = codecs.getincrementaldecoder(_page_encoding(r.charset_encoding, chunk))("replace")
+                parts.append(decoder.decode(chunk))
+                if read >= max_bytes:
+                    break
+            if decoder is not None:
+                parts.append(decoder.decode(b"", final=True))
+            return "".join(parts)
     except Exception:
         return None
 
 
 def _strip_html_to_text(html: str) -> str:
-    """Remove script/style, then tags; collapse whitespace."""
-    if not html:
-        return ""
-    # Remove script and style blocks and their content
-    html = re.sub(r"<script[^>]*>.*?</script>", " ", html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r"<style[^>]*>.*?</style>", " ", html, flags=re.DOTALL | re.IGNORECASE)
-    # Replace tags with space
-    html = re.sub(r"<[^>]+>", " ", html)
-    # Decode common entities
-    html = html.replace("&nbsp;", " ").replace("&amp;", "&").replace("&lt;", "<").replace("&gt;", ">").replace("&quot;", '"')
-    # Collapse whitespace
-    text = re.sub(r"\s+", " ", html).strip()
-    return text
+    """Visible page text (script/style dropped, entities decoded), whitespace collapsed."""
+    from app.models.scrapper.content_extractor import strip_html_to_text
+
+    return strip_html_to_text(html)
+
+
+def _min_local_confidence() -> float:
+    try:
+        from app.config import settings
+        return float(getattr(settings, "local_extraction_min_confidence", 0.7))
+    except Exception:
+        return 0.7
+
+
+def _extract_locally(html: str) -> dict | None:
+    """extract_main_content result ({"title", "text", "confidence"}), or None if it cannot run."""
+    try:
+        from app.models.scrapper.content_extractor import extract_main_content
+        return extract_main_content(html)
+    except Exception:
+        # bs4 missing or unparseable page: let Gemini handle it
+        return None
+
+
+def content_fingerprint(text: str) -> str | None:
+    """
+    SHA-256 of the text's words (case-folded, punctuation and spacing ignored), or None when the
+    text is too short to identify a page (error pages and consent walls must not match each other).
+    """
+    words = _WORD.findall((text or "").casefold())
+    if len(words) < MIN_FINGERPRINT_WORDS:
+        return None
+    return hashlib.sha256(" ".join(words).encode("utf-8")).hexdigest()
+
+
+def _extraction_settings() -> tuple[int, int]:
+    """(input token budget, output token cap) for one extraction call."""
+    try:
+        from app.config import settings
+        return (settings.extraction_input_token_budget, settings.extraction_max_output_tokens)
+    except Exception:
+        return (12_000, 8_192)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting (no tokenizer round-trip)."""
+    return -(-len(text or "") // CHARS_PER_TOKEN)
+
+
+def _trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Leading part of text within max_tokens (estimated), cut at a word boundary."""
+    limit = min(MAX_INPUT_CHARS, max_tokens * CHARS_PER_TOKEN)
+    if len(text) <= limit:
+        return text
+    cut = text.rfind(" ", 0, limit)
+    return text[: cut if cut > limit // 2 else limit]
+
+
+def _record_usage(response, estimated_input: int, trimmed_chars: int, ok: bool) -> None:
+    meta = getattr(response, "usage_metadata", None)
+    prompt_tokens = getattr(meta, "prompt_token_count", None) or 0
+    completion_tokens = getattr(meta, "candidates_token_count", None) or 0
+    with _usage_lock:
+        _usage["calls"] += 1
+        _usage["failures"] += 0 if ok else 1
+        _usage["estimated_input_tokens"] += estimated_input
+        _usage["prompt_tokens"] += prompt_tokens
+        _usage["completion_tokens"] += completion_tokens
+        _usage["trimmed_chars"] += trimmed_chars
+    logger.info(
+        "Gemini extraction: prompt=%s completion=%s tokens (estimated input %s, trimmed %s chars)%s",
+        prompt_tokens, completion_tokens, estimated_input, trimmed_chars, "" if ok else " - failed",
+    )
+
+
+def extraction_usage() -> dict:
+    """Token totals for Gemini extraction calls since startup."""
+    with _usage_lock:
+        return dict(_usage)
+
+
+def _extraction_schema(types):
+    return types.Schema(
+        type=types.Type.OBJECT,
+        properties={
+            "title": types.Schema(type=types.Type.STRING, description="Short title (headline or first line)"),
+            "text": types.Schema(type=types.Type.STRING, description="Full main text, cleaned"),
+        },
+        required=["title", "text"],
+        property_ordering=["title", "text"],
+    )
+
+
+def _parse_extraction(response) -> dict | None:
+    data = getattr(response, "parsed", None)
+    if not isinstance(data, dict):
+        out = (response.text or "").strip()
+        if not out:
+            return None
+        # Remove optional markdown code fence
+        if out.startswith("```"):
+            out = re.sub(r"^```(?:json)?\s*", "", out)
+            out = re.sub(r"\s*```$", "", out)
+        try:
+            data = json.loads(out)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(data, dict):
+            return None
+    return {"title": data.get("title") or "", "text": data.get("text") or ""}
+
+
+def _default_model(model: str | None) -> str:
+    if model is not None:
+        return model
+    try:
+        from app.config import settings
+        return getattr(settings, "gemini_model", "gemini-2.5-flash")
+    except Exception:
+        return "gemini-2.5-flash"
+
+
+def _json_config(types, schema, max_output_tokens: int, model: str):
+    config = types.GenerateContentConfig(
+        response_mime_type="application/json",
+        response_schema=schema,
+        max_output_tokens=max_output_tokens,
+    )
+    if "flash" in model:
+        # Plain extraction needs no reasoning; thinking tokens would eat the output cap
+        config.thinking_config = types.ThinkingConfig(thinking_budget=0)
+    return config
 
 
 def _extract_with_gemini(raw_text: str, url: str, *, api_key: str, model: str | None = None) -> dict | None:
-    """Use Gemini to extract title and main text from raw page text (google.genai SDK)."""
+    """
+    Use Gemini to extract title and main text from raw page text (google.genai SDK).
+    The page is trimmed to the input token budget, the reply is constrained to a JSON schema,
+    and output tokens are capped at what the trimmed page could need.
+    """
     from google import genai
     from google.genai import types
 
-    if model is None:
-        try:
-            from app.config import settings
-            model = getattr(settings, "gemini_model", "gemini-2.5-flash")
-        except Exception:
-            model = "gemini-2.5-flash"
+    model = _default_model(model)
     prompt = """You are given raw text extracted from a web page (could be a news article, a post from X/Twitter, LinkedIn, or similar).
 Extract ONLY the main content: the post body, article body, or primary text. No navigation, ads, cookie notices, or menus.
 Also extract a short title (e.g. headline or first line of the post).
-Return valid JSON with exactly these two keys:
-- "title": string (short title)
-- "text": string (full main text, cleaned)
+If there is no meaningful content, return an empty title and text."""
 
-If there is no meaningful content, return {"title": "", "text": ""}.
-Output only the JSON object, no markdown or explanation."""
-
-    truncated = raw_text[:MAX_INPUT_CHARS] if len(raw_text) > MAX_INPUT_CHARS else raw_text
+    input_budget, output_cap = _extraction_settings()
+    truncated = _trim_to_tokens(raw_text, input_budget)
     if not truncated.strip():
         return {"title": "", "text": ""}
+    estimated_input = estimate_tokens(truncated)
+    # The main text is a subset of the page, so it never needs more tokens than the page
+    config = _json_config(
+        types, _extraction_schema(types), min(output_cap, estimated_input + _OUTPUT_OVERHEAD_TOKENS), model
+    )
 
     client = genai.Client(api_key=api_key)
     response = client.models.generate_content(
         model=model,
         contents=f"{prompt}\n\nURL: {url}\n\nPage text:\n\n{truncated}",
-        config=types.GenerateContentConfig(max_output_tokens=65536),
+        config=config,
     )
-    out = (response.text or "").strip()
-    if not out:
-        return None
-    # Remove optional markdown code fence
-    if out.startswith("```"):
-        out = re.sub(r"^```(?:json)?\s*", "", out)
-        out = re.sub(r"\s*```$", "", out)
+    extracted = _parse_extraction(response)
+    _record_usage(response, estimated_input, len(raw_text) - len(truncated), extracted is not None)
+    if extracted is None:
+        logger.warning("Gemini extraction for %s returned no parseable JSON", url)
+    return extracted
+
+
+def _batch_schema(types):
+    page = _extraction_schema(types)
+    page.properties["id"] = types.Schema(type=types.Type.INTEGER, description="Page id as given")
+    page.required = ["id", "title", "text"]
+    page.property_ordering = ["id", "title", "text"]
+    return types.Schema(type=types.Type.ARRAY, items=page)
+
+
+def _batch_settings() -> tuple[int, int]:
+    """(input token budget, max pages) for one batched extraction call."""
+    try:
+        from app.config import settings
+        return (settings.extraction_batch_token_budget, settings.extraction_batch_max_pages)
+    except Exception:
+        return (30_000, 8)
+
+
+def _pack_batches(pages: list[tuple[str, str]], token_budget: int, max_pages: int) -> list[list[tuple[str, str]]]:
+    """Group (url, trimmed text) pages in order so each group fits the token budget and page cap."""
+    batches: list[list[tuple[str, str]]] = []
+    current: list[tuple[str, str]] = []
+    used = 0
+    for url, text in pages:
+        tokens = estimate_tokens(text)
+        if current and (used + tokens > token_budget or len(current) >= max_pages):
+            batches.append(current)
+            current, used = [], 0
+        current.append((url, text))
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _extract_batch_with_gemini(
+    pages: list[tuple[str, str]], *, api_key: str, model: str
+) -> dict[str, dict]:
+    """
+    One Gemini call extracting several trimmed pages ((url, text) pairs) into a schema-constrained
+    array; results are mapped back to their url by page id. Pages missing from the reply, or
+    returned empty, are left out (the caller retries them one by one).
+    """
+    from google import genai
+    from google.genai import types
+
+    prompt = """You are given raw text extracted from several web pages (news articles, posts from X/Twitter, LinkedIn, or similar), each marked with an id.
+For EACH page, extract ONLY the main content: the post body, article body, or primary text. No navigation, ads, cookie notices, or menus.
+Also extract a short title (e.g. headline or first line of the post).
+Return one object per page with its id. Never mix content between pages."""
+
+    _, output_cap = _extraction_settings()
+    estimated_input = sum(estimate_tokens(text) for _, text in pages)
+    parts = [f"=== Page id {i} | URL: {url} ===\n{text}" for i, (url, text) in enumerate(pages)]
+    config = _json_config(
+        types,
+        _batch_schema(types),
+        min(_MODEL_MAX_OUTPUT_TOKENS, max(output_cap, estimated_input + _OUTPUT_OVERHEAD_TOKENS * len(pages))),
+        model,
+    )
+    client = genai.Client(api_key=api_key)
     try:
-        data = json.loads(out)
-        return {"title": data.get("title", ""), "text": data.get("text", "")}
-    except json.JSONDecodeError:
+        response = client.models.generate_content(
+            model=model,
+            contents=prompt + "\n\n" + "\n\n".join(parts),
+            config=config,
+        )
+    except Exception as e:
+        logger.warning("Batched Gemini extraction of %s pages failed: %s", len(pages), e)
+        return {}
+    data = getattr(response, "parsed", None)
+    if not isinstance(data, list):
+        try:
+            data = json.loads((response.text or "").strip())
+        except (json.JSONDecodeError, ValueError):
+            data = None
+    results: dict[str, dict] = {}
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        try:
+            url = pages[int(item.get("id"))][0]
+        except (TypeError, ValueError, IndexError):
+            continue
+        if item.get("text"):
+            results[url] = {"title": item.get("title") or "", "text": item["text"]}
+    _record_usage(response, estimated_input, 0, bool(results))
+    return results
+
+
+class PreparedPage:
+    """A fetched text page before any Gemini call: fingerprint, and local result or raw text."""
+
+    __slots__ = ("url", "fingerprint", "local", "raw_text")
+
+    def __init__(self, url: str, fingerprint: str | None, local: dict | None, raw_text: str | None) -> None:
+        self.url = url
+        self.fingerprint = fingerprint
+        self.local = local  # confident local extraction ({"title", "text"}), or None
+        self.raw_text = raw_text  # stripped page text, set when Gemini is needed
+
+
+def prepare_text_page(url: str) -> PreparedPage | None:
+    """Fetch a page, extract it locally and fingerprint it (no Gemini call). None if the fetch fails."""
+    html = _fetch_html(url)
+    if html is None:
         return None
+    local = _extract_locally(html)
+    if local and local["text"] and local["confidence"] >= _min_local_confidence():
+        fingerprint = content_fingerprint(local["text"]) or content_fingerprint(_strip_html_to_text(html))
+        return PreparedPage(url, fingerprint, {"title": local["title"], "text": local["text"]}, None)
+    # A low-confidence extraction is often a site-wide block shared by every page of the site,
+    # so fingerprint the text Gemini will read instead
+    raw_text = _strip_html_to_text(html)
+    return PreparedPage(url, content_fingerprint(raw_text), None, raw_text)
+
+
+def extract_text_pages(
+    urls: list[str],
+    *,
+    known: Callable[[str], dict | None] | None = None,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> dict[str, tuple[dict | None, str | None]]:
+    """
+    extract_text_content_with_fingerprint for many URLs: pages are fetched concurrently, and those
+    needing Gemini are packed into batched calls (settings.extraction_batch_token_budget /
+    extraction_batch_max_pages). Pages a batch did not return are retried individually.
+    known is only called on the caller's thread. Returns {url: (result or None, fingerprint)}.
+    """
+    from app.fetch_pool import host_of_url, map_concurrent
+
+    urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+    prepared = map_concurrent(prepare_text_page, urls, host_of=host_of_url)
+    out: dict[str, tuple[dict | None, str | None]] = {}
+    # Pages needing Gemini, one per fingerprint (variants of the same story share the extraction)
+    pending: dict[str, list[PreparedPage]] = {}
+    for url, page in zip(urls, prepared):
+        if page is None:
+            out[url] = (None, None)
+            continue
+        reused = known(page.fingerprint) if page.fingerprint and known is not None else None
+        if reused is not None:
+            out[url] = ({**reused, "url": url}, page.fingerprint)
+        elif page.local is not None:
+            out[url] = ({**page.local, "url": url}, page.fingerprint)
+        else:
+            pending.setdefault(page.fingerprint or url, []).append(page)
+    if not pending:
+        return out
+
+    try:
+        key = api_key or _get_gemini_api_key()
+    except ValueError as e:
+        # No Gemini: only the low-confidence pages fail, local and reused results still count
+        logger.warning("Cannot extract %s page(s) without Gemini: %s", sum(map(len, pending.values())), e)
+        for group in pending.values():
+            for page in group:
+                out[page.url] = (None, page.fingerprint)
+        return out
+    model = _default_model(model)
+    input_budget, _ = _extraction_settings()
+    batch_budget, batch_pages = _batch_settings()
+    leaders = [group[0] for group in pending.values()]
+    trimmed = [(p.url, _trim_to_tokens(p.raw_text or "", input_budget)) for p in leaders]
+    extracted: dict[str, dict] = {}
+    for batch in _pack_batches(trimmed, batch_budget, batch_pages):
+        if len(batch) > 1:
+            extracted.update(_extract_batch_with_gemini(batch, api_key=key, model=model))
+    for page in leaders:
+        if page.url in extracted:
+            continue
+        try:
+            single = _extract_with_gemini(page.raw_text or "", page.url, api_key=key, model=model)
+        except Exception as e:
+            logger.warning("Gemini extraction for %s failed: %s", page.url, e)
+            continue
+        if single is not None:
+            extracted[page.url] = single
+    for group in pending.values():
+        result = extracted.get(group[0].url)
+        for page in group:
+            out[page.url] = ({**result, "url": page.url} if result is not None else None, page.fingerprint)
+    return out
+
+
+def extract_text_content_with_fingerprint(
+    url: str,
+    *,
+    known: Callable[[str], dict | None] | None = None,
+    api_key: str | None = None,
+    model: str | None = None,
+) -> tuple[dict | None, str | None]:
+    """
+    Like extract_text_content, but also returns the page's content fingerprint (content_fingerprint
+    of the confidently extracted main text, otherwise of the whole stripped page).
+    known(fingerprint) may return an earlier extraction of the same content (e.g. the AMP or
+    syndicated copy of an article); it is reused, with this url, without another Gemini call.
+    Returns (dict with "title", "text", "url" or None, fingerprint or None).
+    """
+    url = (url or "").strip()
+    if not url:
+        return (None, None)
+    page = prepare_text_page(url)
+    if page is None:
+        return (None, None)
+    if page.fingerprint and known is not None:
+        reused = known(page.fingerprint)
+        if reused is not None:
+            return ({**reused, "url": url}, page.fingerprint)
+    if page.local is not None:
+        return ({**page.local, "url": url}, page.fingerprint)
+    key = api_key or _get_gemini_api_key()
+    extracted = _extract_with_gemini(page.raw_text or "", url, api_key=key, model=model)
+    if extracted is None:
+        return (None, page.fingerprint)
+    extracted["url"] = url
+    return (extracted, page.fingerprint)
 
 
 def extract_text_content(
@@ -120,29 +526,19 @@ def extract_text_content(
     model: str | None = None,
 ) -> dict | None:
     """
-    Fetch a text-based URL (X, LinkedIn, news, etc.) and extract main content using Gemini.
+    Fetch a text-based URL (X, LinkedIn, news, etc.) and extract main content, locally when the
+    page is a confident article match, otherwise using Gemini.
 
     Args:
         url: Full URL of the page (e.g. X post, LinkedIn post, article).
-        api_key: Gemini API key. If None, uses app config or GEMINI_API_KEY env.
+        api_key: Gemini API key (only needed for low-confidence pages). If None, uses app config
+            or GEMINI_API_KEY env.
         model: Gemini model. If None, uses app config GEMINI_MODEL or gemini-2.5-flash.
 
     Returns:
         Dict with "title", "text", and "url". None if fetch or extraction failed.
     """
-    url = (url or "").strip()
-    if not url:
-        return None
-    key = api_key or _get_gemini_api_key()
-    html = _fetch_html(url)
-    if html is None:
-        return None
-    raw_text = _strip_html_to_text(html)
-    extracted = _extract_with_gemini(raw_text, url, api_key=key, model=model)
-    if extracted is None:
-        return None
-    extracted["url"] = url
-    return extracted
+    return extract_text_content_with_fingerprint(url, api_key=api_key, model=model)[0]
 
 
 def main() -> None:
@@ -12,7 +12,14 @@ import os
 import re
 import sys
 
-import httpx
+from app.http_client import get_client, request_timeout
+from app.services import youtube_quota
+
+# YouTube Data API v3 endpoints
+YT_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
+YT_CHANNELS_URL = "https://www.googleapis.com/youtube/v3/channels"
+YT_PLAYLIST_ITEMS_URL = "https://www.googleapis.com/youtube/v3/playlistItems"
+YT_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
 
 
 def _video_id_from_url(url: str) -> str | None:
@@ -47,11 +54,11 @@ def _get_youtube_api_key() -> str:
 
 def _channel_id_from_url(url: str) -> str | None:
     """Extract channel ID from a YouTube channel URL (not a video URL)."""
-    url = (url or "").strip().lower()
-    if not url or "youtube.com" not in url and "youtu.be" in url:
+    url = (url or "").strip()
+    if not url or "youtube.com" not in url.lower() and "youtu.be" in url.lower():
         return None
-    # /channel/UCxxxxxxxxxxxxxxxxxx
-    m = re.search(r"youtube\.com/channel/([a-zA-Z0-9_-]{24})", url)
+    # /channel/UCxxxxxxxxxxxxxxxxxx (IDs are case-sensitive; only the host is matched loosely)
+    m = re.search(r"youtube\.com/channel/([a-zA-Z0-9_-]{24})", url, re.IGNORECASE)
     if m:
         return m.group(1)
     return None
@@ -80,140 +87,327 @@ def _channel_handle_or_username_from_url(url: str) -> tuple[str | None, bool]:
     return (None, True)
 
 
-def get_latest_video_from_channel(channel_url: str) -> tuple[dict | None, str | None]:
-    """
-    Get the latest uploaded video URL and snippet for a YouTube channel.
-    channel_url: channel page URL (e.g. youtube.com/@Handle, youtube.com/channel/UC...).
-    Returns ({"url": "https://...", "title": "...", "published_at": "..."}, error_message).
-    """
-    api_key = _get_youtube_api_key()
-    if not api_key:
-        return (None, "YOUTUBE_API_KEY not set")
-
-    channel_url = (channel_url or "").strip()
-    if not channel_url:
-        return (None, "Channel URL is required")
-
+def _resolve_channel_id(channel_url: str, api_key: str) -> tuple[str | None, str | None]:
+    """Channel ID for a channel URL: read from /channel/ID, else search (@handle) or forUsername (legacy)."""
     channel_id = _channel_id_from_url(channel_url)
-    if not channel_id:
-        handle_or_user, is_handle = _channel_handle_or_username_from_url(channel_url)
-        if not handle_or_user:
-            return (None, "Unsupported channel URL format (use /channel/ID, /@Handle, /c/Name, or /user/name)")
-        if is_handle:
-            # Resolve @handle via search
-            try:
-                with httpx.Client(timeout=15.0) as client:
-                    r = client.get(
-                        "https://www.googleapis.com/youtube/v3/search",
-                        params={
-                            "part": "snippet",
-                            "type": "channel",
-                            "q": f"@{handle_or_user}",
-                            "key": api_key,
-                            "maxResults": 1,
-                        },
-                    )
-                    r.raise_for_status()
-                    data = r.json()
-            except Exception as e:
-                return (None, f"YouTube API search failed: {e}")
-            items = data.get("items") or []
-            if not items:
-                return (None, "Channel not found for this handle")
-            channel_id = items[0].get("id", {}).get("channelId")
-            if not channel_id:
-                return (None, "Could not resolve channel ID")
-        else:
-            # Legacy username: forUsername
+    if channel_id:
+        return (channel_id, None)
+    handle_or_user, is_handle = _channel_handle_or_username_from_url(channel_url)
+    if not handle_or_user:
+        return (None, "Unsupported channel URL format (use /channel/ID, /@Handle, /c/Name, or /user/name)")
+    if is_handle:
+        # Resolve @handle via channels.list forHandle (1 unit) before falling back to search (100)
+        if youtube_quota.spend("channels"):
             try:
-                with httpx.Client(timeout=15.0) as client:
-                    r = client.get(
-                        "https://www.googleapis.com/youtube/v3/channels",
-                        params={
-                            "part": "contentDetails",
-                            "forUsername": handle_or_user,
-                            "key": api_key,
-                        },
-                    )
-                    r.raise_for_status()
-                    data = r.json()
-            except Exception as e:
-                return (None, f"YouTube API channels failed: {e}")
-            items = data.get("items") or []
-            if not items:
-                return (None, "Channel not found for this username")
-            channel_id = items[0].get("id")
-            if not channel_id:
-                return (None, "Could not resolve channel ID")
-
-    # Get uploads playlist ID
-    try:
-        with httpx.Client(timeout=15.0) as client:
-            r = client.get(
-                "https://www.googleapis.com/youtube/v3/channels",
+                r = get_client(YT_CHANNELS_URL).get(
+                    YT_CHANNELS_URL,
+                    params={"part": "id", "forHandle": f"@{handle_or_user}", "key": api_key},
+                )
+                if youtube_quota.is_quota_error(r):
+                    youtube_quota.mark_exhausted()
+                r.raise_for_status()
+                items = r.json().get("items") or []
+                if items and items[0].get("id"):
+                    return (items[0]["id"], None)
+            except Exception:
+                pass
+        if not youtube_quota.spend("search"):
+            return (None, youtube_quota.QUOTA_ERROR)
+        try:
+            r = get_client(YT_SEARCH_URL).get(
+                YT_SEARCH_URL,
+                params={
+                    "part": "snippet",
+                    "type": "channel",
+                    "q": f"@{handle_or_user}",
+                    "key": api_key,
+                    "maxResults": 1,
+                },
+            )
+            if youtube_quota.is_quota_error(r):
+                youtube_quota.mark_exhausted()
+            r.raise_for_status()
+            data = r.json()
+        except Exception as e:
+            return (None, f"YouTube API search failed: {e}")
+        items = data.get("items") or []
+        if not items:
+            return (None, "Channel not found for this handle")
+        channel_id = items[0].get("id", {}).get("channelId")
+    else:
+        # Legacy username: forUsername
+        if not youtube_quota.spend("channels"):
+            return (None, youtube_quota.QUOTA_ERROR)
+        try:
+            r = get_client(YT_CHANNELS_URL).get(
+                YT_CHANNELS_URL,
                 params={
                     "part": "contentDetails",
-                    "id": channel_id,
+                    "forUsername": handle_or_user,
                     "key": api_key,
                 },
             )
+            if youtube_quota.is_quota_error(r):
+                youtube_quota.mark_exhausted()
             r.raise_for_status()
             data = r.json()
-    except Exception as e:
-        return (None, f"YouTube API channels failed: {e}")
-    items = data.get("items") or []
-    if not items:
-        return (None, "Channel not found")
-    uploads_id = (items[0].get("contentDetails") or {}).get("relatedPlaylists", {}).get("uploads")
-    if not uploads_id:
-        return (None, "Channel has no uploads playlist")
+        except Exception as e:
+            return (None, f"YouTube API channels failed: {e}")
+        items = data.get("items") or []
+        if not items:
+            return (None, "Channel not found for this username")
+        channel_id = items[0].get("id")
+    if not channel_id:
+        return (None, "Could not resolve channel ID")
+    return (channel_id, None)
 
-    # Get latest playlist item
-    try:
-        with httpx.Client(timeout=15.0) as client:
-            r = client.get(
-                "https://www.googleapis.com/youtube/v3/playlistItems",
+
+# channels.list accepts up to 50 comma-separated ids per request
+CHANNELS_LIST_BATCH = 50
+
+
+def _fetch_uploads_playlist_ids(channel_ids: list[str], api_key: str) -> tuple[dict[str, str], str | None]:
+    """
+    Uploads playlist ID per channel ID, using one channels.list call per 50 ids.
+    Returns (mapping for channels that have one, error from the first failed batch).
+    """
+    uploads: dict[str, str] = {}
+    first_error: str | None = None
+    unique_ids = list(dict.fromkeys(channel_ids))
+    for i in range(0, len(unique_ids), CHANNELS_LIST_BATCH):
+        batch = unique_ids[i:i + CHANNELS_LIST_BATCH]
+        if not youtube_quota.spend("channels"):
+            first_error = first_error or youtube_quota.QUOTA_ERROR
+            break
+        try:
+            r = get_client(YT_CHANNELS_URL).get(
+                YT_CHANNELS_URL,
                 params={
-                    "part": "snippet",
-                    "playlistId": uploads_id,
-                    "maxResults": 1,
+                    "part": "contentDetails",
+                    "id": ",".join(batch),
+                    "maxResults": CHANNELS_LIST_BATCH,
                     "key": api_key,
                 },
             )
+            if youtube_quota.is_quota_error(r):
+                youtube_quota.mark_exhausted()
             r.raise_for_status()
             data = r.json()
+        except Exception as e:
+            first_error = first_error or f"YouTube API channels failed: {e}"
+            continue
+        for item in data.get("items") or []:
+            uploads_id = (item.get("contentDetails") or {}).get("relatedPlaylists", {}).get("uploads")
+            if item.get("id") and uploads_id:
+                uploads[item["id"]] = uploads_id
+    return (uploads, first_error)
+
+
+def _channel_key(channel_url: str) -> str:
+    """Normalize a channel URL for the youtube_channels cache (no scheme/www/query, no trailing slash)."""
+    url = (channel_url or "").strip()
+    url = re.sub(r"^https?://", "", url, flags=re.IGNORECASE)
+    url = re.sub(r"^(www\.|m\.)", "", url, flags=re.IGNORECASE)
+    url = re.split(r"[?#]", url, maxsplit=1)[0].rstrip("/")
+    # Handles and legacy names are case-insensitive; /channel/ IDs are not
+    if "/channel/" in url:
+        host, _, rest = url.partition("/")
+        return host.lower() + "/" + rest
+    return url.lower()
+
+
+def _load_cached_channels(keys: list[str]) -> dict[str, tuple[str, str | None]]:
+    """(channel_id, uploads_playlist_id) per channel key already in youtube_channels."""
+    if not keys:
+        return {}
+    try:
+        from app.db import SessionLocal
+        from app.models.database import YoutubeChannel
+
+        with SessionLocal() as db:
+            rows = db.query(YoutubeChannel).filter(YoutubeChannel.channel_key.in_(keys)).all()
+            return {r.channel_key: (r.channel_id, r.uploads_playlist_id) for r in rows}
+    except Exception:
+        return {}
+
+
+def _save_cached_channels(resolved: dict[str, tuple[str, str]]) -> None:
+    """Upsert channel_key -> (channel_id, uploads_playlist_id) into youtube_channels."""
+    if not resolved:
+        return
+    try:
+        from datetime import datetime, timezone
+
+        from app.db import SessionLocal
+        from app.models.database import YoutubeChannel
+
+        now = datetime.now(timezone.utc)
+        with SessionLocal() as db:
+            existing = {
+                r.channel_key: r
+                for r in db.query(YoutubeChannel).filter(YoutubeChannel.channel_key.in_(list(resolved))).all()
+            }
+            for key, (channel_id, uploads_id) in resolved.items():
+                row = existing.get(key)
+                if row:
+                    row.channel_id = channel_id
+                    row.uploads_playlist_id = uploads_id
+                    row.resolved_at = now
+                else:
+                    db.add(YoutubeChannel(
+                        channel_key=key,
+                        channel_id=channel_id,
+                        uploads_playlist_id=uploads_id,
+                        resolved_at=now,
+                    ))
+            db.commit()
+    except Exception:
+        pass
+
+
+def resolve_uploads_playlists(channel_urls: list[str]) -> dict[str, tuple[str | None, str | None]]:
+    """
+    Uploads playlist ID for each channel URL: (uploads_playlist_id, error_message).
+    Cached channels cost nothing; the rest are resolved to channel IDs (search only for @handles)
+    and their uploads playlists fetched with one channels.list call per 50 channels. Results are
+    persisted in youtube_channels.
+    """
+    from app.fetch_pool import map_concurrent
+
+    urls = list(dict.fromkeys((u or "").strip() for u in channel_urls if (u or "").strip()))
+    if not urls:
+        return {}
+    out: dict[str, tuple[str | None, str | None]] = {}
+    keys = {u: _channel_key(u) for u in urls}
+    cached = _load_cached_channels(list(set(keys.values())))
+    missing = []
+    for u in urls:
+        hit = cached.get(keys[u])
+        if hit and hit[1]:
+            out[u] = (hit[1], None)
+        else:
+            missing.append(u)
+    if not missing:
+        return out
+
+    api_key = _get_youtube_api_key()
+    if not api_key:
+        for u in missing:
+            out[u] = (None, "YOUTUBE_API_KEY not set")
+        return out
+
+    def channel_id_for(u: str) -> tuple[str | None, str | None]:
+        hit = cached.get(keys[u])
+        if hit:
+            return (hit[0], None)
+        return _resolve_channel_id(u, api_key)
+
+    ids = dict(zip(missing, map_concurrent(channel_id_for, missing)))
+    uploads, batch_error = _fetch_uploads_playlist_ids(
+        [cid for cid, err in ids.values() if cid], api_key
+    )
+    to_save: dict[str, tuple[str, str]] = {}
+    for u in missing:
+        channel_id, err = ids[u]
+        if not channel_id:
+            out[u] = (None, err)
+        elif channel_id in uploads:
+            out[u] = (uploads[channel_id], None)
+            to_save[keys[u]] = (channel_id, uploads[channel_id])
+        else:
+            out[u] = (None, batch_error or "Channel has no uploads playlist")
+    _save_cached_channels(to_save)
+    return out
+
+
+def get_recent_videos_from_channel(
+    channel_url: str,
+    *,
+    uploads_playlist_id: str | None = None,
+    max_results: int = 1,
+) -> tuple[list[dict], str | None]:
+    """
+    Most recent uploads of a YouTube channel, newest first (one playlistItems call, 1 unit).
+    channel_url: channel page URL (e.g. youtube.com/@Handle, youtube.com/channel/UC...).
+    uploads_playlist_id: skip resolution when the caller already has it (see resolve_uploads_playlists).
+    Returns ([{"url": "https://...", "title": "...", "published_at": "..."}, ...], error_message).
+    """
+    api_key = _get_youtube_api_key()
+    if not api_key:
+        return ([], "YOUTUBE_API_KEY not set")
+
+    channel_url = (channel_url or "").strip()
+    if not channel_url:
+        return ([], "Channel URL is required")
+
+    uploads_id = uploads_playlist_id
+    if not uploads_id:
+        uploads_id, err = resolve_uploads_playlists([channel_url]).get(channel_url, (None, None))
+        if not uploads_id:
+            return ([], err or "Channel has no uploads playlist")
+
+    if not youtube_quota.spend("playlistItems"):
+        return ([], youtube_quota.QUOTA_ERROR)
+    try:
+        r = get_client(YT_PLAYLIST_ITEMS_URL).get(
+            YT_PLAYLIST_ITEMS_URL,
+            params={
+                "part": "snippet",
+                "playlistId": uploads_id,
+                "maxResults": max(1, min(max_results, 50)),
+                "key": api_key,
+            },
+        )
+        if youtube_quota.is_quota_error(r):
+            youtube_quota.mark_exhausted()
+        r.raise_for_status()
+        data = r.json()
     except Exception as e:
-        return (None, f"YouTube API playlistItems failed: {e}")
+        return ([], f"YouTube API playlistItems failed: {e}")
     items = data.get("items") or []
     if not items:
-        return (None, "No videos in channel")
-    snippet = items[0].get("snippet") or {}
-    video_id = (snippet.get("resourceId") or {}).get("videoId")
-    if not video_id:
-        return (None, "Could not get video ID from playlist item")
-    published = snippet.get("publishedAt") or ""
-    title = snippet.get("title") or ""
-    return (
-        {
+        return ([], "No videos in channel")
+    videos = []
+    for item in items:
+        snippet = item.get("snippet") or {}
+        video_id = (snippet.get("resourceId") or {}).get("videoId")
+        if not video_id:
+            continue
+        videos.append({
             "url": f"https://www.youtube.com/watch?v={video_id}",
-            "title": title,
-            "published_at": published,
-        },
-        None,
-    )
+            "title": snippet.get("title") or "",
+            "published_at": snippet.get("publishedAt") or "",
+        })
+    if not videos:
+        return ([], "Could not get video ID from playlist item")
+    return (videos, None)
+
+
+def get_latest_video_from_channel(
+    channel_url: str,
+    *,
+    uploads_playlist_id: str | None = None,
+) -> tuple[dict | None, str | None]:
+    """
+    Get the latest uploaded video URL and snippet for a YouTube channel.
+    Returns ({"url": "https://...", "title": "...", "published_at": "..."}, error_message).
+    """
+    videos, err = get_recent_videos_from_channel(channel_url, uploads_playlist_id=uploads_playlist_id)
+    return (videos[0] if videos else None, err)
 
 
 def _fetch_metadata_api(video_id: str, api_key: str) -> dict | None:
-    """Fetch video snippet (title, channelTitle) from YouTube Data API v3."""
-    if not api_key:
+    """Fetch video snippet (title, channelTitle) from YouTube Data API v3 (None: use oEmbed instead)."""
+    if not api_key or not youtube_quota.spend("videos"):
         return None
-    url = "https://www.googleapis.com/youtube/v3/videos"
+    url = YT_VIDEOS_URL
     params = {"id": video_id, "part": "snippet", "key": api_key}
     try:
-        with httpx.Client(timeout=15.0) as client:
-            r = client.get(url, params=params)
-            r.raise_for_status()
-            data = r.json()
+        r = get_client(url).get(url, params=params)
+        if youtube_quota.is_quota_error(r):
+            youtube_quota.mark_exhausted()
+        r.raise_for_status()
+        data = r.json()
     except Exception:
         return None
     items = data.get("items") or []
@@ -232,10 +426,9 @@ def _fetch_metadata_oembed(video_id: str) -> dict | None:
     oembed_url = "https://www.youtube.com/oembed"
     params = {"url": video_url, "format": "json"}
     try:
-        with httpx.Client(timeout=10.0) as client:
-            r = client.get(oembed_url, params=params)
-            r.raise_for_status()
-            data = r.json()
+        r = get_client(oembed_url).get(oembed_url, params=params, timeout=request_timeout(10.0))
+        r.raise_for_status()
+        data = r.json()
     except Exception:
         return None
     return {
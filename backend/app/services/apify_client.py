@@ -0,0 +1,173 @@
+"""
+Asynchronous Apify actor runs and a batching collector.
+run-sync-get-dataset-items holds an HTTP call open for the whole run (one run and one blocked worker
+per profile); here a run is started with POST /acts/{actor}/runs, awaited with the long-polling
+waitForFinish parameter, and its dataset is read once it has finished.
+
+BatchCollector gathers keys submitted by any caller (any user / request) for a short window and
+hands them to one run; callers get a Future per key, so a single thread waits on the run instead
+of one worker per key.
+
+At most settings.apify_max_concurrent_runs runs are in flight at once; callers wait for a slot
+inside run_actor, so fan-outs that mix Apify with other providers only hold it for the run itself.
+
+Import: from app.services.apify_client import BatchCollector, run_actor
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+import httpx
+
+from app.circuit_breaker import NO_ADAPTIVE_TIMEOUT
+from app.config import settings
+from app.http_client import get_client, request_timeout
+
+APIFY_API = "https://api.apify.com/v2"
+
+# Longest server-side wait Apify allows per status request (seconds)
+_WAIT_FOR_FINISH = 60
+_TERMINAL_STATUSES = ("SUCCEEDED", "FAILED", "ABORTED", "TIMED-OUT")
+
+_run_slots = threading.BoundedSemaphore(max(1, settings.apify_max_concurrent_runs))
+
+
+def _apify_error(e: httpx.HTTPStatusError) -> str:
+    body = e.response.text
+    if e.response.status_code == 401:
+        return "Apify API token invalid or missing (set APIFY_API_TOKEN)"
+    if e.response.status_code in (400, 402, 408):
+        return f"Apify: {body[:200]}" if body else str(e)
+    return f"Apify returned {e.response.status_code}: {body[:200]}"
+
+
+def run_actor(
+    actor_id: str,
+    payload: dict,
+    api_token: str,
+    *,
+    run_timeout: int = 120,
+    max_wait: float | None = None,
+) -> tuple[list | None, str | None]:
+    """
+    Start an actor run, wait for it to finish and return (dataset items, None) or (None, error).
+    run_timeout: run timeout passed to Apify (seconds); max_wait: how long to wait for the run here.
+    Waits for one of the settings.apify_max_concurrent_runs run slots first.
+    """
+    with _run_slots:
+        return _run_actor(actor_id, payload, api_token, run_timeout=run_timeout, max_wait=max_wait)
+
+
+def _run_actor(
+    actor_id: str,
+    payload: dict,
+    api_token: str,
+    *,
+    run_timeout: int,
+    max_wait: float | None,
+) -> tuple[list | None, str | None]:
+    max_wait = settings.apify_run_max_wait_seconds if max_wait is None else max_wait
+    params = {"token": api_token}
+    try:
+        r = get_client(APIFY_API).post(
+            f"{APIFY_API}/acts/{actor_id}/runs",
+            params={**params, "timeout": run_timeout},
+            json=payload,
+        )
+        r.raise_for_status()
+        run = r.json().get("data") or {}
+        deadline = time.monotonic() + max_wait
+        while run.get("status") not in _TERMINAL_STATUSES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return (None, "Apify run did not finish in time")
+            wait = int(min(_WAIT_FOR_FINISH, max(1, remaining)))
+            r = get_client(APIFY_API).get(
+                f"{APIFY_API}/actor-runs/{run.get('id')}",
+                params={**params, "waitForFinish": wait},
+                timeout=request_timeout(wait + 10.0),
+                # Long poll: must not be capped at the host's p99 for quick API calls
+                extensions=NO_ADAPTIVE_TIMEOUT,
+            )
+            r.raise_for_status()
+            run = r.json().get("data") or {}
+        if run.get("status") != "SUCCEEDED":
+            return (None, f"Apify run {str(run.get('status')).lower()}")
+        r = get_client(APIFY_API).get(
+            f"{APIFY_API}/datasets/{run.get('defaultDatasetId')}/items",
+            params={**params, "clean": "true", "format": "json"},
+        )
+        r.raise_for_status()
+        items = r.json()
+    except httpx.HTTPStatusError as e:
+        return (None, _apify_error(e))
+    except Exception as e:
+        return (None, f"Apify request failed: {e}")
+    return (items if isinstance(items, list) else [], None)
+
+
+class BatchCollector:
+    """
+    Collect keys for up to `window` seconds (or until max_batch keys) and resolve them with one
+    run_batch(keys) call on a collector thread. run_batch returns {key: result}; keys it leaves
+    out resolve to missing_result. Keys already pending or running are joined, not re-submitted.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[list[str]], dict],
+        *,
+        window: float,
+        max_batch: int,
+        missing_result=None,
+        name: str = "batch",
+    ) -> None:
+        self._run_batch = run_batch
+        self._window = window
+        self._max_batch = max(1, max_batch)
+        self._missing_result = missing_result
+        self._name = name
+        self._lock = threading.Lock()
+        self._pending: dict[str, Future] = {}
+        self._running: dict[str, Future] = {}
+
+    def submit(self, key: str) -> Future:
+        with self._lock:
+            future = self._pending.get(key) or self._running.get(key)
+            if future is not None:
+                return future
+            future = Future()
+            self._pending[key] = future
+            if len(self._pending) >= self._max_batch:
+                self._start_flush(delay=0.0)
+            elif len(self._pending) == 1:
+                self._start_flush(delay=self._window)
+            return future
+
+    def _start_flush(self, delay: float) -> None:
+        threading.Thread(target=self._flush, args=(delay,), name=self._name, daemon=True).start()
+
+    def _flush(self, delay: float) -> None:
+        if delay:
+            time.sleep(delay)
+        with self._lock:
+            batch = self._pending
+            if not batch:
+                return
+            self._pending = {}
+            self._running.update(batch)
+        try:
+            results = self._run_batch(list(batch))
+            for key, future in batch.items():
+                future.set_result(results.get(key, self._missing_result))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            with self._lock:
+                for key in batch:
+                    self._running.pop(key, None)
@@ -3,37 +3,144 @@ Fetch articles from Google News RSS based on topic keywords.
 Uses the free Google News RSS search: https://news.google.com/rss/search?q=KEYWORD
 Google News RSS returns redirect URLs (news.google.com/rss/articles/xxx) - we resolve
 them to actual article URLs so get_or_extract_summary can fetch the real content.
+
+Each decode is a round-trip to Google, so decoded links are kept in google_news_links (they never
+change) and callers that only need a few articles fetch undecoded entries (resolve=False) and
+decode just the ones they pick (resolve_google_news_urls / pick_topic_article_urls).
+
+Topic feeds are shared by every user: undecoded results are cached by normalized topic (Unicode
+NFKC, case-folded, whitespace collapsed) + locale, and concurrent misses share one fetch.
 """
 from __future__ import annotations
 
-from urllib.parse import quote_plus
+import threading
+import unicodedata
+from collections import OrderedDict
+from urllib.parse import quote_plus, urlparse
 
 try:
     from googlenewsdecoder import gnewsdecoder
 except ImportError:
     gnewsdecoder = None  # optional: app works without it, URLs stay unresolved
 
+from app.config import settings
+from app.fetch_pool import SingleFlight, map_concurrent
+from app.services.feed_reader import fetch_feed
+from app.ttl_cache import TTLCache
+
+GOOGLE_NEWS_HOST = "news.google.com"
+
 # User-Agent for Google News (polite scraping)
 USER_AGENT = "AuraBriefing/1.0 (Feed Reader; +https://github.com)"
 
 
-def resolve_google_news_url(link: str) -> str:
-    """
-    Resolve news.google.com URLs to the real article URL using googlenewsdecoder.
-    The library handles timeouts, proxies, and different formats internally.
-    Returns original link if resolution fails or package is not installed.
-    """
+# Decoded links kept in memory in front of the google_news_links table
+_MEMORY_LINKS = 5000
+_decoded: OrderedDict[str, str] = OrderedDict()
+_decoded_lock = threading.Lock()
+_inflight = SingleFlight()
+
+
+def is_google_news_url(url: str) -> bool:
+    try:
+        return (urlparse(url).hostname or "").lower() == GOOGLE_NEWS_HOST
+    except ValueError:
+        return False
+
+
+def _remember(pairs: dict[str, str]) -> None:
+    with _decoded_lock:
+        for link, article_url in pairs.items():
+            _decoded[link] = article_url
+            _decoded.move_to_end(link)
+        while len(_decoded) > _MEMORY_LINKS:
+            _decoded.popitem(last=False)
+
+
+def _load_decoded(links: list[str]) -> dict[str, str]:
+    """Known decodes for links: memory first, then one query for the rest."""
+    found = {}
+    with _decoded_lock:
+        for link in links:
+            if link in _decoded:
+                found[link] = _decoded[link]
+                _decoded.move_to_end(link)
+    missing = [link for link in links if link not in found]
+    if not missing:
+        return found
+    try:
+        from app.db import SessionLocal
+        from app.models.database import GoogleNewsLink
+
+        with SessionLocal() as db:
+            rows = db.query(GoogleNewsLink).filter(GoogleNewsLink.google_url.in_(missing)).all()
+            stored = {row.google_url: row.article_url for row in rows}
+    except Exception:
+        # Cache unavailable (e.g. DB not ready); decode without it
+        stored = {}
+    _remember(stored)
+    found.update(stored)
+    return found
+
+
+def _store_decoded(link: str, article_url: str) -> None:
+    _remember({link: article_url})
+    try:
+        from app.db import SessionLocal
+        from app.models.database import GoogleNewsLink
+
+        with SessionLocal() as db:
+            if db.query(GoogleNewsLink).filter(GoogleNewsLink.google_url == link).first() is None:
+                db.add(GoogleNewsLink(google_url=link, article_url=article_url))
+                db.commit()
+    except Exception:
+        # Another worker stored it first, or the DB is unavailable: the memory copy is enough
+        pass
+
+
+def _decode(link: str) -> str:
     if gnewsdecoder is None:
         return link
     try:
         decoded = gnewsdecoder(link)
-        if decoded.get("status"):
+        if decoded.get("status") and decoded.get("decoded_url"):
+            _store_decoded(link, decoded["decoded_url"])
             return decoded["decoded_url"]
     except Exception:
         pass
+    # Failures are not stored: they are usually transient (rate limits, timeouts)
     return link
 
 
+def resolve_google_news_urls(links: list[str]) -> list[str]:
+    """
+    Resolve news.google.com URLs to the real article URLs (same order as links). Known links come
+    from the decode cache; the rest are decoded concurrently with googlenewsdecoder. Links that
+    are not Google News URLs, or fail to decode, are returned unchanged.
+    Decodes take news.google.com fetch slots, so call this from the top level, never from inside
+    a slotted fan-out (see app.fetch_pool).
+    """
+    google = list(dict.fromkeys(link for link in links if link and is_google_news_url(link)))
+    resolved = _load_decoded(google) if google else {}
+    missing = [link for link in google if link not in resolved]
+    if missing and gnewsdecoder is not None:
+        decoded = map_concurrent(
+            lambda link: _inflight.do(link, lambda: _decode(link)),
+            missing,
+            host_of=lambda _: GOOGLE_NEWS_HOST,
+        )
+        resolved.update(zip(missing, decoded))
+    return [resolved.get(link, link) for link in links]
+
+
+def resolve_google_news_url(link: str) -> str:
+    """
+    Resolve one news.google.com URL to the real article URL (cached; see resolve_google_news_urls).
+    Returns original link if resolution fails or package is not installed.
+    """
+    return resolve_google_news_urls([link])[0]
+
+
 def _build_google_news_rss_url(topic: str, hl: str = "en-US", gl: str = "US", ceid: str = "US:en") -> str:
     """Build Google News RSS search URL for a topic."""
     q = quote_plus((topic or "").strip())
@@ -42,37 +149,35 @@ def _build_google_news_rss_url(topic: str, hl: str = "en-US", gl: str = "US", ce
     return f"https://news.google.com/rss/search?q={q}&hl={hl}&gl={gl}&ceid={ceid}"
 
 
-def fetch_articles_for_topic(
-    topic: str,
-    max_articles: int = 10,
-    hl: str = "en-US",
-    gl: str = "US",
-) -> list[dict]:
-    """
-    Fetch articles from Google News RSS for a single topic.
-    Returns list of {url, title, published_at, source}.
-    """
-    topic = (topic or "").strip()
-    if not topic:
-        return []
-    try:
-        import feedparser
-    except ImportError:
-        return []
+class _CachedTopicFeed:
+    __slots__ = ("articles", "fetched_for")
+
+    def __init__(self, articles: list[dict], fetched_for: int) -> None:
+        self.articles = articles  # undecoded
+        self.fetched_for = fetched_for  # entries asked of the feed
+
+
+_topic_cache: TTLCache[_CachedTopicFeed] = TTLCache(
+    ttl=settings.topic_feed_cache_ttl_seconds,
+    stale_ttl=settings.topic_feed_cache_stale_seconds,
+)
+
+
+def normalize_topic(topic: str) -> str:
+    """Topic as used for the cache key and query: NFKC, case-folded, single spaces."""
+    return " ".join(unicodedata.normalize("NFKC", topic or "").casefold().split())
+
+
+def _fetch_topic_feed(topic: str, max_articles: int, hl: str, gl: str) -> _CachedTopicFeed:
+    """Undecoded articles from the Google News search feed (raises if the feed cannot be fetched)."""
     url = _build_google_news_rss_url(topic, hl=hl, gl=gl)
-    if not url:
-        return []
-    try:
-        parsed = feedparser.parse(url, request_headers={"User-Agent": USER_AGENT})
-    except Exception:
-        return []
+    parsed = fetch_feed(url, headers={"User-Agent": USER_AGENT}, max_entries=max_articles)
     entries = getattr(parsed, "entries", [])[:max_articles]
     results = []
     for entry in entries:
         link = entry.get("link") or entry.get("href")
         if not link:
             continue
-        link = resolve_google_news_url(link)
         title = entry.get("title") or ""
         published = None
         for key in ("published", "updated", "created"):
@@ -82,9 +187,78 @@ def fetch_articles_for_topic(
                 break
         source = (entry.get("source") or {}).get("title") if isinstance(entry.get("source"), dict) else None
         results.append({"url": link, "title": title, "published_at": published, "source": source})
+    return _CachedTopicFeed(results, max_articles)
+
+
+def fetch_articles_for_topic(
+    topic: str,
+    max_articles: int = 10,
+    hl: str = "en-US",
+    gl: str = "US",
+    *,
+    resolve: bool = False,
+) -> list[dict]:
+    """
+    Fetch articles from Google News RSS for a single topic (cached across users, see module docstring).
+    Returns list of {url, title, published_at, source}. With resolve=False the urls are left as
+    news.google.com links, for callers that decode only the articles they use.
+    """
+    topic = normalize_topic(topic)
+    if not topic:
+        return []
+    try:
+        import feedparser  # noqa: F401 - parsed by fetch_feed
+    except ImportError:
+        return []
+    key = f"{hl}|{gl}|{topic}"
+    size = max(max_articles, settings.topic_feed_cache_articles)
+    try:
+        cached = _topic_cache.get_or_load(key, lambda: _fetch_topic_feed(topic, size, hl, gl))
+        if cached.fetched_for < max_articles:
+            cached = _fetch_topic_feed(topic, max_articles, hl, gl)
+            _topic_cache.set(key, cached)
+    except Exception:
+        # Failures are not cached: the next request tries again
+        return []
+    # Copies, so callers can rewrite urls without touching the shared entry
+    results = [dict(a) for a in cached.articles[:max_articles]]
+    if resolve:
+        _resolve_articles(results)
     return results
 
 
+def _resolve_articles(articles: list[dict]) -> None:
+    """Replace each article's Google News url with the decoded article url (in place)."""
+    for article, url in zip(articles, resolve_google_news_urls([a["url"] for a in articles])):
+        article["url"] = url
+
+
+def fetch_articles_for_topics(
+    topics: list[str],
+    max_articles: int = 10,
+    hl: str = "en-US",
+    gl: str = "US",
+    *,
+    resolve: bool = False,
+) -> list[tuple[str, list[dict]]]:
+    """
+    fetch_articles_for_topic for every non-empty topic, concurrently (bounded by the fetch pool's
+    per-host cap for news.google.com). Returns (topic, articles) in the order of topics, so
+    callers that dedupe across topics get the same result as a sequential loop.
+    With resolve=True every link is decoded, in one pass after all feeds are fetched.
+    """
+    cleaned = [t for t in ((t or "").strip() for t in topics or []) if t]
+    # Feeds only: decoding inside these slotted workers would wait on the slots they hold
+    articles = map_concurrent(
+        lambda t: fetch_articles_for_topic(t, max_articles=max_articles, hl=hl, gl=gl),
+        cleaned,
+        host_of=lambda _: GOOGLE_NEWS_HOST,
+    )
+    if resolve:
+        _resolve_articles([a for topic_articles in articles for a in topic_articles])
+    return list(zip(cleaned, articles))
+
+
 def fetch_articles_by_topics(
     topics: list[str],
     max_per_topic: int = 5,
@@ -98,12 +272,10 @@ def fetch_articles_by_topics(
         return []
     result = []
     seen_urls: set[str] = set()
-    for topic in topics:
-        topic = (topic or "").strip()
-        if not topic:
-            continue
-        articles = fetch_articles_for_topic(topic, max_articles=max_per_topic, hl=hl, gl=gl)
-        # Dedupe by URL across topics
+    # Every link decoded in one pass (cached ones for free, the rest concurrently)
+    fetched = fetch_articles_for_topics(topics, max_articles=max_per_topic, hl=hl, gl=gl, resolve=True)
+    for topic, articles in fetched:
+        # Dedupe by URL across topics (in topic order, as fetched concurrently above)
         deduped = []
         for a in articles:
             u = (a.get("url") or "").strip()
@@ -111,5 +283,50 @@ def fetch_articles_by_topics(
                 seen_urls.add(u)
                 deduped.append(a)
         result.append({"topic": topic, "articles": deduped})
-    
     return result
+
+
+def pick_topic_article_urls(
+    topic_articles: list[tuple[str, list[dict]]],
+    exclude: list[str] | None = None,
+    candidates_per_topic: int = 5,
+) -> list[str]:
+    """
+    One article URL per topic from undecoded fetch results (resolve=False), in topic order,
+    skipping URLs in exclude, already picked, or that could not be decoded. Picks are the same as
+    taking the topics one by one: a topic's pick is only accepted once every earlier topic has its
+    own. Only candidates the sequential walk would consider are decoded, concurrently across topics.
+    """
+    taken = set(exclude or [])
+    limits = [min(candidates_per_topic, len(articles)) for _, articles in topic_articles]
+    decoded: list[list[str]] = [[] for _ in topic_articles]
+    picks: list[str | None] = [None] * len(topic_articles)
+
+    def usable(i: int) -> str | None:
+        # taken only grows, so a candidate rejected once stays rejected
+        for url in decoded[i]:
+            if url and url not in taken and not is_google_news_url(url):
+                return url
+        return None
+
+    first = 0
+    while first < len(topic_articles):
+        # Accept picks strictly in topic order, as far as the decoded candidates allow
+        while first < len(topic_articles):
+            url = usable(first)
+            if url:
+                picks[first] = url
+                taken.add(url)
+            elif len(decoded[first]) < limits[first]:
+                break
+            first += 1
+        # Next candidate of every remaining topic with nothing usable yet (always includes first)
+        waiting = [
+            i for i in range(first, len(topic_articles)) if len(decoded[i]) < limits[i] and not usable(i)
+        ]
+        if not waiting:
+            break
+        links = [topic_articles[i][1][len(decoded[i])].get("url") or "" for i in waiting]
+        for i, url in zip(waiting, resolve_google_news_urls(links)):
+            decoded[i].append(url.strip())
+    return [u for u in picks if u]
@@ -0,0 +1,335 @@
+"""
+Background ingestion: poll each followed source according to its FetchFrequency, store new
+entries in the items table (unique on source_id + external_id) and update last_fetched_at.
+Each poll reads the source's recent entries newest-first and stops at the first one already
+stored, checked against an in-memory seen-ID set per source rather than a query per entry.
+Read paths (/briefings, /sources/latest, briefing URL gathering) then read the latest Item per
+source from the database instead of calling YouTube / RSS / Nitter / Apify on the request path.
+MANUAL sources are never polled; POST /sources/refresh (refresh_sources) fetches them on demand.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Iterator
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.database import FetchFrequency, Item, Source
+from app.services.latest_from_sources import (
+    LatestItem,
+    SourceLatestResult,
+    build_subscriber_index,
+    fetch_latest_results,
+    iter_latest_results,
+    source_result_to_dict,
+)
+from app.services.youtube_quota import BACKGROUND, quota_priority
+
+logger = logging.getLogger(__name__)
+
+# How often a source is re-polled; MANUAL sources are fetched when first read and on refresh_sources
+FREQUENCY_INTERVALS: dict[FetchFrequency, timedelta | None] = {
+    FetchFrequency.DAILY: timedelta(days=1),
+    FetchFrequency.EVERY_3_DAYS: timedelta(days=3),
+    FetchFrequency.WEEKLY: timedelta(days=7),
+    FetchFrequency.BIWEEKLY: timedelta(days=14),
+    FetchFrequency.MANUAL: None,
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+# published_at stored for entries without a usable date: sorts after every dated item, so an
+# undated entry is only a source's "latest" when the source has nothing dated
+UNDATED = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _parse_published(value: str | None) -> datetime:
+    """Parse an RSS (RFC 822) or ISO 8601 timestamp; UNDATED if missing or unparseable."""
+    value = (value or "").strip()
+    if value:
+        try:
+            return _as_utc(datetime.fromisoformat(value.replace("Z", "+00:00")))
+        except ValueError:
+            pass
+        try:
+            return _as_utc(parsedate_to_datetime(value))
+        except (TypeError, ValueError):
+            pass
+    return UNDATED
+
+
+def is_source_due(source: Source, now: datetime | None = None) -> bool:
+    """
+    True if the source was never fetched or its frequency interval has elapsed; a source whose
+    last fetch failed is due again after settings.ingestion_error_retry_minutes.
+    """
+    if source.last_fetched_at is None:
+        return True
+    interval = FREQUENCY_INTERVALS.get(source.frequency, timedelta(days=1))
+    if interval is None:
+        return False
+    if source.last_fetch_error:
+        interval = min(interval, timedelta(minutes=settings.ingestion_error_retry_minutes))
+    return (now or _utcnow()) - _as_utc(source.last_fetched_at) >= interval
+
+
+# Sources whose seen-ID sets are kept in memory (least recently used are dropped)
+MAX_SEEN_SOURCES = 5000
+
+# (source id, created_at) -> 8-byte digests of the external_ids already in items
+_seen: OrderedDict[tuple, set[bytes]] = OrderedDict()
+_seen_lock = threading.Lock()
+
+
+def _digest(external_id: str) -> bytes:
+    return hashlib.blake2b(external_id.encode("utf-8"), digest_size=8).digest()
+
+
+def _seen_key(source: Source) -> tuple:
+    # created_at guards against a deleted source's id being reused by a new one
+    return (source.id, source.created_at)
+
+
+def _seen_ids(db: Session, source: Source) -> set[bytes]:
+    """Digests of the source's stored external_ids (one query the first time, then in memory)."""
+    key = _seen_key(source)
+    with _seen_lock:
+        seen = _seen.get(key)
+        if seen is not None:
+            _seen.move_to_end(key)
+            return seen
+    rows = db.query(Item.external_id).filter(Item.source_id == source.id).all()
+    seen = {_digest(external_id) for (external_id,) in rows}
+    with _seen_lock:
+        seen = _seen.setdefault(key, seen)
+        _seen.move_to_end(key)
+        while len(_seen) > MAX_SEEN_SOURCES:
+            _seen.popitem(last=False)
+    return seen
+
+
+def _forget_seen(source: Source) -> None:
+    with _seen_lock:
+        _seen.pop(_seen_key(source), None)
+
+
+def _unseen_items(seen: set[bytes], recent: list[LatestItem]) -> list[LatestItem]:
+    """Items from recent (newest first) up to the first one already stored."""
+    new = []
+    batch: set[bytes] = set()
+    for latest in recent:
+        if not latest.url:
+            continue
+        digest = _digest(latest.url[:512])
+        if digest in seen:
+            break
+        if digest not in batch:
+            batch.add(digest)
+            new.append(latest)
+    return new
+
+
+def _store_result(db: Session, source: Source, result: SourceLatestResult) -> int:
+    """Store the source's unseen items and record the fetch. Returns number of new items."""
+    recent = result.recent or ([result.latest] if result.latest else [])
+    seen = _seen_ids(db, source)
+    new = _unseen_items(seen, recent)
+    # Oldest first, so among equally dated (e.g. undated) items the newest gets the highest id
+    for latest in reversed(new):
+        db.add(Item(
+            source_id=source.id,
+            external_id=latest.url[:512],
+            title=(latest.title or "")[:1024],
+            link=latest.url,
+            published_at=_parse_published(latest.published_at),
+        ))
+    source.last_fetched_at = _utcnow()
+    source.last_fetch_error = (result.error or "")[:1024] or None
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker inserted some of these first; reload the seen set next time
+        db.rollback()
+        _forget_seen(source)
+        source.last_fetched_at = _utcnow()
+        source.last_fetch_error = (result.error or "")[:1024] or None
+        db.commit()
+        return 0
+    with _seen_lock:
+        seen.update(_digest(latest.url[:512]) for latest in new)
+    return len(new)
+
+
+def ingest_sources(db: Session, sources: list[Source]) -> int:
+    """Fetch the given sources concurrently and store their items. Returns number of new items."""
+    if not sources:
+        return 0
+    # Always go upstream here (this also refreshes the latest-item cache for live readers)
+    results = fetch_latest_results(sources, use_cache=False)
+    new_items = 0
+    for source, result in zip(sources, results):
+        try:
+            new_items += _store_result(db, source, result)
+        except Exception:
+            db.rollback()
+            logger.exception("Ingestion: failed to store items for source %s", source.id)
+    return new_items
+
+
+def refresh_sources(db: Session, sources: list[Source]) -> int:
+    """Fetch sources now, whatever their frequency (MANUAL sources' only refresh path)."""
+    return ingest_sources(db, sources)
+
+
+def run_ingestion_cycle() -> int:
+    """
+    Ingest every feed that has at least one due subscriber. Each feed is fetched once
+    (see build_subscriber_index) and its items are stored for all of its subscribers.
+    Returns number of new items.
+    """
+    from app.db import SessionLocal
+
+    with SessionLocal() as db:
+        now = _utcnow()
+        # MANUAL subscribers are left out even when they follow a due feed (refresh_sources only)
+        polled = db.query(Source).filter(Source.frequency != FetchFrequency.MANUAL).all()
+        index = build_subscriber_index(polled)
+        due = [
+            s
+            for subscribers in index.values()
+            if any(is_source_due(sub, now) for sub in subscribers)
+            for s in subscribers
+        ]
+        if not due:
+            return 0
+        new_items = ingest_sources(db, due)
+        logger.info("Ingestion: fetched %s sources, %s new items", len(due), new_items)
+        return new_items
+
+
+def _latest_items_by_source(db: Session, source_ids: list[int]) -> dict[int, Item]:
+    """Most recent Item (by published_at) for each source id."""
+    if not source_ids:
+        return {}
+    newest = (
+        db.query(Item.source_id, func.max(Item.published_at).label("published_at"))
+        .filter(Item.source_id.in_(source_ids))
+        .group_by(Item.source_id)
+        .subquery()
+    )
+    rows = (
+        db.query(Item)
+        .join(
+            newest,
+            (Item.source_id == newest.c.source_id) & (Item.published_at == newest.c.published_at),
+        )
+        .order_by(Item.id.desc())
+        .all()
+    )
+    out: dict[int, Item] = {}
+    for item in rows:
+        out.setdefault(item.source_id, item)
+    return out
+
+
+def _db_result(source: Source, item: Item | None) -> dict:
+    latest = None
+    if item:
+        latest = LatestItem(
+            url=item.link,
+            title=item.title or None,
+            published_at=(
+                item.published_at.isoformat()
+                if item.published_at and _as_utc(item.published_at) != UNDATED
+                else None
+            ),
+        )
+    return source_result_to_dict(SourceLatestResult(
+        source_id=source.id,
+        source_type=source.type.value,
+        source_url=(source.url or "").strip(),
+        source_name=source.name,
+        latest=latest,
+        error=None if latest else (source.last_fetch_error or "No items fetched yet"),
+    ))
+
+
+def latest_for_sources_from_db(db: Session, sources: list[Source]) -> list[dict]:
+    """
+    Same shape and order as fetch_latest_for_sources, read from the items table.
+    Sources that were never ingested (e.g. just added) are fetched once now and stored.
+    """
+    never_fetched = [s for s in sources if s.last_fetched_at is None]
+    if never_fetched:
+        ingest_sources(db, never_fetched)
+    items = _latest_items_by_source(db, [s.id for s in sources])
+    return [_db_result(s, items.get(s.id)) for s in sources]
+
+
+def iter_latest_for_sources_from_db(db: Session, sources: list[Source]) -> Iterator[dict]:
+    """
+    Streaming variant of latest_for_sources_from_db: yields one result dict per source as soon
+    as it is available. Ingested sources come first, straight from the items table; never-ingested
+    sources are then fetched concurrently and each is stored and yielded as its feed completes.
+    """
+    fetched = [s for s in sources if s.last_fetched_at is not None]
+    never_fetched = [s for s in sources if s.last_fetched_at is None]
+    items = _latest_items_by_source(db, [s.id for s in fetched])
+    for s in fetched:
+        yield _db_result(s, items.get(s.id))
+    if not never_fetched:
+        return
+    for source, result in iter_latest_results(never_fetched, use_cache=False):
+        try:
+            _store_result(db, source, result)
+        except Exception:
+            db.rollback()
+            logger.exception("Ingestion: failed to store items for source %s", source.id)
+            yield source_result_to_dict(result)
+            continue
+        yield _db_result(source, _latest_items_by_source(db, [source.id]).get(source.id))
+
+
+_stop_event = threading.Event()
+_thread: threading.Thread | None = None
+
+
+def _scheduler_loop() -> None:
+    while not _stop_event.is_set():
+        try:
+            # Background work: YouTube calls must leave the interactive quota reserve alone
+            with quota_priority(BACKGROUND):
+                run_ingestion_cycle()
+        except Exception:
+            logger.exception("Ingestion cycle failed")
+        _stop_event.wait(max(10, settings.ingestion_interval_seconds))
+
+
+def start_ingestion_scheduler() -> None:
+    """Start the background ingestion thread (no-op if disabled or already running)."""
+    global _thread
+    if not settings.ingestion_enabled or (_thread is not None and _thread.is_alive()):
+        return
+    _stop_event.clear()
+    _thread = threading.Thread(target=_scheduler_loop, name="ingestion", daemon=True)
+    _thread.start()
+
+
+def stop_ingestion_scheduler() -> None:
+    """Signal the ingestion thread to stop after its current cycle."""
+    _stop_event.set()
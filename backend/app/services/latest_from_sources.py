@@ -5,12 +5,23 @@ X via Nitter RSS, LinkedIn via Apify (harvestapi/linkedin-profile-posts) or fall
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
-from urllib.parse import urljoin, urlparse
+import re
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterator
+from urllib.parse import unquote, urljoin, urlparse
 
 import httpx
 
+from app.config import settings
+from app.fetch_pool import SingleFlight, host_of_url, iter_concurrent, map_concurrent
+from app.http_client import get_client, request_timeout
 from app.models.database.source import Source, SourceType
+from app.services.apify_client import BatchCollector, run_actor
+from app.services.feed_reader import fetch_feed
+from app.services.nitter_pool import POOL_HOST as NITTER_POOL_HOST, fetch_nitter_feed, to_x_url
+from app.ttl_cache import TTLCache
 
 # Browser-like User-Agent for scraping (LinkedIn, Nitter)
 USER_AGENT = (
@@ -18,7 +29,7 @@ USER_AGENT = (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class LatestItem:
     url: str
     title: str | None
@@ -33,6 +44,8 @@ class SourceLatestResult:
     source_name: str | None
     latest: LatestItem | None
     error: str | None
+    # Most recent items, newest first (latest is recent[0]); ingestion stores the unseen ones
+    recent: list[LatestItem] = field(default_factory=list)
 
 
 def _is_rss_url(url: str) -> bool:
@@ -45,11 +58,68 @@ def _is_rss_url(url: str) -> bool:
     )
 
 
+# Stop reading a homepage once </head> is seen, or after this many bytes
+_HEAD_READ_LIMIT = 256 * 1024
+
+# Common RSS paths (RTE, BBC, NYT, most news orgs use these), in order of preference
+_COMMON_FEED_PATHS = ["/feed", "/rss", "/feeds", "/feed/", "/rss.xml", "/feed/rss", "/news/feed", "/atom.xml"]
+
+
+def _fetch_html_head(url: str) -> str:
+    """Stream a page and return its markup up to </head> (feed <link> tags live there)."""
+    buf = bytearray()
+    with get_client(url).stream(
+        "GET",
+        url,
+        headers={"User-Agent": USER_AGENT},
+        follow_redirects=True,
+        timeout=request_timeout(10.0),
+    ) as r:
+        r.raise_for_status()
+        encoding = r.encoding or "utf-8"
+        for chunk in r.iter_bytes():
+            buf.extend(chunk)
+            end = buf.lower().find(b"</head>")
+            if end != -1:
+                del buf[end + len(b"</head>"):]
+                break
+            if len(buf) >= _HEAD_READ_LIMIT:
+                break
+    return bytes(buf).decode(encoding, errors="replace")
+
+
+def _probe_feed_candidate(candidate: str) -> bool:
+    """True if candidate URL answers 200 with something that looks like a feed."""
+    try:
+        with get_client(candidate).stream(
+            "GET",
+            candidate,
+            headers={"User-Agent": USER_AGENT},
+            follow_redirects=True,
+            timeout=request_timeout(8.0),
+        ) as r:
+            if r.status_code != 200:
+                return False
+            ct = (r.headers.get("content-type") or "").lower()
+            if "xml" in ct or "rss" in ct or "atom" in ct:
+                return True
+            # Some servers don't set content-type correctly; quick sniff of the first bytes
+            head = b""
+            for chunk in r.iter_bytes():
+                head += chunk
+                if len(head) >= 500:
+                    break
+            text = head[:500].decode("utf-8", errors="replace")
+            return "<rss" in text.lower() or "<feed" in text.lower() or "<?xml" in text
+    except Exception:
+        return False
+
+
 def _discover_rss_feed(site_url: str) -> str | None:
     """
     Discover RSS/Atom feed from a news site homepage URL.
-    Tries: 1) parse page for <link rel="alternate" type="application/rss+xml">,
-    2) common paths like /feed, /rss.
+    Tries: 1) parse the page <head> for <link rel="alternate" type="application/rss+xml">,
+    2) common paths like /feed, /rss (probed in parallel; first match in preference order wins).
     """
     site_url = (site_url or "").strip()
     if not site_url:
@@ -59,12 +129,9 @@ def _discover_rss_feed(site_url: str) -> str | None:
     parsed = urlparse(site_url)
     base = f"{parsed.scheme or 'https'}://{parsed.netloc}"
 
-    # 1) Fetch page and look for RSS link in <head>
+    # 1) Fetch page head and look for RSS link
     try:
-        with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-            r = client.get(site_url, headers={"User-Agent": USER_AGENT})
-            r.raise_for_status()
-            html = r.text
+        html = _fetch_html_head(site_url)
     except Exception:
         html = ""
 
@@ -88,53 +155,92 @@ def _discover_rss_feed(site_url: str) -> str | None:
         except Exception:
             pass
 
-    # 2) Try common RSS paths (RTE, BBC, NYT, most news orgs use these)
-    common_paths = ["/feed", "/rss", "/feeds", "/feed/", "/rss.xml", "/feed/rss", "/news/feed", "/atom.xml"]
-    for path in common_paths:
-        candidate = (base.rstrip("/") + path) if path.startswith("/") else f"{base}/{path}"
-        try:
-            with httpx.Client(timeout=8.0, follow_redirects=True) as client:
-                r = client.get(candidate, headers={"User-Agent": USER_AGENT})
-                if r.status_code == 200:
-                    ct = (r.headers.get("content-type") or "").lower()
-                    if "xml" in ct or "rss" in ct or "atom" in ct:
-                        return candidate
-                    # Some servers don't set content-type correctly; quick sniff
-                    text = (r.text or "")[:500]
-                    if "<rss" in text.lower() or "<feed" in text.lower() or '<?xml' in text:
-                        return candidate
-        except Exception:
-            pass
+    # 2) Probe common RSS paths concurrently
+    candidates = [base.rstrip("/") + path for path in _COMMON_FEED_PATHS]
+    for candidate, ok in zip(candidates, map_concurrent(_probe_feed_candidate, candidates)):
+        if ok:
+            return candidate
     return None
 
 
-def _fetch_latest_from_rss(feed_url: str) -> tuple[LatestItem | None, str | None]:
-    """Parse RSS/Atom feed and return latest entry link and title."""
+def _site_key(site_url: str) -> str:
+    """Normalize a site URL for the discovery cache (no scheme/www, lowercased host, no trailing slash)."""
+    url = (site_url or "").strip()
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlparse(url)
+    path = (parsed.path or "").rstrip("/")
+    key = host_of_url(url) + path
+    if parsed.query:
+        key += "?" + parsed.query
+    return key
+
+
+def _discovery_is_fresh(feed_url: str | None, checked_at: datetime | None) -> bool:
+    if checked_at is None:
+        return False
+    from app.config import settings
+
+    hours = settings.feed_discovery_ttl_hours if feed_url else settings.feed_discovery_negative_ttl_hours
+    if checked_at.tzinfo is None:
+        checked_at = checked_at.replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - checked_at < timedelta(hours=hours)
+
+
+def _get_site_feed_url(site_url: str) -> str | None:
+    """
+    Feed URL for a news/podcast site, using the shared discovered_feeds table.
+    Runs discovery only when there is no row or the row is due for revalidation;
+    a "no feed found" result is cached too (for a shorter time).
+    """
+    from app.db import SessionLocal
+    from app.models.database import DiscoveredFeed
+
+    key = _site_key(site_url)
     try:
-        import feedparser
-    except ImportError:
-        return (None, "feedparser not installed")
+        with SessionLocal() as db:
+            row = db.query(DiscoveredFeed).filter(DiscoveredFeed.site_key == key).first()
+            if row and _discovery_is_fresh(row.feed_url, row.checked_at):
+                return row.feed_url
+    except Exception:
+        # Cache unavailable (e.g. DB not ready); discover without it
+        return _discover_rss_feed(site_url)
+
+    feed_url = _discover_rss_feed(site_url)
+    try:
+        with SessionLocal() as db:
+            row = db.query(DiscoveredFeed).filter(DiscoveredFeed.site_key == key).first()
+            if row:
+                row.feed_url = feed_url
+                row.checked_at = datetime.now(timezone.utc)
+            else:
+                db.add(DiscoveredFeed(site_key=key, feed_url=feed_url, checked_at=datetime.now(timezone.utc)))
+            db.commit()
+    except Exception:
+        pass
+    return feed_url
 
-    feed_url = (feed_url or "").strip()
-    if not feed_url:
-        return (None, "Feed URL is required")
+
+def _forget_site_feed_url(site_url: str) -> None:
+    """Drop a cached discovery result (e.g. the cached feed stopped working) so it is re-run next time."""
+    from app.db import SessionLocal
+    from app.models.database import DiscoveredFeed
 
     try:
-        parsed = feedparser.parse(
-            feed_url,
-            request_headers={"User-Agent": "AuraBriefing/1.0"},
-        )
-    except Exception as e:
-        return (None, f"Failed to fetch feed: {e}")
+        with SessionLocal() as db:
+            db.query(DiscoveredFeed).filter(DiscoveredFeed.site_key == _site_key(site_url)).delete()
+            db.commit()
+    except Exception:
+        pass
 
-    entries = getattr(parsed, "entries", [])
-    if not entries:
-        return (None, "Feed has no entries")
 
-    entry = entries[0]
+def _entry_to_item(entry, link_fn=None) -> LatestItem | None:
+    """LatestItem for a feedparser entry (None if it has no link)."""
     link = entry.get("link") or entry.get("href")
     if not link:
-        return (None, "Latest entry has no link")
+        return None
+    if link_fn:
+        link = link_fn(link)
     title = entry.get("title") or None
     published = None
     for key in ("published", "updated", "created"):
@@ -143,8 +249,46 @@ def _fetch_latest_from_rss(feed_url: str) -> tuple[LatestItem | None, str | None
             break
     if hasattr(published, "isoformat"):
         published = published.isoformat()
+    return LatestItem(url=link, title=title, published_at=published)
 
-    return (LatestItem(url=link, title=title, published_at=published), None)
+
+def _entries_to_items(entries, link_fn=None) -> list[LatestItem]:
+    """Up to settings.ingestion_max_items_per_fetch items from feed entries, newest first."""
+    items = []
+    for entry in entries[: settings.ingestion_max_items_per_fetch]:
+        item = _entry_to_item(entry, link_fn)
+        if item:
+            items.append(item)
+    return items
+
+
+def _fetch_recent_from_rss(feed_url: str) -> tuple[list[LatestItem], str | None]:
+    """Parse RSS/Atom feed and return its most recent entries (newest first)."""
+    try:
+        import feedparser  # noqa: F401 - parsed by fetch_feed
+    except ImportError:
+        return ([], "feedparser not installed")
+
+    feed_url = (feed_url or "").strip()
+    if not feed_url:
+        return ([], "Feed URL is required")
+
+    try:
+        parsed = fetch_feed(
+            feed_url,
+            headers={"User-Agent": "AuraBriefing/1.0"},
+            max_entries=settings.ingestion_max_items_per_fetch,
+        )
+    except Exception as e:
+        return ([], f"Failed to fetch feed: {e}")
+
+    entries = getattr(parsed, "entries", [])
+    if not entries:
+        return ([], "Feed has no entries")
+    items = _entries_to_items(entries)
+    if not items:
+        return ([], "Latest entry has no link")
+    return (items, None)
 
 
 def _extract_twitter_username(profile_url: str) -> str | None:
@@ -168,88 +312,68 @@ def _extract_twitter_username(profile_url: str) -> str | None:
     return None
 
 
-def _fetch_latest_from_x(profile_url: str) -> tuple[LatestItem | None, str | None]:
-    """Fetch latest X/Twitter post via Nitter RSS (no API key)."""
+def _fetch_recent_from_x(profile_url: str) -> tuple[list[LatestItem], str | None]:
+    """Fetch recent X/Twitter posts via Nitter RSS (no API key), newest first."""
     username = _extract_twitter_username(profile_url)
     if not username:
-        return (None, "Invalid X/Twitter profile URL (use https://twitter.com/username or https://x.com/username)")
-
-    try:
-        from app.config import settings
-        base = (getattr(settings, "nitter_base_url", None) or "").strip().rstrip("/") or "https://nitter.net"
-    except Exception:
-        base = "https://nitter.net"
-    feed_url = f"{base}/{username}/rss"
+        return ([], "Invalid X/Twitter profile URL (use https://twitter.com/username or https://x.com/username)")
 
     try:
-        import feedparser
+        import feedparser  # noqa: F401 - parsed by fetch_feed
     except ImportError:
-        return (None, "feedparser not installed")
+        return ([], "feedparser not installed")
 
     try:
-        parsed = feedparser.parse(
-            feed_url,
-            request_headers={"User-Agent": USER_AGENT},
+        parsed = fetch_nitter_feed(
+            f"/{username}/rss",
+            headers={"User-Agent": USER_AGENT},
+            max_entries=settings.ingestion_max_items_per_fetch,
         )
     except Exception as e:
-        return (None, f"Nitter feed failed: {e}")
+        return ([], f"Nitter feed failed: {e}")
 
     entries = getattr(parsed, "entries", [])
     if not entries:
-        return (None, "No posts in feed or Nitter instance unavailable (try another NITTER_BASE_URL)")
-
-    entry = entries[0]
-    link = entry.get("link") or entry.get("href")
-    if not link:
-        return (None, "Latest entry has no link")
-    # Nitter RSS often has nitter links; convert to real twitter/x URL if desired (optional)
-    title = entry.get("title") or None
-    published = None
-    for key in ("published", "updated", "created"):
-        if key in entry and entry[key]:
-            published = entry[key]
-            break
-    if hasattr(published, "isoformat"):
-        published = published.isoformat()
-
-    return (LatestItem(url=link, title=title, published_at=published), None)
+        return ([], "No posts in feed or Nitter instances unavailable (try other NITTER_BASE_URLS)")
+    # Nitter links point at whichever instance answered; store the canonical x.com URL
+    items = _entries_to_items(entries, to_x_url)
+    if not items:
+        return ([], "Latest entry has no link")
+    return (items, None)
 
 
 # Apify actor for LinkedIn profile posts (HarvestAPI - no cookies, pay per result)
 APIFY_LINKEDIN_ACTOR_ID = "harvestapi~linkedin-profile-posts"
 
 
-def _fetch_latest_from_linkedin_apify(profile_url: str, api_token: str) -> tuple[LatestItem | None, str | None]:
-    """Fetch latest LinkedIn post via Apify (harvestapi/linkedin-profile-posts). No cookies needed."""
-    url = (profile_url or "").strip()
-    if not url or "linkedin.com" not in url.lower():
-        return (None, "Invalid LinkedIn profile URL")
-    if _is_rss_url(url):
-        return (None, "Use RSS fetcher for feed URLs")
+_LINKEDIN_PROFILE_RE = re.compile(r"linkedin\.com/(in|company|school)/([^/?#]+)", re.IGNORECASE)
 
-    api_url = (
-        f"https://api.apify.com/v2/acts/{APIFY_LINKEDIN_ACTOR_ID}/run-sync-get-dataset-items"
-        f"?token={api_token}&timeout=120&limit=1"
-    )
-    payload = {"targetUrls": [url], "maxPosts": 1}
-    try:
-        with httpx.Client(timeout=130.0) as client:
-            r = client.post(api_url, json=payload)
-            r.raise_for_status()
-            data = r.json()
-    except httpx.HTTPStatusError as e:
-        body = e.response.text
-        if e.response.status_code == 401:
-            return (None, "Apify API token invalid or missing (set APIFY_API_TOKEN)")
-        if e.response.status_code in (400, 402, 408):
-            return (None, f"Apify: {body[:200]}" if body else str(e))
-        return (None, f"Apify returned {e.response.status_code}: {body[:200]}")
-    except Exception as e:
-        return (None, f"Apify request failed: {e}")
 
-    if not isinstance(data, list) or len(data) == 0:
-        return (None, "No posts returned for this profile")
-    item = data[0]
+def _linkedin_profile_slug(url: str) -> str | None:
+    """"in/<id>" (or company/, school/) for a LinkedIn profile or post-author URL."""
+    m = _LINKEDIN_PROFILE_RE.search(url or "")
+    return f"{m.group(1).lower()}/{unquote(m.group(2)).lower()}" if m else None
+
+
+def _linkedin_item_slugs(item: dict) -> set[str]:
+    """Profile slugs a post item may belong to (its author, or the input URL it was scraped for)."""
+    author = item.get("author") if isinstance(item.get("author"), dict) else {}
+    slugs = set()
+    for value in (
+        author.get("linkedinUrl"), author.get("url"), item.get("authorUrl"),
+        item.get("profileUrl"), item.get("inputUrl"), item.get("query"),
+    ):
+        if isinstance(value, str):
+            slug = _linkedin_profile_slug(value)
+            if slug:
+                slugs.add(slug)
+    public_id = author.get("publicIdentifier")
+    if isinstance(public_id, str) and public_id:
+        slugs.update(f"{kind}/{public_id.lower()}" for kind in ("in", "company", "school"))
+    return slugs
+
+
+def _linkedin_item_to_latest(item: dict) -> tuple[LatestItem | None, str | None]:
     post_url = item.get("linkedinUrl") or item.get("url")
     if not post_url:
         return (None, "Apify result had no post URL")
@@ -263,47 +387,120 @@ def _fetch_latest_from_linkedin_apify(profile_url: str, api_token: str) -> tuple
     return (LatestItem(url=post_url, title=title or None, published_at=published), None)
 
 
-def _fetch_latest_from_linkedin(profile_url: str) -> tuple[LatestItem | None, str | None]:
-    """Fetch latest LinkedIn post: try Apify first if APIFY_API_TOKEN set, else RSS (if feed URL), else scrape."""
+def _run_linkedin_batch(profile_urls: list[str]) -> dict[str, tuple[list[LatestItem], str | None]]:
+    """One Apify run for many LinkedIn profiles; posts are matched back to profiles by slug."""
+    token = (settings.apify_api_token or "").strip()
+    items, err = run_actor(
+        APIFY_LINKEDIN_ACTOR_ID,
+        {"targetUrls": profile_urls, "maxPosts": settings.apify_linkedin_max_posts},
+        token,
+    )
+    if err is not None:
+        return {url: ([], err) for url in profile_urls}
+    by_slug: dict[str, list[dict]] = {}
+    for item in items:
+        if isinstance(item, dict):
+            for slug in _linkedin_item_slugs(item):
+                by_slug.setdefault(slug, []).append(item)
+    out = {}
+    for url in profile_urls:
+        posts = by_slug.get(_linkedin_profile_slug(url) or "")
+        if posts is None and len(profile_urls) == 1:
+            posts = [i for i in items if isinstance(i, dict)]
+        recent = [latest for latest, _ in map(_linkedin_item_to_latest, posts or []) if latest]
+        out[url] = (recent, None) if recent else ([], "No posts returned for this profile")
+    return out
+
+
+# LinkedIn profiles from every concurrent fetch share one Apify run (targetUrls)
+_linkedin_batcher = BatchCollector(
+    _run_linkedin_batch,
+    window=settings.apify_batch_window_seconds,
+    max_batch=settings.apify_batch_max_profiles,
+    missing_result=([], "No posts returned for this profile"),
+    name="apify-linkedin",
+)
+
+
+def _linkedin_target_url(url: str) -> str:
+    """
+    Canonical profile URL used as the Apify target and batch key, so spellings of one profile
+    (case, trailing slash, query, www) share a single target.
+    """
+    slug = _linkedin_profile_slug(url)
+    return f"https://www.linkedin.com/{slug}" if slug else url.strip()
+
+
+def _linkedin_batch_url(source: Source) -> str | None:
+    """Canonical profile URL if this source is fetched through the batched Apify run, else None."""
+    url = (source.url or "").strip()
+    if source.type != SourceType.LINKEDIN or not (settings.apify_api_token or "").strip():
+        return None
+    if "linkedin.com" not in url.lower() or _is_rss_url(url):
+        return None
+    return _linkedin_target_url(url)
+
+
+def _fetch_recent_from_linkedin_apify(profile_url: str, api_token: str) -> tuple[list[LatestItem], str | None]:
+    """Fetch recent LinkedIn posts via Apify (harvestapi/linkedin-profile-posts). No cookies needed."""
+    url = (profile_url or "").strip()
+    if not url or "linkedin.com" not in url.lower():
+        return ([], "Invalid LinkedIn profile URL")
+    if _is_rss_url(url):
+        return ([], "Use RSS fetcher for feed URLs")
+    try:
+        return _linkedin_batcher.submit(_linkedin_target_url(url)).result(
+            timeout=settings.apify_run_max_wait_seconds + 30
+        )
+    except Exception as e:
+        return ([], f"Apify request failed: {e}")
+
+
+def _fetch_recent_from_linkedin(profile_url: str) -> tuple[list[LatestItem], str | None]:
+    """Fetch recent LinkedIn posts: try Apify first if APIFY_API_TOKEN set, else RSS (if feed URL), else scrape."""
     url = (profile_url or "").strip()
     if not url:
-        return (None, "LinkedIn URL is required")
+        return ([], "LinkedIn URL is required")
     # 1) Apify (no cookies, works for any profile)
     try:
         from app.config import settings
         token = (getattr(settings, "apify_api_token", None) or "").strip()
         if token:
-            latest, err = _fetch_latest_from_linkedin_apify(url, token)
+            recent, err = _fetch_recent_from_linkedin_apify(url, token)
             if err is None:
-                return (latest, None)
+                return (recent, None)
             # Apify failed; fall through to RSS/scrape
     except Exception:
         pass
+    return _fetch_recent_from_linkedin_fallback(url)
+
+
+def _fetch_recent_from_linkedin_fallback(url: str) -> tuple[list[LatestItem], str | None]:
+    """LinkedIn without Apify: RSS if the URL is a feed, else scrape the public page."""
     # 2) If URL is an RSS feed, use it
     if _is_rss_url(url):
-        return _fetch_latest_from_rss(url)
+        return _fetch_recent_from_rss(url)
     if "linkedin.com" not in url.lower():
-        return (None, "Invalid LinkedIn URL")
+        return ([], "Invalid LinkedIn URL")
     # 3) Fallback: scrape with optional cookies (if you added cookie storage later)
     try:
         from bs4 import BeautifulSoup
     except ImportError:
-        return (None, "beautifulsoup4 not installed. Set APIFY_API_TOKEN for LinkedIn (recommended).")
+        return ([], "beautifulsoup4 not installed. Set APIFY_API_TOKEN for LinkedIn (recommended).")
 
     headers = {"User-Agent": USER_AGENT, "Accept-Language": "en-US,en;q=0.9"}
     try:
-        with httpx.Client(timeout=15.0, follow_redirects=True) as client:
-            r = client.get(url, headers=headers)
-            r.raise_for_status()
-            html = r.text
+        r = get_client(url).get(url, headers=headers, follow_redirects=True)
+        r.raise_for_status()
+        html = r.text
     except httpx.HTTPStatusError as e:
-        return (None, f"LinkedIn returned {e.response.status_code}. Set APIFY_API_TOKEN to use Apify instead.")
+        return ([], f"LinkedIn returned {e.response.status_code}. Set APIFY_API_TOKEN to use Apify instead.")
     except Exception as e:
-        return (None, f"Failed to fetch LinkedIn: {e}")
+        return ([], f"Failed to fetch LinkedIn: {e}")
 
     lower = html.lower()
     if "authwall" in lower or ("sign in" in lower and "feed/update" not in lower and "activity:" not in lower):
-        return (None, "LinkedIn requires login. Set APIFY_API_TOKEN (Apify) to fetch without cookies.")
+        return ([], "LinkedIn requires login. Set APIFY_API_TOKEN (Apify) to fetch without cookies.")
     soup = BeautifulSoup(html, "html.parser")
     post_links: list[tuple[str, str | None]] = []
     for a in soup.find_all("a", href=True):
@@ -316,129 +513,316 @@ def _fetch_latest_from_linkedin(profile_url: str) -> tuple[LatestItem | None, st
             title = a.get_text().strip()[:200] if a.get_text() else None
             post_links.append((href, title))
     seen: set[str] = set()
+    recent = []
     for h, t in post_links:
         if h not in seen:
             seen.add(h)
-            return (LatestItem(url=h, title=t, published_at=None), None)
-    return (None, "No post links found. Set APIFY_API_TOKEN to use Apify for LinkedIn.")
-
-
-def _fetch_latest_youtube(channel_url: str) -> tuple[LatestItem | None, str | None]:
-    from app.models.scrapper.youtube_audio_extractor import get_latest_video_from_channel
-
-    result, err = get_latest_video_from_channel(channel_url)
+            recent.append(LatestItem(url=h, title=t, published_at=None))
+    if recent:
+        return (recent[: settings.ingestion_max_items_per_fetch], None)
+    return ([], "No post links found. Set APIFY_API_TOKEN to use Apify for LinkedIn.")
+
+
+def _fetch_recent_youtube(
+    channel_url: str,
+    uploads: tuple[str | None, str | None] | None = None,
+) -> tuple[list[LatestItem], str | None]:
+    """uploads: (uploads_playlist_id, error) already resolved by resolve_uploads_playlists, if any."""
+    from app.models.scrapper.youtube_audio_extractor import get_recent_videos_from_channel
+
+    if uploads is not None and not uploads[0]:
+        return ([], uploads[1] or "Channel has no uploads playlist")
+    videos, err = get_recent_videos_from_channel(
+        channel_url,
+        uploads_playlist_id=uploads[0] if uploads else None,
+        max_results=settings.ingestion_max_items_per_fetch,
+    )
     if err:
-        return (None, err)
-    if not result:
-        return (None, "No latest video")
+        return ([], err)
+    if not videos:
+        return ([], "No latest video")
     return (
-        LatestItem(
-            url=result["url"],
-            title=result.get("title"),
-            published_at=result.get("published_at"),
-        ),
+        [LatestItem(url=v["url"], title=v.get("title"), published_at=v.get("published_at")) for v in videos],
         None,
     )
 
 
-def fetch_latest_for_source(source: Source) -> SourceLatestResult:
-    """
-    For a single Source, fetch the latest item URL (and optional title/published).
-    Returns a SourceLatestResult with either latest or error set.
-    """
-    st = source.type
-    url = (source.url or "").strip()
-
+def _fetch_recent_items(
+    st: SourceType,
+    url: str,
+    youtube_uploads: dict[str, tuple[str | None, str | None]] | None = None,
+) -> tuple[list[LatestItem], str | None]:
+    """Dispatch by source type and fetch the most recent items (newest first) for one source URL."""
     if st == SourceType.YOUTUBE:
-        # Channel URL → latest video
-        latest, err = _fetch_latest_youtube(url)
-        return SourceLatestResult(
-            source_id=source.id,
-            source_type=st.value,
-            source_url=url,
-            source_name=source.name,
-            latest=latest,
-            error=err,
-        )
+        # Channel URL → recent uploads
+        return _fetch_recent_youtube(url, (youtube_uploads or {}).get(url))
 
     if st == SourceType.NEWS or st == SourceType.PODCAST:
         # Use RSS: direct feed URL, or auto-discover from news site homepage
         feed_url = url
-        if not _is_rss_url(url):
-            feed_url = _discover_rss_feed(url)
+        discovered = not _is_rss_url(url)
+        if discovered:
+            feed_url = _get_site_feed_url(url)
             if not feed_url:
-                return SourceLatestResult(
-                    source_id=source.id,
-                    source_type=st.value,
-                    source_url=url,
-                    source_name=source.name,
-                    latest=None,
-                    error="Could not find RSS feed for this URL. Try adding the site's feed URL directly (e.g. site.com/feed or /rss).",
+                return (
+                    [],
+                    "Could not find RSS feed for this URL. Try adding the site's feed URL directly (e.g. site.com/feed or /rss).",
                 )
-        latest, err = _fetch_latest_from_rss(feed_url)
-        return SourceLatestResult(
-            source_id=source.id,
-            source_type=st.value,
-            source_url=url,
-            source_name=source.name,
-            latest=latest,
-            error=err,
-        )
+        recent, err = _fetch_recent_from_rss(feed_url)
+        if discovered and err and err.startswith("Failed to fetch feed"):
+            _forget_site_feed_url(url)
+        return (recent, err)
 
     if st == SourceType.X:
-        latest, err = _fetch_latest_from_x(url)
-        return SourceLatestResult(
-            source_id=source.id,
-            source_type=st.value,
-            source_url=url,
-            source_name=source.name,
-            latest=latest,
-            error=err,
-        )
+        return _fetch_recent_from_x(url)
+
+    if st == SourceType.LINKEDIN:
+        return _fetch_recent_from_linkedin(url)
+
+    return ([], f"Unsupported source type: {st.value}")
+
+
+def source_feed_key(source_type: SourceType, url: str) -> str:
+    """
+    Canonical key for what a source fetches, shared by every user who follows it
+    (e.g. youtube.com/@Foo and https://www.youtube.com/@foo/ are the same feed).
+    """
+    url = (url or "").strip()
+    if source_type == SourceType.YOUTUBE:
+        from app.models.scrapper.youtube_audio_extractor import _channel_key
+
+        return f"{source_type.value}:{_channel_key(url)}"
+    if source_type == SourceType.X:
+        username = _extract_twitter_username(url)
+        if username:
+            return f"{source_type.value}:{username.lower()}"
+    if source_type == SourceType.LINKEDIN:
+        slug = _linkedin_profile_slug(url)
+        return f"{source_type.value}:{slug or _site_key(url).lower()}"
+    return f"{source_type.value}:{_site_key(url)}"
+
+
+def build_subscriber_index(sources: list[Source]) -> dict[str, list[Source]]:
+    """Map each canonical feed key to the Source rows (subscribers) that follow it, in input order."""
+    index: dict[str, list[Source]] = {}
+    for s in sources:
+        index.setdefault(source_feed_key(s.type, s.url), []).append(s)
+    return index
+
+
+class _CachedLatest:
+    """Latest-item cache record (recent items or error for one feed key)."""
+
+    __slots__ = ("recent", "error")
+
+    def __init__(self, recent: list[LatestItem], error: str | None) -> None:
+        self.recent = recent
+        self.error = error
+
+
+# Concurrent fetches of the same feed (from any user / request) share one upstream call
+_inflight = SingleFlight()
+
+# Live lookups keyed by feed key; stale entries are served while a background refresh runs
+_latest_cache: TTLCache[_CachedLatest] = TTLCache(
+    ttl=settings.latest_cache_ttl_seconds,
+    stale_ttl=settings.latest_cache_stale_seconds,
+    max_entries=settings.latest_cache_max_entries,
+)
+
+
+def fetch_latest_for_source(
+    source: Source,
+    *,
+    youtube_uploads: dict[str, tuple[str | None, str | None]] | None = None,
+    use_cache: bool = True,
+) -> SourceLatestResult:
+    """
+    For a single Source, fetch the latest item URL (and optional title/published).
+    youtube_uploads: channel URL -> (uploads_playlist_id, error) from resolve_uploads_playlists,
+    so a batch of YouTube sources is resolved once up front.
+    use_cache: serve from the latest-item cache (stale-while-revalidate); False always fetches
+    upstream (and refreshes the cache), e.g. for ingestion.
+    Returns a SourceLatestResult with either latest (and recent) or error set.
+    """
+    st = source.type
+    url = (source.url or "").strip()
+    key = source_feed_key(st, url)
+
+    def load() -> _CachedLatest:
+        recent, err = _inflight.do(key, lambda: _fetch_recent_items(st, url, youtube_uploads))
+        return _CachedLatest(recent, err)
 
+    if use_cache:
+        cached = _latest_cache.get_or_load(key, load)
+    else:
+        cached = load()
+        _latest_cache.set(key, cached)
+    return _result_for(source, cached.recent, cached.error)
+
+
+def _upstream_host(source: Source) -> str:
+    """Host that a fetch for this source actually hits (used for per-host concurrency caps)."""
+    st = source.type
+    if st == SourceType.YOUTUBE:
+        return "googleapis.com"
+    if st == SourceType.X:
+        return NITTER_POOL_HOST
     if st == SourceType.LINKEDIN:
-        latest, err = _fetch_latest_from_linkedin(url)
+        try:
+            from app.config import settings
+            if (settings.apify_api_token or "").strip():
+                return "api.apify.com"
+        except Exception:
+            pass
+    return host_of_url(source.url)
+
+
+def _fetch_latest_safe(
+    source: Source,
+    youtube_uploads: dict[str, tuple[str | None, str | None]] | None = None,
+    use_cache: bool = True,
+) -> SourceLatestResult:
+    """fetch_latest_for_source, but an unexpected exception becomes that source's error."""
+    try:
+        return fetch_latest_for_source(source, youtube_uploads=youtube_uploads, use_cache=use_cache)
+    except Exception as e:
         return SourceLatestResult(
             source_id=source.id,
-            source_type=st.value,
-            source_url=url,
+            source_type=source.type.value,
+            source_url=(source.url or "").strip(),
             source_name=source.name,
-            latest=latest,
-            error=err,
+            latest=None,
+            error=f"Fetch failed: {e}",
         )
 
+
+def _resolve_youtube_uploads(sources: list[Source]) -> dict[str, tuple[str | None, str | None]]:
+    """Resolve uploads playlists for all YouTube sources at once (cached; batched channels.list)."""
+    channel_urls = [(s.url or "").strip() for s in sources if s.type == SourceType.YOUTUBE]
+    if not channel_urls:
+        return {}
+    from app.models.scrapper.youtube_audio_extractor import resolve_uploads_playlists
+
+    try:
+        return resolve_uploads_playlists(channel_urls)
+    except Exception:
+        return {}
+
+
+def source_result_to_dict(r: SourceLatestResult) -> dict:
+    """Shape a SourceLatestResult for a JSON response."""
+    latest_dict = None
+    if r.latest:
+        latest_dict = {
+            "url": r.latest.url,
+            "title": r.latest.title,
+            "published_at": r.latest.published_at,
+        }
+    return {
+        "source_id": r.source_id,
+        "source_type": r.source_type,
+        "source_url": r.source_url,
+        "source_name": r.source_name,
+        "latest": latest_dict,
+        "error": r.error,
+    }
+
+
+def _result_for(source: Source, recent: list[LatestItem], err: str | None) -> SourceLatestResult:
     return SourceLatestResult(
         source_id=source.id,
-        source_type=st.value,
-        source_url=url,
+        source_type=source.type.value,
+        source_url=(source.url or "").strip(),
         source_name=source.name,
-        latest=None,
-        error=f"Unsupported source type: {st.value}",
+        latest=recent[0] if recent else None,
+        error=err,
+        recent=recent,
     )
 
 
+def _start_linkedin_batch(unique: list[Source], use_cache: bool) -> dict[int, Future]:
+    """
+    Submit every Apify LinkedIn source (not already cached) to the batch collector up front, so
+    they share one actor run and no fetch worker blocks on it. Returns {index in unique: future}.
+    """
+    batched = {}
+    for i, s in enumerate(unique):
+        url = _linkedin_batch_url(s)
+        if not url:
+            continue
+        if use_cache and _latest_cache.peek(source_feed_key(s.type, s.url)) is not None:
+            continue
+        batched[i] = _linkedin_batcher.submit(url)
+    return batched
+
+
+def _linkedin_batch_result(source: Source, future: Future) -> SourceLatestResult:
+    """Result of a batched LinkedIn fetch (falls back to RSS / scraping if Apify failed)."""
+    url = (source.url or "").strip()
+    try:
+        recent, err = future.result(timeout=settings.apify_run_max_wait_seconds + 30)
+    except Exception as e:
+        recent, err = [], f"Apify request failed: {e}"
+    if err is not None:
+        recent, err = _fetch_recent_from_linkedin_fallback(url)
+    _latest_cache.set(source_feed_key(source.type, url), _CachedLatest(recent, err))
+    return _result_for(source, recent, err)
+
+
+def _iter_unique_results(unique: list[Source], use_cache: bool) -> Iterator[tuple[int, SourceLatestResult]]:
+    """(index, result) for each source in unique, in completion order."""
+    batched = _start_linkedin_batch(unique, use_cache)
+    youtube_uploads = _resolve_youtube_uploads([s for i, s in enumerate(unique) if i not in batched])
+
+    def fetch(i: int) -> SourceLatestResult:
+        if i in batched:
+            return _linkedin_batch_result(unique[i], batched[i])
+        return _fetch_latest_safe(unique[i], youtube_uploads, use_cache)
+
+    # Batched LinkedIn sources only wait on the shared run: no fetch slots, and extra workers so
+    # they interleave with the other sources instead of queueing behind them
+    yield from iter_concurrent(
+        fetch,
+        range(len(unique)),
+        host_of=lambda i: None if i in batched else _upstream_host(unique[i]),
+        max_workers=settings.fetch_max_concurrency + len(batched),
+    )
+
+
+def fetch_latest_results(sources: list[Source], *, use_cache: bool = True) -> list[SourceLatestResult]:
+    """
+    Fetch the latest item for every source, in the same order as sources. Sources are fetched
+    concurrently (capped globally and per upstream host), so latency tracks the slowest source
+    rather than the sum of all of them. LinkedIn profiles fetched through Apify share one run.
+    Sources that point at the same feed (see source_feed_key) are fetched once and the result
+    is fanned out to each of them. use_cache=False bypasses the latest-item cache.
+    """
+    index = build_subscriber_index(sources)
+    keys = list(index)
+    by_key = {}
+    for i, r in _iter_unique_results([index[key][0] for key in keys], use_cache):
+        by_key[keys[i]] = (r.recent, r.error)
+    return [_result_for(s, *by_key[source_feed_key(s.type, s.url)]) for s in sources]
+
+
+def iter_latest_results(
+    sources: list[Source], *, use_cache: bool = True
+) -> Iterator[tuple[Source, SourceLatestResult]]:
+    """
+    Like fetch_latest_results, but yields (source, result) as each feed finishes instead of in
+    input order, so callers can stream results while slow upstreams are still running.
+    """
+    index = build_subscriber_index(sources)
+    keys = list(index)
+    for i, r in _iter_unique_results([index[key][0] for key in keys], use_cache):
+        for s in index[keys[i]]:
+            yield s, _result_for(s, r.recent, r.error)
+
+
 def fetch_latest_for_sources(sources: list[Source]) -> list[dict]:
     """
-    For each source, fetch latest item. Returns a list of dicts suitable for JSON response.
+    For each source, fetch latest item. Returns a list of dicts suitable for JSON response,
+    in the same order as sources (see fetch_latest_results).
     """
-    results = []
-    for source in sources:
-        r = fetch_latest_for_source(source)
-        latest_dict = None
-        if r.latest:
-            latest_dict = {
-                "url": r.latest.url,
-                "title": r.latest.title,
-                "published_at": r.latest.published_at,
-            }
-        results.append(
-            {
-                "source_id": r.source_id,
-                "source_type": r.source_type,
-                "source_url": r.source_url,
-                "source_name": r.source_name,
-                "latest": latest_dict,
-                "error": r.error,
-            }
-        )
-    return results
+    return [source_result_to_dict(r) for r in fetch_latest_results(sources)]
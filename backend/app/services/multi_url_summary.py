@@ -1,11 +1,12 @@
 """
 Produce a single ~3-minute text summary from multiple URLs.
-Uses get_or_extract_summary per URL (same as POST /summaries/get-or-extract), then Gemini to summarize.
+Uses get_or_extract_summaries (same per-URL results as POST /summaries/get-or-extract, with text
+pages extracted in batched Gemini calls), then Gemini to summarize.
 """
 from sqlalchemy.orm import Session
 
 from app.models.summary_generation.service import generate_3min_digest_summary
-from app.services.url_summary import get_or_extract_summary
+from app.services.url_summary import get_or_extract_summaries
 
 
 def _summary_dict_to_content(obj: dict, url: str = "") -> str:
@@ -24,20 +25,17 @@ def get_multi_url_summary(urls: list[str], db: Session) -> str:
     a single ~3-minute text summary of all content via Gemini.
 
     :param urls: List of source URLs (YouTube, X, LinkedIn, news, etc.).
-    :param db: Database session for get_or_extract_summary.
+    :param db: Database session for get_or_extract_summaries.
     :return: One combined summary text (~3 min when read aloud).
     """
     urls = [u.strip() for u in urls if (u and u.strip())]
     if not urls:
         return "No URLs provided."
 
+    results = get_or_extract_summaries(urls, db)
     item_contents: list[str] = []
     for url in urls:
-        try:
-            result = get_or_extract_summary(url, db)
-        except ValueError:
-            # e.g. YouTube rate limit ("Too many requests"), transcript unavailable
-            result = None
+        result = results.get(url)
         if result is not None:
             item_contents.append(_summary_dict_to_content(result, url))
 
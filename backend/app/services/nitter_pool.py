@@ -0,0 +1,169 @@
+"""
+Pool of Nitter instances for X/Twitter RSS, ranked by observed health and latency.
+Public Nitter instances are often slow or down, so each feed request goes to the best-ranked
+instance, and if it has not answered within settings.nitter_hedge_after_seconds a hedged request
+goes to the runner-up; the first usable feed wins. Failures move on to the next instance at once.
+
+Instances come from NITTER_BASE_URLS (comma-separated), falling back to NITTER_BASE_URL.
+Every request updates the instance's success rate and latency (EWMA); instances whose circuit
+breaker is open are ranked last.
+
+Import: from app.services.nitter_pool import fetch_nitter_feed, to_x_url
+"""
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from app.circuit_breaker import OPEN, get_breaker
+from app.config import settings
+from app.fetch_pool import host_of_url
+from app.services.feed_reader import fetch_feed
+
+DEFAULT_NITTER_BASE = "https://nitter.net"
+
+# Key used for per-host fetch slots (app.fetch_pool) for all X sources, whichever instance serves them
+POOL_HOST = "nitter"
+
+# Weight of the newest sample in the moving averages
+_EWMA_ALPHA = 0.3
+# Below this success rate an instance is considered unhealthy
+_HEALTHY_SUCCESS_RATE = 0.5
+# Requests in flight per feed fetch (primary + one hedge)
+_MAX_IN_FLIGHT = 2
+
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="nitter")
+
+
+class _InstanceStats:
+    __slots__ = ("success_rate", "latency", "last_error")
+
+    def __init__(self) -> None:
+        self.success_rate = 1.0
+        self.latency: float | None = None
+        self.last_error: str | None = None
+
+
+_stats: dict[str, _InstanceStats] = {}
+_stats_lock = threading.Lock()
+
+
+def nitter_instances() -> list[str]:
+    """Configured Nitter base URLs (no trailing slash), in configuration order."""
+    raw = settings.nitter_base_urls or settings.nitter_base_url or ""
+    bases = []
+    for part in raw.split(","):
+        base = part.strip().rstrip("/")
+        if base and base not in bases:
+            bases.append(base)
+    return bases or [DEFAULT_NITTER_BASE]
+
+
+def _record(base: str, ok: bool, latency: float, error: str | None = None) -> None:
+    with _stats_lock:
+        st = _stats.setdefault(base, _InstanceStats())
+        st.success_rate += _EWMA_ALPHA * ((1.0 if ok else 0.0) - st.success_rate)
+        if ok:
+            st.latency = latency if st.latency is None else st.latency + _EWMA_ALPHA * (latency - st.latency)
+            st.last_error = None
+        else:
+            st.last_error = error
+
+
+def ranked_instances() -> list[str]:
+    """Instances best-first: healthy before unhealthy, then by average latency."""
+    bases = nitter_instances()
+    untried = settings.nitter_hedge_after_seconds
+    with _stats_lock:
+        stats = {b: _stats.get(b) for b in bases}
+
+    def score(base: str) -> tuple:
+        st = stats[base]
+        breaker_open = get_breaker(urlparse(base).hostname or "").state == OPEN
+        healthy = not breaker_open and (st is None or st.success_rate >= _HEALTHY_SUCCESS_RATE)
+        latency = untried if st is None or st.latency is None else st.latency
+        return (not healthy, latency)
+
+    return sorted(bases, key=score)
+
+
+def pool_stats() -> dict[str, dict]:
+    """Success rate / latency per instance, best-ranked first."""
+    out = {}
+    for base in ranked_instances():
+        with _stats_lock:
+            st = _stats.get(base)
+        out[base] = {
+            "success_rate": round(st.success_rate, 3) if st else None,
+            "latency_seconds": round(st.latency, 3) if st and st.latency is not None else None,
+            "last_error": st.last_error if st else None,
+        }
+    return out
+
+
+def _usable(parsed) -> bool:
+    # Dead instances often answer 200 with an HTML error page, which feedparser flags as bozo
+    return bool(getattr(parsed, "entries", None)) or not getattr(parsed, "bozo", False)
+
+
+def _fetch_from(base: str, path: str, headers: dict | None, max_entries: int | None = None):
+    start = time.monotonic()
+    try:
+        parsed = fetch_feed(f"{base}{path}", headers=headers, max_entries=max_entries)
+    except Exception as e:
+        _record(base, False, time.monotonic() - start, str(e))
+        raise
+    if not _usable(parsed):
+        _record(base, False, time.monotonic() - start, "Not a feed")
+        raise ValueError(f"{base} did not return a feed")
+    _record(base, True, time.monotonic() - start)
+    return parsed
+
+
+def fetch_nitter_feed(path: str, *, headers: dict | None = None, max_entries: int | None = None):
+    """
+    Fetch path (e.g. "/jack/rss") from the best Nitter instance, hedging to the runner-up if it
+    is slow. Returns the feedparser result of the first instance that answers with a feed.
+    Raises the last error if every instance fails.
+    """
+    candidates = ranked_instances()
+    pending: dict[Future, str] = {}
+    last_error: Exception | None = None
+
+    def launch_next() -> None:
+        base = candidates.pop(0)
+        pending[_executor.submit(_fetch_from, base, path, headers, max_entries)] = base
+
+    launch_next()
+    while pending:
+        done, _ = wait(pending, timeout=settings.nitter_hedge_after_seconds, return_when=FIRST_COMPLETED)
+        if not done:
+            # Primary is slow: hedge to the next instance and keep waiting on both
+            if candidates and len(pending) < _MAX_IN_FLIGHT:
+                launch_next()
+            continue
+        for future in done:
+            pending.pop(future)
+            try:
+                return future.result()
+            except Exception as e:
+                last_error = e
+        while candidates and len(pending) < _MAX_IN_FLIGHT:
+            launch_next()
+    raise last_error or RuntimeError("No Nitter instance available")
+
+
+def to_x_url(link: str) -> str:
+    """Rewrite a Nitter status link (any configured instance) to the canonical x.com URL."""
+    if not link:
+        return link
+    instance_hosts = {host_of_url(b) for b in nitter_instances()}
+    try:
+        parsed = urlparse(link)
+    except ValueError:
+        return link
+    if host_of_url(link) not in instance_hosts or not parsed.path:
+        return link
+    return f"https://x.com{parsed.path}"
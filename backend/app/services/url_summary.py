@@ -1,6 +1,8 @@
 """
 Get summary by URL: return from DB if present, otherwise extract and save.
 Uses the same table (extracted_summaries) for YouTube and text URLs (X, LinkedIn, news).
+Text pages are fingerprinted by content, so a new URL for content already extracted under another
+URL (syndication, AMP / canonical variants) reuses that extraction.
 """
 import json
 import os
@@ -24,6 +26,17 @@ def extract_from_other_url(url: str, output_dir: str = ".") -> dict | None:
     return extract_text_content(url)
 
 
+def _extract_text_page(url: str, db: Session) -> tuple[dict | None, str | None]:
+    """extract_from_other_url with content-hash reuse: (result, content_hash)."""
+    from app.models.scrapper.text_content_extractor import extract_text_content_with_fingerprint
+
+    def known(content_hash: str) -> dict | None:
+        row = db.query(ExtractedSummary).filter(ExtractedSummary.content_hash == content_hash).first()
+        return json.loads(row.summary_json) if row else None
+
+    return extract_text_content_with_fingerprint(url, known=known)
+
+
 def get_or_extract_summary(url: str, db: Session, *, output_dir: str | None = None) -> dict | None:
     """
     Return summary JSON for the given URL.
@@ -45,22 +58,65 @@ def get_or_extract_summary(url: str, db: Session, *, output_dir: str | None = No
     out_dir = output_dir or os.path.join("/tmp", "transcribe")
     os.makedirs(out_dir, exist_ok=True)
 
+    content_hash = None
     if _is_youtube_url(url):
         from app.models.transcription import youtube_url_to_text
         result = youtube_url_to_text(url, out_dir)
     else:
-        result = extract_from_other_url(url, out_dir)
+        result, content_hash = _extract_text_page(url, db)
 
     if result is None:
         return None
 
     # Save
+    _save_summary(db, url, result, content_hash)
+    db.commit()
+
+    return result
+
+
+def _save_summary(db: Session, url: str, result: dict, content_hash: str | None) -> None:
     summary_json = json.dumps(result, ensure_ascii=False)
     existing = db.query(ExtractedSummary).filter(ExtractedSummary.source_url == url).first()
     if existing:
         existing.summary_json = summary_json
+        existing.content_hash = content_hash
     else:
-        db.add(ExtractedSummary(source_url=url, summary_json=summary_json))
-    db.commit()
+        db.add(ExtractedSummary(source_url=url, summary_json=summary_json, content_hash=content_hash))
 
-    return result
+
+def get_or_extract_summaries(urls: list[str], db: Session) -> dict[str, dict | None]:
+    """
+    get_or_extract_summary for many URLs. Text pages not in the database are fetched concurrently
+    and extracted with batched Gemini calls (extract_text_pages); YouTube URLs go one by one.
+    Returns {url: summary dict, or None if extraction failed} for every non-empty url.
+    """
+    from app.models.scrapper.text_content_extractor import extract_text_pages
+
+    urls = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+    results: dict[str, dict | None] = {}
+    for row in db.query(ExtractedSummary).filter(ExtractedSummary.source_url.in_(urls)).all():
+        results[row.source_url] = json.loads(row.summary_json)
+    missing = [u for u in urls if u not in results]
+    text_urls = [u for u in missing if not _is_youtube_url(u)]
+    for u in missing:
+        if _is_youtube_url(u):
+            try:
+                results[u] = get_or_extract_summary(u, db)
+            except ValueError:
+                # e.g. YouTube rate limit ("Too many requests"), transcript unavailable
+                results[u] = None
+    if text_urls:
+
+        def known(content_hash: str) -> dict | None:
+            row = db.query(ExtractedSummary).filter(ExtractedSummary.content_hash == content_hash).first()
+            return json.loads(row.summary_json) if row else None
+
+        extracted = extract_text_pages(text_urls, known=known)
+        for u in text_urls:
+            result, content_hash = extracted.get(u, (None, None))
+            results[u] = result
+            if result is not None:
+                _save_summary(db, u, result, content_hash)
+        db.commit()
+    return {u: results.get(u) for u in urls}
@@ -1,6 +1,9 @@
 """
 Fetch one recent X (Twitter) post per topic.
 Uses Apify (scraper_one/x-posts-search) when APIFY_API_TOKEN is set; otherwise falls back to Nitter search RSS.
+
+The actor takes a single query per run, so fetch_posts_by_topics starts one asynchronous run per
+topic and waits on all of them at once; posts are cached per normalized topic for a short TTL.
 """
 from __future__ import annotations
 
@@ -22,6 +25,12 @@ try:
 except Exception:
     settings = None
 
+from app.fetch_pool import map_concurrent
+from app.services.apify_client import run_actor
+from app.services.feed_by_topics import normalize_topic
+from app.services.nitter_pool import fetch_nitter_feed, to_x_url
+from app.ttl_cache import TTLCache
+
 USER_AGENT = (
     "Mozilla/5.0 (Windows NT 10.0; rv:109.0) Gecko/20100101 Firefox/119.0"
 )
@@ -30,11 +39,6 @@ USER_AGENT = (
 APIFY_X_POSTS_SEARCH_ACTOR_ID = "scraper_one~x-posts-search"
 
 
-def _get_nitter_base() -> str:
-    base = (getattr(settings, "nitter_base_url", None) or "").strip().rstrip("/") if settings else ""
-    return base or "https://nitter.net"
-
-
 def _fetch_post_for_topic_apify(topic: str, api_token: str) -> tuple[dict | None, str | None]:
     """
     Fetch one recent X post for a topic via Apify (scraper_one/x-posts-search).
@@ -45,27 +49,11 @@ def _fetch_post_for_topic_apify(topic: str, api_token: str) -> tuple[dict | None
         return (None, None)
     if httpx is None:
         return (None, "httpx not installed")
-    api_url = (
-        f"https://api.apify.com/v2/acts/{APIFY_X_POSTS_SEARCH_ACTOR_ID}/run-sync-get-dataset-items"
-        f"?token={api_token}&timeout=60&limit=1"
-    )
     # "top" = sort by engagement (likes, retweets); "latest" = most recent
     payload = {"query": topic, "resultsCount": 1, "searchType": "latest"}
-    try:
-        with httpx.Client(timeout=75.0) as client:
-            r = client.post(api_url, json=payload)
-            r.raise_for_status()
-            data = r.json()
-    except httpx.HTTPStatusError as e:
-        body = e.response.text
-        if e.response.status_code == 401:
-            return (None, "Apify API token invalid or missing (set APIFY_API_TOKEN)")
-        if e.response.status_code in (400, 402, 408):
-            return (None, f"Apify: {body[:200]}" if body else str(e))
-        return (None, f"Apify returned {e.response.status_code}: {body[:200]}")
-    except Exception as e:
-        return (None, f"Apify request failed: {e}")
-
+    data, err = run_actor(APIFY_X_POSTS_SEARCH_ACTOR_ID, payload, api_token, run_timeout=60, max_wait=75.0)
+    if err:
+        return (None, err)
     if not isinstance(data, list) or len(data) == 0:
         return (None, None)
     item = data[0]
@@ -95,13 +83,10 @@ def _fetch_post_for_topic_nitter(topic: str) -> tuple[dict | None, str | None]:
         return (None, None)
     if feedparser is None:
         return (None, "feedparser not installed")
-    base = _get_nitter_base()
     q = quote_plus(topic)
-    feed_url = f"{base}/search/rss?f=tweets&q={q}"
     try:
-        parsed = feedparser.parse(
-            feed_url,
-            request_headers={"User-Agent": USER_AGENT},
+        parsed = fetch_nitter_feed(
+            f"/search/rss?f=tweets&q={q}", headers={"User-Agent": USER_AGENT}, max_entries=1
         )
     except Exception as e:
         return (None, f"Nitter search failed: {e}")
@@ -112,6 +97,7 @@ def _fetch_post_for_topic_nitter(topic: str) -> tuple[dict | None, str | None]:
     link = entry.get("link") or entry.get("href")
     if not link:
         return (None, None)
+    link = to_x_url(link)
     title = entry.get("title") or ""
     published = None
     for key in ("published", "updated", "created"):
@@ -128,36 +114,51 @@ def _fetch_post_for_topic_nitter(topic: str) -> tuple[dict | None, str | None]:
     )
 
 
+class _TopicSearchFailed(Exception):
+    """Raised inside the cache loader so failed lookups are not cached."""
+
+
+_post_cache: TTLCache[dict | None] = TTLCache(ttl=settings.x_topic_cache_ttl_seconds if settings else 300)
+
+
+def _search_post_for_topic(topic: str) -> dict | None:
+    token = (getattr(settings, "apify_api_token", None) or "").strip() if settings else ""
+    if token:
+        post, err = _fetch_post_for_topic_apify(topic, token)
+        if err is None and post is not None:
+            return post
+        # Apify failed or no results; fall back to Nitter
+    post, err = _fetch_post_for_topic_nitter(topic)
+    if err:
+        raise _TopicSearchFailed(err)
+    return post
+
+
 def fetch_post_for_topic(topic: str) -> tuple[dict | None, str | None]:
     """
-    Fetch one recent X/Twitter post for a topic.
+    Fetch one recent X/Twitter post for a topic (cached per normalized topic).
     Tries Apify first if APIFY_API_TOKEN is set; otherwise uses Nitter search RSS.
     Returns ({"url", "title", "published_at"} or None, error_message).
     """
     topic = (topic or "").strip()
     if not topic:
         return (None, None)
-    token = (getattr(settings, "apify_api_token", None) or "").strip() if settings else ""
-    if token:
-        post, err = _fetch_post_for_topic_apify(topic, token)
-        if err is None and post is not None:
-            return (post, None)
-        # Apify failed or no results; fall back to Nitter
-    return _fetch_post_for_topic_nitter(topic)
+    try:
+        post = _post_cache.get_or_load(normalize_topic(topic), lambda: _search_post_for_topic(topic))
+    except _TopicSearchFailed as e:
+        return (None, str(e))
+    return (dict(post) if post else None, None)
 
 
 def fetch_posts_by_topics(topics: list[str]) -> list[dict]:
     """
     Fetch one recent X post per topic. Returns list of {topic, post: {url, title, published_at}}.
     Skips topics that return no post; no error surface (Nitter may be down or search RSS disabled).
+    Topics are searched concurrently, results in topic order; Apify runs are limited by
+    settings.apify_max_concurrent_runs (see run_actor), not by the topic count.
     """
     if not topics:
         return []
-    result = []
-    for topic in topics:
-        topic = (topic or "").strip()
-        if not topic:
-            continue
-        post, _ = fetch_post_for_topic(topic)
-        result.append({"topic": topic, "post": post})
-    return result
+    cleaned = [t for t in ((t or "").strip() for t in topics) if t]
+    posts = map_concurrent(lambda t: fetch_post_for_topic(t)[0], cleaned)
+    return [{"topic": topic, "post": post} for topic, post in zip(cleaned, posts)]
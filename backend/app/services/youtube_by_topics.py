@@ -2,12 +2,23 @@
 Fetch recent YouTube videos from YouTube Data API v3 search based on topic keywords.
 One video per topic, with a minimum view count. Uses the same topic preferences as the article feed.
 Requires GOOGLE_API_KEY (YouTube Data API v3 uses the same key).
+
+Search results (100 quota units each) are cached per normalized topic; topics are searched
+concurrently, and view counts for every topic's candidates are fetched together, 50 ids per
+videos.list call.
 """
 from __future__ import annotations
 
 import os
 import httpx
 
+from app.fetch_pool import host_of_url, map_concurrent
+from app.http_client import get_client
+from app.models.scrapper.youtube_audio_extractor import YT_SEARCH_URL, YT_VIDEOS_URL
+from app.services import youtube_quota
+from app.services.feed_by_topics import normalize_topic
+from app.ttl_cache import TTLCache
+
 try:
     from app.config import settings
 except Exception:
@@ -17,6 +28,8 @@ except Exception:
 MIN_VIEWS_DEFAULT = 10000
 # How many recent candidates to fetch before filtering by views
 SEARCH_CANDIDATES = 15
+# Ids per videos.list call (API maximum)
+VIDEOS_PER_CALL = 50
 
 
 def _get_youtube_api_key() -> str:
@@ -37,22 +50,19 @@ def _parse_int(s: str | None, default: int = 0) -> int:
         return default
 
 
-def fetch_videos_for_topic(
-    topic: str,
-    min_views: int = MIN_VIEWS_DEFAULT,
-) -> tuple[list[dict], str | None]:
-    """
-    Fetch one recent YouTube video for a topic with at least min_views.
-    Returns (list of 0 or 1 item {url, title, published_at, channel_title, view_count}, error_message).
-    If no video has enough views, returns the single most recent video.
-    """
-    topic = (topic or "").strip()
-    if not topic:
-        return ([], None)
-    api_key = _get_youtube_api_key()
-    if not api_key:
-        return ([], "GOOGLE_API_KEY not set")
-    url_search = "https://www.googleapis.com/youtube/v3/search"
+class _SearchFailed(Exception):
+    """Raised inside the cache loader so failed searches are not cached."""
+
+
+# Per normalized topic: [(video_id, snippet)] most recent first
+_search_cache: TTLCache[list[tuple[str, dict]]] = TTLCache(
+    ttl=settings.youtube_topic_cache_ttl_seconds if settings else 1800
+)
+
+
+def _search_topic(topic: str, api_key: str) -> list[tuple[str, dict]]:
+    """Recent videos for a topic from search.list; raises _SearchFailed with the error message."""
+    url_search = YT_SEARCH_URL
     params = {
         "part": "snippet",
         "type": "video",
@@ -61,10 +71,13 @@ def fetch_videos_for_topic(
         "maxResults": min(SEARCH_CANDIDATES, 50),
         "key": api_key,
     }
+    if not youtube_quota.spend("search"):
+        raise _SearchFailed(youtube_quota.QUOTA_ERROR)
     try:
-        with httpx.Client(timeout=15.0) as client:
-            r = client.get(url_search, params=params)
-            data = r.json()
+        r = get_client(url_search).get(url_search, params=params)
+        if youtube_quota.is_quota_error(r):
+            youtube_quota.mark_exhausted()
+        data = r.json()
     except httpx.HTTPStatusError as e:
         err_detail = ""
         try:
@@ -80,9 +93,9 @@ def fetch_videos_for_topic(
         except Exception:
             pass
         msg = err_detail or str(e.response.status_code)
-        return ([], f"YouTube API error: {msg}")
+        raise _SearchFailed(f"YouTube API error: {msg}")
     except Exception as e:
-        return ([], f"YouTube API request failed: {e}")
+        raise _SearchFailed(f"YouTube API request failed: {e}")
 
     err_body = data.get("error") if isinstance(data, dict) else None
     if err_body:
@@ -92,77 +105,98 @@ def fetch_videos_for_topic(
             reason = errors[0].get("reason", "")
             if reason:
                 msg = f"{reason}: {msg}"
-        return ([], f"YouTube API: {msg}")
+        raise _SearchFailed(f"YouTube API: {msg}")
     if r.status_code >= 400:
-        return ([], f"YouTube API error: {r.status_code}")
+        raise _SearchFailed(f"YouTube API error: {r.status_code}")
 
-    items = data.get("items") or []
-    video_ids = []
-    id_to_snippet: dict[str, dict] = {}
-    for item in items:
+    candidates = []
+    for item in data.get("items") or []:
         vid = item.get("id") if isinstance(item.get("id"), dict) else {}
         video_id = (vid.get("videoId") or "").strip() if vid else None
-        if not video_id:
-            continue
-        video_ids.append(video_id)
-        id_to_snippet[video_id] = item.get("snippet") or {}
-    if not video_ids:
-        return ([], None)
+        if video_id:
+            candidates.append((video_id, item.get("snippet") or {}))
+    return candidates
+
 
-    # Get view counts (videos.list allows up to 50 ids)
-    url_videos = "https://www.googleapis.com/youtube/v3/videos"
+def _search_candidates(topic: str, api_key: str) -> tuple[list[tuple[str, dict]], str | None]:
+    """Cached search results for a topic: ([(video_id, snippet)], error_message)."""
     try:
-        with httpx.Client(timeout=15.0) as client:
-            r2 = client.get(
+        return (_search_cache.get_or_load(normalize_topic(topic), lambda: _search_topic(topic, api_key)), None)
+    except _SearchFailed as e:
+        return ([], str(e))
+
+
+def _fetch_view_counts(video_ids: list[str], api_key: str) -> dict[str, int] | None:
+    """View count per id, VIDEOS_PER_CALL ids per videos.list call. None if any call fails."""
+    url_videos = YT_VIDEOS_URL
+    stats_by_id: dict[str, int] = {}
+    ids = list(dict.fromkeys(video_ids))
+    for i in range(0, len(ids), VIDEOS_PER_CALL):
+        try:
+            if not youtube_quota.spend("videos"):
+                raise RuntimeError(youtube_quota.QUOTA_ERROR)
+            r = get_client(url_videos).get(
                 url_videos,
-                params={"part": "statistics", "id": ",".join(video_ids), "key": api_key},
+                params={"part": "statistics", "id": ",".join(ids[i : i + VIDEOS_PER_CALL]), "key": api_key},
             )
-            data2 = r2.json()
-    except Exception:
-        # Fallback: return most recent without view count
-        vid_id = video_ids[0]
-        sn = id_to_snippet.get(vid_id) or {}
-        return ([{
-            "url": f"https://www.youtube.com/watch?v={vid_id}",
-            "title": sn.get("title") or "",
-            "published_at": sn.get("publishedAt") or "",
-            "channel_title": sn.get("channelTitle") or "",
-            "view_count": None,
-        }], None)
+            if youtube_quota.is_quota_error(r):
+                youtube_quota.mark_exhausted()
+            data = r.json()
+        except Exception:
+            return None
+        for item in (data.get("items") or []):
+            vid = item.get("id")
+            if not vid:
+                continue
+            stat = item.get("statistics") or {}
+            stats_by_id[vid] = _parse_int(stat.get("viewCount"))
+    return stats_by_id
+
+
+def _video_dict(vid_id: str, sn: dict, view_count: int | None) -> dict:
+    return {
+        "url": f"https://www.youtube.com/watch?v={vid_id}",
+        "title": sn.get("title") or "",
+        "published_at": sn.get("publishedAt") or "",
+        "channel_title": sn.get("channelTitle") or "",
+        "view_count": view_count,
+    }
 
-    stats_by_id: dict[str, int] = {}
-    for item in (data2.get("items") or []):
-        vid = item.get("id")
-        if not vid:
-            continue
-        stat = item.get("statistics") or {}
-        stats_by_id[vid] = _parse_int(stat.get("viewCount"))
-
-    # Pick first (most recent) with >= min_views; else pick the one with highest view count
-    chosen = None
-    for vid_id in video_ids:
+
+def _choose_video(candidates: list[tuple[str, dict]], stats_by_id: dict[str, int] | None, min_views: int) -> dict:
+    """First (most recent) candidate with >= min_views; else the one with highest view count."""
+    if stats_by_id is None:
+        # Fallback: return most recent without view count
+        vid_id, sn = candidates[0]
+        return _video_dict(vid_id, sn, None)
+    for vid_id, sn in candidates:
         views = stats_by_id.get(vid_id, 0)
         if views >= min_views:
-            sn = id_to_snippet.get(vid_id) or {}
-            chosen = {
-                "url": f"https://www.youtube.com/watch?v={vid_id}",
-                "title": sn.get("title") or "",
-                "published_at": sn.get("publishedAt") or "",
-                "channel_title": sn.get("channelTitle") or "",
-                "view_count": views,
-            }
-            break
-    if chosen is None:
-        vid_id = max(video_ids, key=lambda vid: stats_by_id.get(vid, 0))
-        sn = id_to_snippet.get(vid_id) or {}
-        chosen = {
-            "url": f"https://www.youtube.com/watch?v={vid_id}",
-            "title": sn.get("title") or "",
-            "published_at": sn.get("publishedAt") or "",
-            "channel_title": sn.get("channelTitle") or "",
-            "view_count": stats_by_id.get(vid_id),
-        }
-    return ([chosen], None)
+            return _video_dict(vid_id, sn, views)
+    vid_id, sn = max(candidates, key=lambda c: stats_by_id.get(c[0], 0))
+    return _video_dict(vid_id, sn, stats_by_id.get(vid_id))
+
+
+def fetch_videos_for_topic(
+    topic: str,
+    min_views: int = MIN_VIEWS_DEFAULT,
+) -> tuple[list[dict], str | None]:
+    """
+    Fetch one recent YouTube video for a topic with at least min_views.
+    Returns (list of 0 or 1 item {url, title, published_at, channel_title, view_count}, error_message).
+    If no video has enough views, returns the single most recent video.
+    """
+    topic = (topic or "").strip()
+    if not topic:
+        return ([], None)
+    api_key = _get_youtube_api_key()
+    if not api_key:
+        return ([], "GOOGLE_API_KEY not set")
+    candidates, err = _search_candidates(topic, api_key)
+    if not candidates:
+        return ([], err)
+    stats_by_id = _fetch_view_counts([vid for vid, _ in candidates], api_key)
+    return ([_choose_video(candidates, stats_by_id, min_views)], None)
 
 
 def fetch_single_best_video_by_topics(
@@ -175,21 +209,28 @@ def fetch_single_best_video_by_topics(
     Returns ({"topic": str, "video": {...}} or None, error_message).
     Requires GOOGLE_API_KEY.
     """
-    if not topics:
+    cleaned = [t for t in ((t or "").strip() for t in topics or []) if t]
+    if not cleaned:
         return (None, None)
-    candidates: list[tuple[str, dict]] = []
-    first_error: str | None = None
-    for topic in topics:
-        topic = (topic or "").strip()
-        if not topic:
-            continue
-        videos, err = fetch_videos_for_topic(topic, min_views=min_views)
-        if err and first_error is None:
-            first_error = err
-        if videos:
-            candidates.append((topic, videos[0]))
-    if not candidates:
+    api_key = _get_youtube_api_key()
+    if not api_key:
+        return (None, "GOOGLE_API_KEY not set")
+    searches = map_concurrent(
+        lambda t: _search_candidates(t, api_key),
+        cleaned,
+        host_of=lambda _: host_of_url(YT_SEARCH_URL),
+    )
+    first_error = next((err for _, err in searches if err), None)
+    all_ids = [vid for found, _ in searches for vid, _ in found]
+    if not all_ids:
         return (None, first_error)
+    # One statistics lookup for every topic's candidates
+    stats_by_id = _fetch_view_counts(all_ids, api_key)
+    candidates = [
+        (topic, _choose_video(found, stats_by_id, min_views))
+        for topic, (found, _) in zip(cleaned, searches)
+        if found
+    ]
     # Pick the one with highest view_count (treat None as 0)
     best_topic, best_video = max(
         candidates,
@@ -0,0 +1,218 @@
+"""
+YouTube Data API v3 quota budget.
+Every API call asks for its units first (search = 100, list calls = 1) and is skipped when the
+day's budget is spent, so callers can fall back to cached data or free endpoints (oEmbed) instead
+of failing once Google starts returning quotaExceeded.
+
+Work runs at a priority kept in a context variable: interactive (default, request handlers) or
+background (ingestion). Background work may only use the budget minus
+settings.youtube_quota_interactive_reserve, so users can still load content late in the day.
+
+Usage is kept per quota day (midnight America/Los_Angeles, when Google resets it) and persisted
+to youtube_quota_usage so restarts do not forget what was spent: at most every
+settings.youtube_quota_persist_interval_seconds, on day rollover, on quotaExceeded and at shutdown
+(flush). Database I/O never runs under _lock.
+
+Import: from app.services.youtube_quota import spend, quota_priority, BACKGROUND
+"""
+from __future__ import annotations
+
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Units per call (https://developers.google.com/youtube/v3/determine_quota_cost)
+COSTS = {
+    "search": 100,
+    "channels": 1,
+    "playlistItems": 1,
+    "videos": 1,
+}
+
+INTERACTIVE, BACKGROUND = "interactive", "background"
+
+QUOTA_ERROR = "YouTube API daily quota budget used up (resets at midnight Pacific time)"
+
+_priority: contextvars.ContextVar[str] = contextvars.ContextVar("youtube_quota_priority", default=INTERACTIVE)
+
+_lock = threading.Lock()
+_day: str | None = None
+_used = 0
+_by_endpoint: dict[str, int] = {}
+_exhausted = False
+# Units of _day already written to youtube_quota_usage, and when that was last attempted
+_persisted = 0
+_last_persist = 0.0
+
+
+def _quota_tz():
+    try:
+        from zoneinfo import ZoneInfo
+
+        return ZoneInfo("America/Los_Angeles")
+    except Exception:
+        # No tz database (slim images): Pacific standard time is close enough for a daily budget
+        return timezone(timedelta(hours=-8))
+
+
+def _today() -> str:
+    return datetime.now(_quota_tz()).strftime("%Y-%m-%d")
+
+
+def _load_used(day: str) -> int:
+    try:
+        from app.db import SessionLocal
+        from app.models.database import YoutubeQuotaUsage
+
+        with SessionLocal() as db:
+            row = db.query(YoutubeQuotaUsage).filter(YoutubeQuotaUsage.day == day).first()
+            return row.units if row else 0
+    except Exception:
+        logger.warning("YouTube quota: could not load usage for %s; counting from 0", day, exc_info=True)
+        return 0
+
+
+def _persist(day: str, units: int) -> bool:
+    try:
+        from app.db import SessionLocal
+        from app.models.database import YoutubeQuotaUsage
+
+        with SessionLocal() as db:
+            row = db.query(YoutubeQuotaUsage).filter(YoutubeQuotaUsage.day == day).first()
+            if row is None:
+                db.add(YoutubeQuotaUsage(day=day, units=units, updated_at=datetime.now(timezone.utc)))
+            else:
+                row.units = max(row.units, units)
+                row.updated_at = datetime.now(timezone.utc)
+            db.commit()
+        return True
+    except Exception:
+        logger.warning("YouTube quota: could not persist %s units for %s", units, day, exc_info=True)
+        return False
+
+
+def _write(day: str, units: int) -> None:
+    """Persist units for day (outside _lock) and remember them as written."""
+    global _persisted
+    if _persist(day, units):
+        with _lock:
+            if day == _day:
+                _persisted = max(_persisted, units)
+
+
+def _roll_day() -> str:
+    """
+    Switch the counters to the current quota day, loading what an earlier process spent.
+    Call without _lock held; the previous day's unwritten usage is persisted on the way.
+    """
+    global _day, _used, _by_endpoint, _exhausted, _persisted, _last_persist
+    day = _today()
+    with _lock:
+        if day == _day:
+            return day
+    loaded = _load_used(day)
+    previous = None
+    with _lock:
+        if day != _day:
+            if _day is not None and _used > _persisted:
+                previous = (_day, _used)
+            _day, _used, _by_endpoint, _exhausted = day, loaded, {}, False
+            _persisted, _last_persist = loaded, time.monotonic()
+    if previous:
+        _persist(*previous)
+    return day
+
+
+def _limit_for(priority: str) -> int:
+    limit = settings.youtube_daily_quota
+    if priority == BACKGROUND:
+        limit -= settings.youtube_quota_interactive_reserve
+    return max(0, limit)
+
+
+def spend(endpoint: str) -> bool:
+    """
+    Reserve the units for one call to endpoint ("search", "channels", "playlistItems", "videos").
+    Returns False (and spends nothing) if the budget for the current priority would be exceeded.
+    """
+    global _used, _last_persist
+    cost = COSTS.get(endpoint, 1)
+    day = _roll_day()
+    write = None
+    with _lock:
+        if day != _day or _exhausted or _used + cost > _limit_for(_priority.get()):
+            return False
+        _used += cost
+        _by_endpoint[endpoint] = _by_endpoint.get(endpoint, 0) + cost
+        now = time.monotonic()
+        if now - _last_persist >= settings.youtube_quota_persist_interval_seconds:
+            _last_persist = now
+            write = (day, _used)
+    if write:
+        _write(*write)
+    return True
+
+
+def flush() -> None:
+    """Persist usage not yet written (shutdown; also called on quotaExceeded)."""
+    with _lock:
+        if _day is None or _used <= _persisted:
+            return
+        day, used = _day, _used
+    _write(day, used)
+
+
+def mark_exhausted() -> None:
+    """Google answered quotaExceeded: stop calling the API until the quota day rolls over."""
+    global _exhausted
+    _roll_day()
+    with _lock:
+        if not _exhausted:
+            logger.warning("YouTube API quota exhausted for %s (%s units counted)", _day, _used)
+        _exhausted = True
+    flush()
+
+
+def is_quota_error(response) -> bool:
+    """True if an httpx response is YouTube's quotaExceeded / dailyLimitExceeded error."""
+    if response is None or response.status_code != 403:
+        return False
+    try:
+        errors = (response.json().get("error") or {}).get("errors") or []
+    except Exception:
+        return False
+    return any(isinstance(e, dict) and e.get("reason") in ("quotaExceeded", "dailyLimitExceeded") for e in errors)
+
+
+@contextmanager
+def quota_priority(priority: str):
+    """Run the block (and fetch_pool workers it starts) at the given priority."""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def quota_status() -> dict:
+    """Budget snapshot for the current quota day."""
+    day = _roll_day()
+    with _lock:
+        limit = settings.youtube_daily_quota
+        return {
+            "day": day,
+            "daily_limit": limit,
+            "used": _used,
+            "remaining": 0 if _exhausted else max(0, limit - _used),
+            "interactive_reserve": settings.youtube_quota_interactive_reserve,
+            "background_remaining": 0 if _exhausted else max(0, _limit_for(BACKGROUND) - _used),
+            "exhausted": _exhausted,
+            "by_endpoint": dict(_by_endpoint),
+        }
@@ -0,0 +1,106 @@
+"""
+In-memory TTL cache with stale-while-revalidate, for upstream lookups shared across requests.
+
+- Fresh hit: returned immediately.
+- Stale hit (past ttl but within ttl + stale_ttl): returned immediately, and one background
+  refresh is started for the key.
+- Miss / expired: loaded on the caller's thread; concurrent misses on the same key share one load.
+
+Entries are __slots__ records and the cache is LRU-bounded, so it can hold every active key.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Generic, TypeVar
+
+from app.fetch_pool import SingleFlight
+
+V = TypeVar("V")
+
+logger = logging.getLogger(__name__)
+
+# Shared by all caches; refreshes are fire-and-forget upstream fetches
+_refresh_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="cache-refresh")
+
+
+class _Entry:
+    __slots__ = ("value", "fresh_until", "stale_until", "refreshing")
+
+    def __init__(self, value, fresh_until: float, stale_until: float) -> None:
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.refreshing = False
+
+
+class TTLCache(Generic[V]):
+    """Thread-safe TTL + stale-while-revalidate cache (see module docstring)."""
+
+    def __init__(self, ttl: float, stale_ttl: float = 0.0, max_entries: int = 10_000) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._loads = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set(self, key: str, value: V) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._entries[key] = _Entry(value, now + self.ttl, now + self.ttl + self.stale_ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def peek(self, key: str) -> V | None:
+        """Cached value (fresh or stale) without loading or refreshing; None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() >= entry.stale_until:
+                return None
+            return entry.value
+
+    def invalidate(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def _load(self, key: str, loader: Callable[[], V]) -> V:
+        def load_and_store() -> V:
+            value = loader()
+            self.set(key, value)
+            return value
+
+        return self._loads.do(key, load_and_store)
+
+    def _refresh(self, key: str, loader: Callable[[], V]) -> None:
+        try:
+            self._load(key, loader)
+        except Exception:
+            logger.exception("Background refresh failed for %s", key)
+        finally:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refreshing = False
+
+    def get_or_load(self, key: str, loader: Callable[[], V]) -> V:
+        """Cached value for key, loading (or revalidating in the background) with loader()."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                if now < entry.fresh_until:
+                    return entry.value
+                if not entry.refreshing:
+                    entry.refreshing = True
+                    _refresh_executor.submit(self._refresh, key, loader)
+                return entry.value
+        return self._load(key, loader)
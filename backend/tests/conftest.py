@@ -8,6 +8,8 @@ from fastapi.testclient import TestClient
 
 # Use in-memory SQLite for tests (must set before any app import)
 os.environ.setdefault("DATABASE_URL", "sqlite:///:memory:")
+# No background polling of upstream sources during tests
+os.environ.setdefault("INGESTION_ENABLED", "false")
 
 from app.main import app
 
@@ -16,3 +18,22 @@ from app.main import app
 def client():
     with TestClient(app) as c:
         yield c
+
+
+@pytest.fixture
+def db_session(monkeypatch):
+    """Session on a fresh in-memory database; app.db.SessionLocal is pointed at it too."""
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    import app.db
+    from app.models.database import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(app.db, "SessionLocal", session_factory)
+    with session_factory() as db:
+        yield db
+    engine.dispose()
@@ -0,0 +1,68 @@
+"""
+Tests for batched Apify runs (app.services.apify_client, LinkedIn matching in latest_from_sources).
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from app.services.apify_client import BatchCollector
+from app.services.latest_from_sources import _linkedin_item_slugs, _linkedin_profile_slug
+
+
+def test_batch_collector_groups_concurrent_submits_into_one_run():
+    runs = []
+
+    def run_batch(keys):
+        runs.append(sorted(keys))
+        return {k: k.upper() for k in keys}
+
+    collector = BatchCollector(run_batch, window=0.1, max_batch=10, name="test-batch")
+    with ThreadPoolExecutor(max_workers=4) as ex:
+        futures = list(ex.map(collector.submit, ["a", "b", "c", "a"]))
+    assert [f.result(timeout=2) for f in futures] == ["A", "B", "C", "A"]
+    assert runs == [["a", "b", "c"]]
+
+
+def test_batch_collector_missing_keys_get_default():
+    collector = BatchCollector(lambda keys: {}, window=0.0, max_batch=1, missing_result=(None, "none"))
+    assert collector.submit("x").result(timeout=2) == (None, "none")
+
+
+def test_linkedin_items_match_profiles_by_slug():
+    assert _linkedin_profile_slug("https://www.linkedin.com/in/Jane-Doe/") == "in/jane-doe"
+    item = {"author": {"publicIdentifier": "jane-doe", "linkedinUrl": "https://linkedin.com/in/jane-doe"}}
+    assert "in/jane-doe" in _linkedin_item_slugs(item)
+
+
+def test_run_actor_long_poll_outlasts_learned_p99(monkeypatch):
+    import time
+
+    import httpx
+
+    from app.circuit_breaker import BreakerTransport, get_breaker
+    from app.config import settings
+    from app.services import apify_client
+
+    monkeypatch.setattr(settings, "adaptive_timeout_min_seconds", 0.05)
+    breaker = get_breaker("api.apify.com")
+    for _ in range(50):
+        breaker.record(True, 0.01)
+
+    def handler(request):
+        path = request.url.path
+        if path.endswith("/runs"):
+            return httpx.Response(201, json={"data": {"id": "r1", "status": "RUNNING"}})
+        if "/actor-runs/" in path:
+            # The run finishes during the poll, well after the learned p99
+            if request.extensions["timeout"]["read"] < 0.2:
+                raise httpx.ReadTimeout("poll cut short", request=request)
+            time.sleep(0.2)
+            return httpx.Response(200, json={"data": {"id": "r1", "status": "SUCCEEDED", "defaultDatasetId": "d1"}})
+        return httpx.Response(200, json=[{"ok": True}])
+
+    timeout = httpx.Timeout(5.0)
+    client = httpx.Client(timeout=timeout, transport=BreakerTransport(httpx.MockTransport(handler), timeout))
+    monkeypatch.setattr(apify_client, "get_client", lambda url=None: client)
+    # Even a default-timeout poll must not be tightened when it opts out
+    monkeypatch.setattr(apify_client, "request_timeout", lambda read=None: timeout)
+    items, err = apify_client.run_actor("actor", {}, "token", max_wait=5)
+    assert err is None and items == [{"ok": True}]
+    assert breaker.state == "closed"
@@ -0,0 +1,71 @@
+"""
+Tests for per-host circuit breakers (app.circuit_breaker).
+"""
+import httpx
+import pytest
+
+from app.circuit_breaker import BreakerTransport, CircuitOpenError, get_breaker
+from app.config import settings
+
+
+def _client(handler):
+    return httpx.Client(transport=BreakerTransport(httpx.MockTransport(handler)))
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast():
+    calls = {"n": 0}
+
+    def handler(request):
+        calls["n"] += 1
+        return httpx.Response(503)
+
+    client = _client(handler)
+    for _ in range(settings.circuit_failure_threshold):
+        client.get("https://down.breaker-test.example/feed")
+    assert get_breaker("down.breaker-test.example").state == "open"
+    with pytest.raises(CircuitOpenError):
+        client.get("https://down.breaker-test.example/feed")
+    assert calls["n"] == settings.circuit_failure_threshold
+
+
+def test_half_open_probe_success_closes_circuit(monkeypatch):
+    breaker = get_breaker("flaky.breaker-test.example")
+    for _ in range(settings.circuit_failure_threshold):
+        breaker.record(False)
+    assert not breaker.allow()
+    monkeypatch.setattr(settings, "circuit_open_seconds", 0.0)
+    client = _client(lambda request: httpx.Response(200))
+    assert client.get("https://flaky.breaker-test.example/").status_code == 200
+    assert breaker.state == "closed"
+
+
+def test_read_timeout_adapts_to_p99():
+    breaker = get_breaker("fast.breaker-test.example")
+    assert breaker.read_timeout(15.0) == 15.0
+    for _ in range(50):
+        breaker.record(True, 0.5)
+    expected = max(settings.adaptive_timeout_min_seconds, 0.5 * settings.adaptive_timeout_multiplier)
+    assert breaker.read_timeout(15.0) == expected
+
+
+def test_only_default_timeouts_are_tightened_and_tightened_timeouts_are_not_failures():
+    host = "slowish.breaker-test.example"
+    breaker = get_breaker(host)
+    for _ in range(50):
+        breaker.record(True, 0.1)
+    seen = []
+
+    def handler(request):
+        seen.append(request.extensions["timeout"]["read"])
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    client = httpx.Client(timeout=15.0, transport=BreakerTransport(httpx.MockTransport(handler), httpx.Timeout(15.0)))
+    for _ in range(settings.circuit_failure_threshold + 1):
+        with pytest.raises(httpx.ReadTimeout):
+            client.get(f"https://{host}/")
+    assert seen[0] == settings.adaptive_timeout_min_seconds
+    assert breaker.state == "closed" and breaker.consecutive_failures == 0
+    with pytest.raises(httpx.ReadTimeout):
+        client.get(f"https://{host}/", timeout=70.0)
+    assert seen[-1] == 70.0
+    assert breaker.consecutive_failures == 1
@@ -0,0 +1,184 @@
+"""
+Tests for local main-content extraction (app.models.scrapper.content_extractor).
+"""
+from app.models.scrapper import content_extractor, text_content_extractor
+
+PARAGRAPH = (
+    "The council approved the new transit plan on Tuesday, after months of debate, public hearings, "
+    "and a revised budget that adds night buses, wider bike lanes, and longer platform hours."
+)
+
+ARTICLE_PAGE = f"""<html><head><title>Site | Transit</title>
+<meta property="og:title" content="Council approves transit plan">
+<meta property="og:type" content="article">
+<script>var x = "<p>not content</p>";</script></head>
+<body>
+<nav><a href="/">Home</a> <a href="/news">News</a></nav>
+<div class="layout"><article><h1>Council approves transit plan</h1>
+{"".join(f"<p>{PARAGRAPH} ({i})</p>" for i in range(8))}
+</article>
+<div class="related-stories"><p>Other story you might like, with a long enough teaser text</p></div>
+</div><footer>Copyright</footer></body></html>"""
+
+
+def test_article_page_is_extracted_with_high_confidence():
+    out = content_extractor.extract_main_content(ARTICLE_PAGE)
+    assert out["title"] == "Council approves transit plan"
+    assert out["confidence"] >= 0.7
+    assert out["text"].count("The council approved") == 8
+    assert "Other story" not in out["text"] and "Home" not in out["text"]
+
+
+def test_short_post_has_low_confidence():
+    out = content_extractor.extract_main_content("<html><body><div><p>Just shipped a new release, try it out!</p></div></body></html>")
+    assert out["confidence"] < 0.7
+
+
+def test_strip_html_to_text_skips_scripts_and_decodes_entities():
+    html = "<p>A &amp; B</p><script>if (a < b) { x = '</p>'; }</script><style>p{}</style><p>C&nbsp;D</p>"
+    assert content_extractor.strip_html_to_text(html) == "A & B C D"
+
+
+def test_confident_page_skips_gemini(monkeypatch):
+    monkeypatch.setattr(text_content_extractor, "_fetch_html", lambda url: ARTICLE_PAGE)
+
+    def no_gemini(*args, **kwargs):
+        raise AssertionError("Gemini should not be called")
+
+    monkeypatch.setattr(text_content_extractor, "_extract_with_gemini", no_gemini)
+    out = text_content_extractor.extract_text_content("https://example.com/transit", api_key="unused")
+    assert out["url"] == "https://example.com/transit"
+    assert out["title"] == "Council approves transit plan"
+
+
+def test_gemini_extraction_is_trimmed_schema_constrained_and_metered(monkeypatch):
+    from types import SimpleNamespace
+
+    from google import genai
+
+    seen = {}
+
+    class FakeModels:
+        def generate_content(self, model, contents, config):
+            seen["contents"], seen["config"] = contents, config
+            usage = SimpleNamespace(prompt_token_count=900, candidates_token_count=40)
+            return SimpleNamespace(parsed={"title": "T", "text": "Body"}, text="", usage_metadata=usage)
+
+    monkeypatch.setattr(genai, "Client", lambda api_key: SimpleNamespace(models=FakeModels()))
+    monkeypatch.setattr(text_content_extractor, "_extraction_settings", lambda: (1000, 8192))
+    before = text_content_extractor.extraction_usage()
+    out = text_content_extractor._extract_with_gemini("word " * 5000, "https://example.com", api_key="k")
+    assert out == {"title": "T", "text": "Body"}
+    assert len(seen["contents"]) < 4000 + 1000
+    assert seen["config"].response_mime_type == "application/json"
+    assert seen["config"].max_output_tokens <= 1000 + 256
+    after = text_content_extractor.extraction_usage()
+    assert after["calls"] == before["calls"] + 1
+    assert after["prompt_tokens"] == before["prompt_tokens"] + 900
+    assert after["completion_tokens"] == before["completion_tokens"] + 40
+
+
+def test_fetch_html_gates_content_type_and_caps_bytes(monkeypatch):
+    import httpx
+
+    from app import http_client
+
+    pulled = []
+
+    def body():
+        for i in range(100):
+            pulled.append(i)
+            yield ('<meta charset="iso-8859-1"><p>caf\xe9 ' + "x" * 1000 + "</p>").encode("latin-1")
+
+    def handler(request):
+        if request.url.path.endswith(".pdf"):
+            return httpx.Response(200, headers={"content-type": "application/pdf"}, content=body())
+        return httpx.Response(200, headers={"content-type": "text/html"}, content=body())
+
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(http_client, "get_client", lambda url=None: client)
+    monkeypatch.setattr(text_content_extractor, "_max_page_bytes", lambda: 5000)
+    html = text_content_extractor._fetch_html("https://example.com/page")
+    assert html.startswith('<meta charset="iso-8859-1"><p>café x')
+    assert len(html.encode("latin-1")) == 5000
+    assert len(pulled) < 10
+    pulled.clear()
+    assert text_content_extractor._fetch_html("https://example.com/file.pdf") is None
+    assert len(pulled) <= 1
+
+
+def test_same_content_under_another_url_reuses_extraction(monkeypatch):
+    amp_page = ARTICLE_PAGE.replace("<footer>Copyright</footer>", "<footer>AMP edition</footer>")
+    monkeypatch.setattr(text_content_extractor, "_fetch_html", lambda url: amp_page)
+    _, fingerprint = text_content_extractor.extract_text_content_with_fingerprint("https://example.com/a")
+    stored = {fingerprint: {"title": "Stored", "text": "Stored body", "url": "https://example.com/a"}}
+
+    out, same = text_content_extractor.extract_text_content_with_fingerprint(
+        "https://example.com/a?amp=1", known=stored.get
+    )
+    assert same == fingerprint
+    assert out == {"title": "Stored", "text": "Stored body", "url": "https://example.com/a?amp=1"}
+    assert text_content_extractor.content_fingerprint("Access denied") is None
+
+
+def test_text_pages_are_extracted_in_batches_and_failures_retried(monkeypatch):
+    pages = {f"https://example.com/{i}": f"<p>short post number {i}</p>" for i in range(5)}
+    monkeypatch.setattr(text_content_extractor, "_fetch_html", lambda url: pages[url])
+    monkeypatch.setattr(text_content_extractor, "_batch_settings", lambda: (10_000, 3))
+    batches, singles = [], []
+
+    def fake_batch(batch, *, api_key, model):
+        batches.append([url for url, _ in batch])
+        # The model drops the last page of each batch
+        return {url: {"title": "B", "text": text} for url, text in batch[:-1]}
+
+    def fake_single(raw_text, url, *, api_key, model=None):
+        singles.append(url)
+        return {"title": "S", "text": raw_text}
+
+    monkeypatch.setattr(text_content_extractor, "_extract_batch_with_gemini", fake_batch)
+    monkeypatch.setattr(text_content_extractor, "_extract_with_gemini", fake_single)
+    out = text_content_extractor.extract_text_pages(list(pages), api_key="k")
+    assert batches == [list(pages)[:3], list(pages)[3:]]
+    assert singles == ["https://example.com/2", "https://example.com/4"]
+    assert out["https://example.com/1"][0] == {"title": "B", "text": "short post number 1", "url": "https://example.com/1"}
+    assert out["https://example.com/4"][0]["title"] == "S"
+
+
+def test_pack_batches_respects_token_budget():
+    pages = [("a", "x" * 400), ("b", "x" * 400), ("c", "x" * 400)]
+    assert [len(b) for b in text_content_extractor._pack_batches(pages, 200, 8)] == [2, 1]
+
+
+def test_text_pages_without_gemini_key_keep_local_results(monkeypatch):
+    pages = {"https://example.com/article": ARTICLE_PAGE, "https://example.com/post": "<p>Just a short post</p>"}
+    monkeypatch.setattr(text_content_extractor, "_fetch_html", lambda url: pages[url])
+
+    def no_key():
+        raise ValueError("GEMINI_API_KEY is not set (env or app config)")
+
+    monkeypatch.setattr(text_content_extractor, "_get_gemini_api_key", no_key)
+    out = text_content_extractor.extract_text_pages(list(pages))
+    assert out["https://example.com/article"][0]["title"] == "Council approves transit plan"
+    assert out["https://example.com/post"][0] is None
+
+
+def test_pages_sharing_boilerplate_get_different_fingerprints(monkeypatch):
+    boilerplate = " ".join(f"word{i}" for i in range(60))
+    pages = {
+        url: (
+            f"<html><body><h1>{headline}</h1><div class='site-info'><p>{boilerplate}</p></div>"
+            f"<span>{body}</span></body></html>"
+        )
+        for url, headline, body in (
+            ("https://example.com/a", "Council approves plan", "The council voted on the transit plan today."),
+            ("https://example.com/b", "Storm hits the coast", "Heavy rain flooded several streets overnight."),
+        )
+    }
+    monkeypatch.setattr(text_content_extractor, "_fetch_html", lambda url: pages[url])
+    a = text_content_extractor.prepare_text_page("https://example.com/a")
+    b = text_content_extractor.prepare_text_page("https://example.com/b")
+    assert a.local is None and b.local is None
+    assert a.fingerprint and b.fingerprint
+    assert a.fingerprint != b.fingerprint
+    assert a.fingerprint == text_content_extractor.content_fingerprint(a.raw_text)
@@ -0,0 +1,118 @@
+"""
+Tests for Google News topic fetching (app.services.feed_by_topics).
+"""
+import time
+
+from app.services import feed_by_topics
+
+
+def test_fetch_articles_by_topics_is_concurrent_and_dedupes_in_topic_order(monkeypatch):
+    def fake_fetch(topic, max_articles=10, hl="en-US", gl="US", resolve=False):
+        time.sleep(0.2 if topic == "a" else 0.0)
+        return [{"url": "https://example.com/shared"}, {"url": f"https://example.com/{topic}"}]
+
+    monkeypatch.setattr(feed_by_topics, "fetch_articles_for_topic", fake_fetch)
+    start = time.monotonic()
+    result = feed_by_topics.fetch_articles_by_topics(["a", " ", "b", "c"])
+    assert time.monotonic() - start < 0.35
+    assert [r["topic"] for r in result] == ["a", "b", "c"]
+    assert [a["url"] for a in result[0]["articles"]] == ["https://example.com/shared", "https://example.com/a"]
+    assert [a["url"] for a in result[1]["articles"]] == ["https://example.com/b"]
+
+
+def test_pick_topic_article_urls_decodes_only_picked_and_caches(monkeypatch):
+    decoded = []
+
+    def fake_decoder(link):
+        decoded.append(link)
+        slug = link.rsplit("/", 1)[-1]
+        return {"status": slug != "bad", "decoded_url": f"https://example.com/{slug}"}
+
+    monkeypatch.setattr(feed_by_topics, "gnewsdecoder", fake_decoder)
+    monkeypatch.setattr(feed_by_topics, "_load_decoded", lambda links: {})
+    monkeypatch.setattr(feed_by_topics, "_store_decoded", lambda link, url: None)
+    g = "https://news.google.com/rss/articles/"
+    topic_articles = [
+        ("a", [{"url": g + "one"}, {"url": g + "two"}, {"url": g + "three"}]),
+        ("b", [{"url": g + "bad"}, {"url": g + "one"}, {"url": g + "four"}]),
+    ]
+    urls = feed_by_topics.pick_topic_article_urls(topic_articles, exclude=["https://example.com/x"])
+    assert urls == ["https://example.com/one", "https://example.com/four"]
+    assert sorted(decoded) == sorted([g + "one", g + "bad", g + "one", g + "four"])
+
+
+def test_resolve_google_news_urls_uses_stored_decodes(monkeypatch):
+    monkeypatch.setattr(feed_by_topics, "gnewsdecoder", lambda link: (_ for _ in ()).throw(AssertionError))
+    link = "https://news.google.com/rss/articles/known"
+    feed_by_topics._remember({link: "https://example.com/known"})
+    assert feed_by_topics.resolve_google_news_urls([link, "https://example.com/plain"]) == [
+        "https://example.com/known",
+        "https://example.com/plain",
+    ]
+
+
+def test_topic_feed_is_shared_by_normalized_topic_and_locale(monkeypatch):
+    calls = []
+
+    def fake_feed(topic, max_articles, hl, gl):
+        calls.append((topic, hl, gl))
+        time.sleep(0.1)
+        return feed_by_topics._CachedTopicFeed([{"url": f"https://example.com/{topic}"}], max_articles)
+
+    monkeypatch.setattr(feed_by_topics, "_fetch_topic_feed", fake_feed)
+    monkeypatch.setattr(feed_by_topics, "_topic_cache", feed_by_topics.TTLCache(ttl=60))
+    topics = ["Climate  Change", "climate change", "ＣＬＩＭＡＴＥ change", "climate change"]
+    results = feed_by_topics.fetch_articles_for_topics(topics, max_articles=5, resolve=False)
+    assert calls == [("climate change", "en-US", "US")]
+    assert all(articles == [{"url": "https://example.com/climate change"}] for _, articles in results)
+    results[0][1][0]["url"] = "changed"
+    feed_by_topics.fetch_articles_for_topic("climate change", max_articles=5, hl="fr", gl="FR", resolve=False)
+    assert calls[-1] == ("climate change", "fr", "FR")
+    assert feed_by_topics.fetch_articles_for_topic("Climate change", resolve=False)[0]["url"].endswith("change")
+
+
+def test_resolving_more_topics_than_host_slots_does_not_deadlock(monkeypatch):
+    import threading
+
+    from app.config import settings
+
+    g = "https://news.google.com/rss/articles/"
+
+    def fake_feed(topic, max_articles, hl, gl):
+        return feed_by_topics._CachedTopicFeed([{"url": g + topic.replace(" ", "-")}], max_articles)
+
+    monkeypatch.setattr(feed_by_topics, "_fetch_topic_feed", fake_feed)
+    monkeypatch.setattr(feed_by_topics, "_topic_cache", feed_by_topics.TTLCache(ttl=60))
+    monkeypatch.setattr(feed_by_topics, "gnewsdecoder", lambda link: {"status": True, "decoded_url": link.replace(g, "https://example.com/")})
+    monkeypatch.setattr(feed_by_topics, "_load_decoded", lambda links: {})
+    monkeypatch.setattr(feed_by_topics, "_store_decoded", lambda link, url: None)
+    topics = [f"topic {i}" for i in range(settings.fetch_max_per_host + 2)]
+    out = {}
+    worker = threading.Thread(
+        target=lambda: out.setdefault("r", feed_by_topics.fetch_articles_for_topics(topics, resolve=True)),
+        daemon=True,
+    )
+    worker.start()
+    worker.join(timeout=5)
+    assert not worker.is_alive(), "fetch_articles_for_topics deadlocked"
+    assert [arts[0]["url"] for _, arts in out["r"]] == [f"https://example.com/topic-{i}" for i in range(len(topics))]
+
+
+def test_pick_topic_article_urls_gives_collisions_to_the_earlier_topic(monkeypatch):
+    targets = {"gone": "https://example.com/excluded", "b1": "https://example.com/same",
+               "c1": "https://example.com/same", "c2": "https://example.com/other"}
+    monkeypatch.setattr(
+        feed_by_topics,
+        "gnewsdecoder",
+        lambda link: {"status": True, "decoded_url": targets[link.rsplit("/", 1)[-1]]},
+    )
+    monkeypatch.setattr(feed_by_topics, "_load_decoded", lambda links: {})
+    monkeypatch.setattr(feed_by_topics, "_store_decoded", lambda link, url: None)
+    g = "https://news.google.com/rss/articles/"
+    topic_articles = [
+        ("a", [{"url": g + "gone"}, {"url": g + "b1"}]),
+        ("b", [{"url": g + "c1"}, {"url": g + "c2"}]),
+    ]
+    # Sequentially, topic a takes the shared URL with its second candidate before topic b is looked at
+    urls = feed_by_topics.pick_topic_article_urls(topic_articles, exclude=["https://example.com/excluded"])
+    assert urls == ["https://example.com/same", "https://example.com/other"]
@@ -0,0 +1,145 @@
+"""
+Tests for feed fetching (app.services.feed_reader) against a mock transport.
+"""
+import httpx
+
+from app.services import feed_reader
+
+RSS = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>T</title>
+<item><title>First</title><link>https://example.com/1</link><guid>1</guid></item>
+<item><title>Second</title><link>https://example.com/2</link><guid>2</guid></item>
+</channel></rss>"""
+
+
+def _mock_client(monkeypatch, handler):
+    client = httpx.Client(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(feed_reader, "get_client", lambda url=None: client)
+
+
+def test_fetch_feed_conditional_get_returns_cached_entries_on_304(monkeypatch):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=RSS, headers={"ETag": '"v1"', "Content-Type": "application/rss+xml"})
+
+    _mock_client(monkeypatch, handler)
+    url = "https://example.com/conditional.xml"
+    first = feed_reader.fetch_feed(url)
+    second = feed_reader.fetch_feed(url)
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+    assert [e["link"] for e in second.entries] == [e["link"] for e in first.entries]
+
+
+def test_fetch_feed_stops_after_max_entries(monkeypatch):
+    sent = {"chunks": 0}
+    items = b"".join(
+        b"<item><title>T%d</title><link>https://example.com/%d</link></item>" % (i, i) for i in range(500)
+    )
+    body = b'<?xml version="1.0"?><rss version="2.0"><channel><title>Big</title>' + items + b"</channel></rss>"
+
+    def stream():
+        for i in range(0, len(body), 1024):
+            sent["chunks"] += 1
+            yield body[i:i + 1024]
+
+    _mock_client(monkeypatch, lambda request: httpx.Response(200, content=stream()))
+    parsed = feed_reader.fetch_feed("https://example.com/big.xml", max_entries=3)
+    assert [e["link"] for e in parsed.entries] == ["https://example.com/0", "https://example.com/1", "https://example.com/2"]
+    assert parsed.feed["title"] == "Big"
+    assert sent["chunks"] < len(body) // 1024
+
+
+def test_fetch_feed_falls_back_to_feedparser_for_malformed_xml(monkeypatch):
+    body = RSS.replace(b"<title>First</title>", b"<title>First&nbsp;one</title>")
+    _mock_client(monkeypatch, lambda request: httpx.Response(200, content=body))
+    parsed = feed_reader.fetch_feed("https://example.com/malformed.xml")
+    assert [e["link"] for e in parsed.entries] == ["https://example.com/1", "https://example.com/2"]
+
+
+def test_fetch_feed_revalidates_with_last_modified(monkeypatch):
+    seen_headers = []
+    stamp = "Wed, 01 Jan 2026 00:00:00 GMT"
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-modified-since") == stamp:
+            return httpx.Response(304)
+        return httpx.Response(200, content=RSS, headers={"Last-Modified": stamp})
+
+    _mock_client(monkeypatch, handler)
+    url = "https://example.com/last-modified.xml"
+    first = feed_reader.fetch_feed(url)
+    assert feed_reader.fetch_feed(url) is first
+    assert "if-none-match" not in seen_headers[1]
+    assert seen_headers[1]["if-modified-since"] == stamp
+
+
+def test_fetch_feed_replaces_validator_on_new_etag(monkeypatch):
+    versions = iter(['"v1"', '"v2"'])
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v2"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=RSS, headers={"ETag": next(versions)})
+
+    _mock_client(monkeypatch, handler)
+    url = "https://example.com/changed.xml"
+    feed_reader.fetch_feed(url)
+    feed_reader.fetch_feed(url)
+    feed_reader.fetch_feed(url)
+    assert seen_headers == [None, '"v1"', '"v2"']
+
+
+def test_fetch_feed_without_validators_is_not_conditional(monkeypatch):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(dict(request.headers))
+        return httpx.Response(200, content=RSS)
+
+    _mock_client(monkeypatch, handler)
+    url = "https://example.com/no-validators.xml"
+    feed_reader.fetch_feed(url)
+    feed_reader.fetch_feed(url)
+    assert feed_reader._get_validator(url) is None
+    assert "if-none-match" not in seen_headers[1] and "if-modified-since" not in seen_headers[1]
+
+
+def test_fetch_feed_truncated_parse_is_not_reused_for_more_entries(monkeypatch):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=RSS, headers={"ETag": '"v1"'})
+
+    _mock_client(monkeypatch, handler)
+    url = "https://example.com/truncated.xml"
+    assert len(feed_reader.fetch_feed(url, max_entries=1).entries) == 1
+    # Fewer (or as many) entries: the truncated parse is still enough
+    assert len(feed_reader.fetch_feed(url, max_entries=1).entries) == 1
+    # More entries than the cached parse holds: fetched again without validators
+    assert len(feed_reader.fetch_feed(url).entries) == 2
+    assert seen_headers == [None, '"v1"', None]
+
+
+def test_fetch_feed_unconditional_ignores_validators(monkeypatch):
+    seen_headers = []
+
+    def handler(request):
+        seen_headers.append(request.headers.get("if-none-match"))
+        return httpx.Response(200, content=RSS, headers={"ETag": '"v1"'})
+
+    _mock_client(monkeypatch, handler)
+    url = "https://example.com/unconditional.xml"
+    feed_reader.fetch_feed(url)
+    feed_reader.fetch_feed(url, conditional=False)
+    assert seen_headers == [None, None]
@@ -0,0 +1,100 @@
+"""
+Tests for the concurrent fetch fan-out (app.fetch_pool).
+"""
+import threading
+import time
+
+from app import fetch_pool
+from app.fetch_pool import SingleFlight, host_of_url, iter_concurrent, map_concurrent
+
+
+def test_map_concurrent_keeps_input_order():
+    def slow_echo(n):
+        time.sleep(0.01 * (5 - n))
+        return n
+
+    assert map_concurrent(slow_echo, range(5)) == [0, 1, 2, 3, 4]
+
+
+def test_map_concurrent_caps_per_host():
+    active = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def fetch(_):
+        with lock:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        time.sleep(0.02)
+        with lock:
+            active["now"] -= 1
+
+    map_concurrent(fetch, range(12), host_of=lambda _: "example.com")
+    assert active["max"] <= 4
+
+
+def test_saturated_host_does_not_delay_other_hosts(monkeypatch):
+    monkeypatch.setattr(fetch_pool, "_global_slots", threading.BoundedSemaphore(4))
+    monkeypatch.setattr(fetch_pool, "_host_slots", {"slow.example": threading.BoundedSemaphore(2)})
+    busy = threading.Thread(
+        target=map_concurrent,
+        args=(lambda _: time.sleep(0.3), range(6)),
+        kwargs={"host_of": lambda _: "slow.example", "max_workers": 6},
+    )
+    busy.start()
+    time.sleep(0.05)
+    start = time.monotonic()
+    map_concurrent(lambda _: None, range(2), host_of=lambda _: "fast.example")
+    elapsed = time.monotonic() - start
+    busy.join()
+    # Slots held by the busy host's queued jobs would make this wait for a 0.3 s job to finish
+    assert elapsed < 0.15
+
+
+def test_items_without_host_take_no_slot(monkeypatch):
+    slots = threading.BoundedSemaphore(1)
+    slots.acquire()
+    monkeypatch.setattr(fetch_pool, "_global_slots", slots)
+    assert map_concurrent(lambda n: n * 2, range(3), host_of=lambda _: None) == [0, 2, 4]
+
+
+def test_host_of_url():
+    assert host_of_url("https://www.BBC.co.uk/news") == "bbc.co.uk"
+    assert host_of_url("nitter.net/user/rss") == "nitter.net"
+    assert host_of_url("") == ""
+
+
+def test_single_flight_collapses_concurrent_calls():
+    flight = SingleFlight()
+    calls = []
+    gate = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        gate.wait(1)
+        return "result"
+
+    def caller(_):
+        return flight.do("feed", fetch)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(caller(None))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert results == ["result"] * 5
+    assert len(calls) == 1
+
+
+def test_iter_concurrent_yields_in_completion_order():
+    delays = [0.2, 0.0, 0.1]
+
+    def slow(d):
+        time.sleep(d)
+        return d
+
+    got = list(iter_concurrent(slow, delays))
+    assert [i for i, _ in got] == [1, 2, 0]
+    assert sorted(r for _, r in got) == sorted(delays)
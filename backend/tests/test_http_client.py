@@ -0,0 +1,104 @@
+"""
+Tests for the shared HTTP client registry (app.http_client).
+"""
+import threading
+import time
+
+import httpx
+import pytest
+
+from app import http_client
+from app.circuit_breaker import BreakerTransport
+
+
+class FakeClient:
+    def __init__(self, http2):
+        self.http2 = http2
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """Empty client registry whose clients are FakeClients; returns the list of builds."""
+    built = []
+
+    def build(http2):
+        built.append(http2)
+        return FakeClient(http2)
+
+    monkeypatch.setattr(http_client, "_clients", {})
+    monkeypatch.setattr(http_client, "_build_client", build)
+    monkeypatch.setattr(http_client, "_http2_available", lambda: True)
+    return built
+
+
+def test_googleapis_hosts_use_the_http2_client(registry):
+    for url in (
+        "https://www.googleapis.com/youtube/v3/videos",
+        "https://youtube.googleapis.com/youtube/v3/search",
+        "https://googleapis.com/x",
+    ):
+        assert http_client.get_client(url).http2
+    for url in ("https://example.com/feed", "https://notgoogleapis.com/x", "https://googleapis.com.evil.io/", None):
+        assert not http_client.get_client(url).http2
+
+
+def test_one_client_is_reused_per_kind(registry):
+    yt = http_client.get_client("https://www.googleapis.com/youtube/v3/videos")
+    assert http_client.get_client("https://youtube.googleapis.com/youtube/v3/search") is yt
+    default = http_client.get_client("https://example.com/feed")
+    assert http_client.get_client("https://api.apify.com/v2/acts") is default
+    assert http_client.get_client() is default
+    assert registry == [True, False]
+
+
+def test_without_h2_every_host_uses_the_default_client(registry, monkeypatch):
+    monkeypatch.setattr(http_client, "_http2_available", lambda: False)
+    client = http_client.get_client("https://www.googleapis.com/youtube/v3/videos")
+    assert not client.http2
+    assert http_client.get_client("https://example.com/") is client
+    assert registry == [False]
+
+
+def test_concurrent_first_use_builds_one_client(registry, monkeypatch):
+    build = http_client._build_client
+
+    def slow_build(http2):
+        time.sleep(0.05)
+        return build(http2)
+
+    monkeypatch.setattr(http_client, "_build_client", slow_build)
+    clients = []
+    threads = [
+        threading.Thread(target=lambda: clients.append(http_client.get_client("https://example.com/")))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert registry == [False]
+    assert all(c is clients[0] for c in clients)
+
+
+def test_close_clients_closes_and_forgets_them(registry):
+    first = http_client.get_client("https://example.com/")
+    http_client.get_client("https://www.googleapis.com/")
+    http_client.close_clients()
+    assert first.closed
+    assert http_client._clients == {}
+    assert http_client.get_client("https://example.com/") is not first
+
+
+def test_built_client_wraps_transport_with_breaker():
+    client = http_client._build_client(http2=False)
+    try:
+        assert isinstance(client._transport, BreakerTransport)
+        assert client.timeout == http_client.request_timeout()
+        assert client._transport._default_timeout == client.timeout.as_dict()
+        assert isinstance(client._transport._transport, httpx.HTTPTransport)
+    finally:
+        client.close()
@@ -0,0 +1,242 @@
+"""
+Tests for incremental ingestion (app.services.ingestion).
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.database import FetchFrequency, Item, Source, SourceType, User
+from app.services import ingestion
+from app.services.ingestion import _digest, _unseen_items
+from app.services.latest_from_sources import LatestItem, SourceLatestResult
+
+
+def _item(n):
+    return LatestItem(url=f"https://example.com/{n}", title=str(n), published_at=None)
+
+
+def test_unseen_items_stop_at_first_known_item():
+    seen = {_digest("https://example.com/2")}
+    recent = [_item(4), _item(3), _item(4), _item(2), _item(1)]
+    assert [i.title for i in _unseen_items(seen, recent)] == ["4", "3"]
+
+
+def test_unseen_items_all_new_when_nothing_stored():
+    assert len(_unseen_items(set(), [_item(1), _item(2)])) == 2
+
+
+@pytest.fixture(autouse=True)
+def _clear_seen():
+    ingestion._seen.clear()
+    yield
+    ingestion._seen.clear()
+
+
+def _dated(n, day):
+    return LatestItem(url=f"https://example.com/{n}", title=str(n), published_at=f"2026-01-{day:02d}T00:00:00Z")
+
+
+def _source(db, url="https://example.com/feed.xml", frequency=FetchFrequency.DAILY, user=None):
+    if user is None:
+        user = User(google_id=f"g-{url}", email="a@example.com")
+        db.add(user)
+        db.flush()
+    source = Source(user_id=user.id, type=SourceType.NEWS, url=url, frequency=frequency)
+    db.add(source)
+    db.commit()
+    return source
+
+
+def _result(source, recent, error=None):
+    return SourceLatestResult(
+        source_id=source.id,
+        source_type=source.type.value,
+        source_url=source.url,
+        source_name=source.name,
+        latest=recent[0] if recent else None,
+        error=error,
+        recent=recent,
+    )
+
+
+def _fake_fetch(monkeypatch, recent_by_url, calls=None):
+    def fetch(sources, use_cache=True):
+        if calls is not None:
+            calls.append([s.id for s in sources])
+        return [_result(s, recent_by_url.get(s.url, [])) for s in sources]
+
+    monkeypatch.setattr(ingestion, "fetch_latest_results", fetch)
+
+
+def test_store_result_inserts_new_items_and_stops_at_known(db_session):
+    source = _source(db_session)
+    assert ingestion._store_result(db_session, source, _result(source, [_dated(2, 2), _dated(1, 1)])) == 2
+    recent = [_dated(4, 4), _dated(3, 3), _dated(2, 2), _dated(1, 1)]
+    assert ingestion._store_result(db_session, source, _result(source, recent)) == 2
+    titles = [t for (t,) in db_session.query(Item.title).order_by(Item.id)]
+    assert titles == ["1", "2", "3", "4"]
+    assert source.last_fetched_at is not None and source.last_fetch_error is None
+
+
+def test_store_result_records_fetch_error(db_session):
+    source = _source(db_session)
+    assert ingestion._store_result(db_session, source, _result(source, [], error="Feed unreachable")) == 0
+    assert source.last_fetch_error == "Feed unreachable"
+    assert source.last_fetched_at is not None
+
+
+def test_is_source_due_uses_frequency_interval():
+    now = datetime(2026, 1, 10, tzinfo=timezone.utc)
+    daily = Source(frequency=FetchFrequency.DAILY, last_fetched_at=now - timedelta(hours=23))
+    assert not ingestion.is_source_due(daily, now)
+    daily.last_fetched_at = now - timedelta(days=1)
+    assert ingestion.is_source_due(daily, now)
+    weekly = Source(frequency=FetchFrequency.WEEKLY, last_fetched_at=now - timedelta(days=3))
+    assert not ingestion.is_source_due(weekly, now)
+    assert ingestion.is_source_due(Source(frequency=FetchFrequency.WEEKLY, last_fetched_at=None), now)
+
+
+def test_manual_sources_are_not_polled():
+    now = datetime(2026, 1, 10, tzinfo=timezone.utc)
+    manual = Source(frequency=FetchFrequency.MANUAL, last_fetched_at=now - timedelta(days=365))
+    assert not ingestion.is_source_due(manual, now)
+    assert ingestion.is_source_due(Source(frequency=FetchFrequency.MANUAL, last_fetched_at=None), now)
+
+
+def test_refresh_sources_fetches_manual_source(db_session, monkeypatch):
+    source = _source(db_session, frequency=FetchFrequency.MANUAL)
+    _fake_fetch(monkeypatch, {source.url: [_dated(1, 1)]})
+    assert ingestion.latest_for_sources_from_db(db_session, [source])[0]["latest"]["title"] == "1"
+    _fake_fetch(monkeypatch, {source.url: [_dated(2, 2), _dated(1, 1)]})
+    assert ingestion.refresh_sources(db_session, [source]) == 1
+    assert ingestion.latest_for_sources_from_db(db_session, [source])[0]["latest"]["title"] == "2"
+
+
+def test_latest_from_db_ingests_never_fetched_sources_once(db_session, monkeypatch):
+    source = _source(db_session)
+    calls = []
+    _fake_fetch(monkeypatch, {source.url: [_dated(2, 2), _dated(1, 1)]}, calls)
+    first = ingestion.latest_for_sources_from_db(db_session, [source])
+    second = ingestion.latest_for_sources_from_db(db_session, [source])
+    assert first == second
+    assert first[0]["latest"]["title"] == "2"
+    assert first[0]["latest"]["published_at"].startswith("2026-01-02")
+    assert calls == [[source.id]]
+
+
+def test_latest_from_db_reports_error_when_nothing_stored(db_session, monkeypatch):
+    source = _source(db_session)
+    monkeypatch.setattr(
+        ingestion,
+        "fetch_latest_results",
+        lambda sources, use_cache=True: [_result(s, [], error="Feed unreachable") for s in sources],
+    )
+    result = ingestion.latest_for_sources_from_db(db_session, [source])[0]
+    assert result["latest"] is None
+    assert result["error"] == "Feed unreachable"
+
+
+def test_undated_items_rank_below_dated_items(db_session, monkeypatch):
+    source = _source(db_session)
+    undated = LatestItem(url="https://example.com/undated", title="undated", published_at=None)
+    _fake_fetch(monkeypatch, {source.url: [undated, _dated(1, 1)]})
+    latest = ingestion.latest_for_sources_from_db(db_session, [source])[0]["latest"]
+    assert latest["title"] == "1"
+
+
+def test_undated_only_source_reports_newest_undated_item(db_session, monkeypatch):
+    source = _source(db_session)
+    recent = [LatestItem(url=f"https://example.com/u{n}", title=f"u{n}", published_at=None) for n in (2, 1)]
+    _fake_fetch(monkeypatch, {source.url: recent})
+    latest = ingestion.latest_for_sources_from_db(db_session, [source])[0]["latest"]
+    assert latest["title"] == "u2"
+    assert latest["published_at"] is None
+
+
+def test_run_ingestion_cycle_fetches_only_due_sources(db_session, monkeypatch):
+    now = datetime.now(timezone.utc)
+    due = _source(db_session, url="https://example.com/due.xml")
+    fresh = _source(db_session, url="https://example.com/fresh.xml")
+    manual = _source(db_session, url="https://example.com/manual.xml", frequency=FetchFrequency.MANUAL)
+    due.last_fetched_at = now - timedelta(days=2)
+    fresh.last_fetched_at = now - timedelta(hours=1)
+    manual.last_fetched_at = now - timedelta(days=30)
+    db_session.commit()
+    calls = []
+    _fake_fetch(monkeypatch, {due.url: [_dated(1, 1)], fresh.url: [_dated(2, 2)]}, calls)
+    assert ingestion.run_ingestion_cycle() == 1
+    assert calls == [[due.id]]
+    assert [s for (s,) in db_session.query(Item.source_id)] == [due.id]
+
+
+def test_run_ingestion_cycle_skips_manual_subscribers_of_due_feed(db_session, monkeypatch):
+    now = datetime.now(timezone.utc)
+    due = _source(db_session)
+    other_user = User(google_id="g-other", email="b@example.com")
+    db_session.add(other_user)
+    db_session.flush()
+    manual = _source(db_session, frequency=FetchFrequency.MANUAL, user=other_user)
+    due.last_fetched_at = now - timedelta(days=2)
+    manual.last_fetched_at = now - timedelta(days=2)
+    db_session.commit()
+    calls = []
+    _fake_fetch(monkeypatch, {due.url: [_dated(1, 1)]}, calls)
+    assert ingestion.run_ingestion_cycle() == 1
+    assert calls == [[due.id]]
+
+
+def test_failed_fetch_is_retried_after_short_backoff(db_session, monkeypatch):
+    monkeypatch.setattr(ingestion.settings, "ingestion_error_retry_minutes", 30)
+    source = _source(db_session, frequency=FetchFrequency.WEEKLY)
+    ingestion._store_result(db_session, source, _result(source, [], error="Circuit open for example.com"))
+    now = ingestion._as_utc(source.last_fetched_at)
+    assert not ingestion.is_source_due(source, now + timedelta(minutes=29))
+    assert ingestion.is_source_due(source, now + timedelta(minutes=30))
+
+    ingestion._store_result(db_session, source, _result(source, [_dated(1, 1)]))
+    now = ingestion._as_utc(source.last_fetched_at)
+    assert source.last_fetch_error is None
+    assert not ingestion.is_source_due(source, now + timedelta(days=6))
+    assert ingestion.is_source_due(source, now + timedelta(days=7))
+
+
+def test_failed_first_fetch_is_retried_by_the_cycle(db_session, monkeypatch):
+    monkeypatch.setattr(ingestion.settings, "ingestion_error_retry_minutes", 30)
+    source = _source(db_session)
+    monkeypatch.setattr(
+        ingestion,
+        "fetch_latest_results",
+        lambda sources, use_cache=True: [_result(s, [], error="Feed unreachable") for s in sources],
+    )
+    assert ingestion.latest_for_sources_from_db(db_session, [source])[0]["error"] == "Feed unreachable"
+    source.last_fetched_at = datetime.now(timezone.utc) - timedelta(minutes=31)
+    db_session.commit()
+    _fake_fetch(monkeypatch, {source.url: [_dated(1, 1)]})
+    assert ingestion.run_ingestion_cycle() == 1
+    db_session.expire_all()
+    assert ingestion.latest_for_sources_from_db(db_session, [source])[0]["latest"]["title"] == "1"
+
+
+def test_run_ingestion_cycle_nothing_due(db_session, monkeypatch):
+    source = _source(db_session)
+    source.last_fetched_at = datetime.now(timezone.utc)
+    db_session.commit()
+    calls = []
+    _fake_fetch(monkeypatch, {}, calls)
+    assert ingestion.run_ingestion_cycle() == 0
+    assert calls == []
+
+
+def test_refresh_endpoint_requires_owned_source(client, db_session):
+    from app.db import get_db
+    from app.main import app, get_current_user_id
+
+    other = _source(db_session)
+    app.dependency_overrides[get_db] = lambda: db_session
+    app.dependency_overrides[get_current_user_id] = lambda: other.user_id + 1
+    try:
+        response = client.post("/sources/refresh", params={"source_id": other.id})
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.dependency_overrides.pop(get_current_user_id, None)
+    assert response.status_code == 404
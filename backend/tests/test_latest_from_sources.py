@@ -0,0 +1,161 @@
+"""
+Tests for the site feed discovery cache (app.services.latest_from_sources).
+"""
+from datetime import datetime, timedelta, timezone
+
+from app.config import settings
+from app.models.database import DiscoveredFeed
+from app.services import latest_from_sources
+
+
+def _fake_discovery(monkeypatch, feed_url):
+    calls = []
+
+    def discover(site_url):
+        calls.append(site_url)
+        return feed_url
+
+    monkeypatch.setattr(latest_from_sources, "_discover_rss_feed", discover)
+    return calls
+
+
+def test_discovered_feed_is_cached_per_site(db_session, monkeypatch):
+    calls = _fake_discovery(monkeypatch, "https://example.com/feed")
+    assert latest_from_sources._get_site_feed_url("https://www.example.com/") == "https://example.com/feed"
+    assert latest_from_sources._get_site_feed_url("example.com") == "https://example.com/feed"
+    assert calls == ["https://www.example.com/"]
+    row = db_session.query(DiscoveredFeed).one()
+    assert (row.site_key, row.feed_url) == ("example.com", "https://example.com/feed")
+
+
+def test_no_feed_found_is_cached_for_the_negative_ttl(db_session, monkeypatch):
+    calls = _fake_discovery(monkeypatch, None)
+    assert latest_from_sources._get_site_feed_url("https://nofeed.example.com") is None
+    assert latest_from_sources._get_site_feed_url("https://nofeed.example.com") is None
+    assert len(calls) == 1
+
+    row = db_session.query(DiscoveredFeed).one()
+    row.checked_at = datetime.now(timezone.utc) - timedelta(hours=settings.feed_discovery_negative_ttl_hours + 1)
+    db_session.commit()
+    assert latest_from_sources._get_site_feed_url("https://nofeed.example.com") is None
+    assert len(calls) == 2
+
+
+def test_stale_discovery_is_revalidated_and_updated(db_session, monkeypatch):
+    stale = datetime.now(timezone.utc) - timedelta(hours=settings.feed_discovery_ttl_hours + 1)
+    db_session.add(DiscoveredFeed(site_key="example.com", feed_url="https://example.com/old", checked_at=stale))
+    db_session.commit()
+    calls = _fake_discovery(monkeypatch, "https://example.com/new")
+    assert latest_from_sources._get_site_feed_url("https://example.com") == "https://example.com/new"
+    assert len(calls) == 1
+    db_session.expire_all()
+    row = db_session.query(DiscoveredFeed).one()
+    assert row.feed_url == "https://example.com/new"
+    assert latest_from_sources._discovery_is_fresh(row.feed_url, row.checked_at)
+
+
+def test_forgotten_discovery_is_run_again(db_session, monkeypatch):
+    calls = _fake_discovery(monkeypatch, "https://example.com/feed")
+    latest_from_sources._get_site_feed_url("https://example.com")
+    latest_from_sources._forget_site_feed_url("https://example.com/")
+    latest_from_sources._get_site_feed_url("https://example.com")
+    assert len(calls) == 2
+
+
+def test_discovery_runs_without_cache_when_db_is_unavailable(monkeypatch):
+    import app.db
+
+    def broken_session():
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(app.db, "SessionLocal", broken_session)
+    calls = _fake_discovery(monkeypatch, "https://example.com/feed")
+    assert latest_from_sources._get_site_feed_url("https://example.com") == "https://example.com/feed"
+    assert calls == ["https://example.com"]
+
+
+def test_discovery_freshness_depends_on_result(monkeypatch):
+    monkeypatch.setattr(settings, "feed_discovery_ttl_hours", 168)
+    monkeypatch.setattr(settings, "feed_discovery_negative_ttl_hours", 24)
+    two_days_ago = datetime.now(timezone.utc) - timedelta(days=2)
+    assert latest_from_sources._discovery_is_fresh("https://example.com/feed", two_days_ago)
+    assert not latest_from_sources._discovery_is_fresh(None, two_days_ago)
+    # Naive timestamps (SQLite) are read as UTC
+    assert latest_from_sources._discovery_is_fresh(None, two_days_ago.replace(tzinfo=None) + timedelta(days=1, hours=1))
+    assert not latest_from_sources._discovery_is_fresh("https://example.com/feed", None)
+
+
+def test_batched_linkedin_results_stream_before_slow_sources(monkeypatch):
+    import time
+    from concurrent.futures import Future
+
+    from app.models.database import Source, SourceType
+    from app.services.latest_from_sources import LatestItem, SourceLatestResult
+
+    class ImmediateBatcher:
+        def submit(self, url):
+            future = Future()
+            future.set_result(([LatestItem(url=url + "/post", title="post", published_at=None)], None))
+            return future
+
+    def slow_fetch(source, youtube_uploads=None, use_cache=True):
+        time.sleep(0.3)
+        return SourceLatestResult(
+            source_id=source.id, source_type=source.type.value, source_url=source.url,
+            source_name=None, latest=None, error="slow",
+        )
+
+    monkeypatch.setattr(settings, "apify_api_token", "token")
+    monkeypatch.setattr(latest_from_sources, "_linkedin_batcher", ImmediateBatcher())
+    monkeypatch.setattr(latest_from_sources, "_fetch_latest_safe", slow_fetch)
+    sources = [
+        Source(id=1, type=SourceType.NEWS, url="https://slow.example.com/feed"),
+        Source(id=2, type=SourceType.LINKEDIN, url="https://www.linkedin.com/in/someone"),
+    ]
+    start = time.monotonic()
+    stream = latest_from_sources.iter_latest_results(sources, use_cache=False)
+    source, result = next(stream)
+    assert source.id == 2 and result.latest.url == "https://www.linkedin.com/in/someone/post"
+    assert time.monotonic() - start < 0.2
+    assert [s.id for s, _ in stream] == [1]
+
+
+def test_linkedin_profile_spellings_share_one_batch_target(monkeypatch):
+    from concurrent.futures import Future
+
+    from app.models.database import Source, SourceType
+
+    submitted = []
+
+    class RecordingBatcher:
+        def submit(self, url):
+            submitted.append(url)
+            future = Future()
+            future.set_result(([], None))
+            return future
+
+    monkeypatch.setattr(settings, "apify_api_token", "token")
+    monkeypatch.setattr(latest_from_sources, "_linkedin_batcher", RecordingBatcher())
+    monkeypatch.setattr(latest_from_sources, "_fetch_recent_from_linkedin_fallback", lambda url: ([], "none"))
+    sources = [
+        Source(id=1, type=SourceType.LINKEDIN, url="https://www.linkedin.com/in/Jane-Doe/"),
+        Source(id=2, type=SourceType.LINKEDIN, url="linkedin.com/in/jane-doe?trk=profile"),
+    ]
+    results = latest_from_sources.fetch_latest_results(sources, use_cache=False)
+    assert submitted == ["https://www.linkedin.com/in/jane-doe"]
+    assert [r.source_id for r in results] == [1, 2]
+    latest_from_sources._fetch_recent_from_linkedin_apify("https://LinkedIn.com/in/jane-doe/", "token")
+    assert submitted[-1] == "https://www.linkedin.com/in/jane-doe"
+
+
+def test_linkedin_batch_asks_for_one_post_per_profile(monkeypatch):
+    payloads = []
+
+    def fake_run_actor(actor_id, payload, token, **kwargs):
+        payloads.append(payload)
+        return ([{"linkedinUrl": "https://www.linkedin.com/posts/1", "author": {"publicIdentifier": "jane-doe"}}], None)
+
+    monkeypatch.setattr(latest_from_sources, "run_actor", fake_run_actor)
+    out = latest_from_sources._run_linkedin_batch(["https://www.linkedin.com/in/jane-doe"])
+    assert payloads[0]["maxPosts"] == 1
+    assert out["https://www.linkedin.com/in/jane-doe"][0][0].url == "https://www.linkedin.com/posts/1"
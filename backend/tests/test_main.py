@@ -21,6 +21,14 @@ def test_health(client):
     assert r.json() == {"status": "ok"}
 
 
+def test_youtube_quota(client):
+    r = client.get("/quota/youtube")
+    assert r.status_code == 200
+    data = r.json()
+    assert data["remaining"] <= data["daily_limit"]
+    assert "background_remaining" in data
+
+
 def test_tables(client):
     r = client.get("/tables")
     assert r.status_code == 200
@@ -50,3 +58,92 @@ def test_multi_url_empty(client):
     r = client.post("/summaries/multi-url", json={"urls": []})
     assert r.status_code == 400
     assert "urls" in (r.json().get("detail") or "").lower()
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict]]:
+    import json
+
+    events = []
+    for block in body.split("\n\n"):
+        if not block.strip():
+            continue
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+@pytest.fixture
+def stream_sources(db_session, monkeypatch):
+    """Two users: the default user 1 with one source, and a@example.com with an ingested and a new source."""
+    from datetime import datetime, timezone
+
+    from app.models.database import Item, Source, SourceType, User
+    from app.services import ingestion
+    from app.services.latest_from_sources import LatestItem, SourceLatestResult
+
+    ingestion._seen.clear()
+    default_user = User(google_id="g-default", email="default@example.com")
+    user = User(google_id="g-a", email="a@example.com")
+    db_session.add_all([default_user, user])
+    db_session.flush()
+    other = Source(user_id=default_user.id, type=SourceType.NEWS, url="https://other.example.com/feed")
+    ingested = Source(
+        user_id=user.id, type=SourceType.NEWS, url="https://ingested.example.com/feed",
+        last_fetched_at=datetime.now(timezone.utc),
+    )
+    new = Source(user_id=user.id, type=SourceType.NEWS, url="https://new.example.com/feed")
+    db_session.add_all([other, ingested, new])
+    db_session.flush()
+    db_session.add(Item(
+        source_id=ingested.id, external_id="https://ingested.example.com/1", title="Stored item",
+        link="https://ingested.example.com/1", published_at=datetime(2026, 1, 1, tzinfo=timezone.utc),
+    ))
+    db_session.commit()
+
+    def fake_iter(sources, use_cache=True):
+        for s in sources:
+            yield s, SourceLatestResult(
+                source_id=s.id, source_type=s.type.value, source_url=s.url, source_name=s.name,
+                latest=None, error="Feed unreachable",
+            )
+
+    monkeypatch.setattr(ingestion, "iter_latest_results", fake_iter)
+    return {"ingested": ingested.id, "new": new.id, "other": other.id}
+
+
+def test_sources_latest_stream_sends_one_event_per_source_then_done(client, stream_sources):
+    r = client.get("/sources/latest/stream", headers={"X-User-Email": "A@example.com"})
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/event-stream")
+    assert r.text.endswith("\n\n")
+    events = _parse_sse(r.text)
+    assert [name for name, _ in events] == ["source", "source", "done"]
+    by_id = {data["source_id"]: data for _, data in events[:2]}
+    assert set(by_id) == {stream_sources["ingested"], stream_sources["new"]}
+    assert by_id[stream_sources["ingested"]]["latest"]["title"] == "Stored item"
+    assert by_id[stream_sources["new"]]["error"] == "Feed unreachable"
+    assert events[-1] == ("done", {"count": 2, "errors": 1})
+
+
+def test_briefings_stream_sends_cards_for_the_requesting_user_only(client, stream_sources):
+    events = _parse_sse(client.get("/briefings/stream", headers={"X-User-Email": "a@example.com"}).text)
+    cards = [data for name, data in events if name == "briefing"]
+    assert {c["id"] for c in cards} == {stream_sources["ingested"], stream_sources["new"]}
+    stored = next(c for c in cards if c["id"] == stream_sources["ingested"])
+    assert stored["title"] == "Stored item" and stored["url"] == "https://ingested.example.com/1"
+    assert events[-1] == ("done", {"count": 2, "errors": 1})
+
+    # No (or an unknown) X-User-Email falls back to user 1
+    events = _parse_sse(client.get("/briefings/stream").text)
+    assert [data["id"] for name, data in events if name == "briefing"] == [stream_sources["other"]]
+    events = _parse_sse(client.get("/briefings/stream", headers={"X-User-Email": "nobody@example.com"}).text)
+    assert [data["id"] for name, data in events if name == "briefing"] == [stream_sources["other"]]
+
+
+def test_stream_without_sources_sends_only_done(client, db_session):
+    from app.models.database import User
+
+    db_session.add(User(google_id="g-empty", email="empty@example.com"))
+    db_session.commit()
+    events = _parse_sse(client.get("/sources/latest/stream", headers={"X-User-Email": "empty@example.com"}).text)
+    assert events == [("done", {"count": 0, "errors": 0})]
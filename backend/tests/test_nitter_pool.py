@@ -0,0 +1,42 @@
+"""
+Tests for the Nitter instance pool (app.services.nitter_pool).
+"""
+import threading
+import time
+
+from app.config import settings
+from app.services import nitter_pool
+
+FEED = object()
+
+
+def test_hedged_request_to_runner_up_wins(monkeypatch):
+    monkeypatch.setattr(settings, "nitter_base_urls", "https://slow.nitter.test,https://fast.nitter.test")
+    monkeypatch.setattr(settings, "nitter_hedge_after_seconds", 0.05)
+    release = threading.Event()
+
+    def fake_fetch(base, path, headers, max_entries=None):
+        if "slow" in base:
+            release.wait(2)
+            raise TimeoutError("slow")
+        return FEED
+
+    monkeypatch.setattr(nitter_pool, "_fetch_from", fake_fetch)
+    start = time.monotonic()
+    assert nitter_pool.fetch_nitter_feed("/jack/rss") is FEED
+    assert time.monotonic() - start < 1
+    release.set()
+
+
+def test_failed_instances_rank_last(monkeypatch):
+    monkeypatch.setattr(settings, "nitter_base_urls", "https://a.nitter.test,https://b.nitter.test")
+    for _ in range(5):
+        nitter_pool._record("https://a.nitter.test", False, 0.1, "down")
+    nitter_pool._record("https://b.nitter.test", True, 0.3)
+    assert nitter_pool.ranked_instances() == ["https://b.nitter.test", "https://a.nitter.test"]
+
+
+def test_to_x_url_rewrites_instance_links(monkeypatch):
+    monkeypatch.setattr(settings, "nitter_base_urls", "https://nitter.test")
+    assert nitter_pool.to_x_url("https://nitter.test/jack/status/20#m") == "https://x.com/jack/status/20"
+    assert nitter_pool.to_x_url("https://example.com/a") == "https://example.com/a"
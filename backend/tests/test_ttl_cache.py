@@ -0,0 +1,38 @@
+"""
+Tests for the stale-while-revalidate cache (app.ttl_cache).
+"""
+import threading
+import time
+
+from app.ttl_cache import TTLCache
+
+
+def test_fresh_hit_does_not_reload():
+    cache = TTLCache(ttl=60)
+    loads = []
+    assert cache.get_or_load("k", lambda: loads.append(1) or "v1") == "v1"
+    assert cache.get_or_load("k", lambda: loads.append(1) or "v2") == "v1"
+    assert len(loads) == 1
+
+
+def test_stale_hit_served_while_refreshing():
+    cache = TTLCache(ttl=0.01, stale_ttl=60)
+    cache.get_or_load("k", lambda: "old")
+    time.sleep(0.02)
+    refreshed = threading.Event()
+
+    def reload():
+        refreshed.set()
+        return "new"
+
+    assert cache.get_or_load("k", reload) == "old"
+    assert refreshed.wait(1)
+    time.sleep(0.05)
+    assert cache.get_or_load("k", lambda: "unused") == "new"
+
+
+def test_expired_entry_is_reloaded():
+    cache = TTLCache(ttl=0.01, stale_ttl=0)
+    cache.get_or_load("k", lambda: "old")
+    time.sleep(0.02)
+    assert cache.get_or_load("k", lambda: "new") == "new"
@@ -0,0 +1,94 @@
+"""
+Tests for X posts by topic (app.services.x_by_topics).
+"""
+import threading
+import time
+
+from app.services import apify_client, x_by_topics
+
+
+def test_fetch_posts_by_topics_runs_concurrently_and_caches_per_topic(monkeypatch):
+    calls = []
+
+    def fake_apify(topic, api_token):
+        calls.append(topic)
+        time.sleep(0.2)
+        return ({"url": f"https://x.com/{topic}/status/1", "title": topic, "published_at": None}, None)
+
+    monkeypatch.setattr(x_by_topics.settings, "apify_api_token", "token")
+    monkeypatch.setattr(x_by_topics, "_fetch_post_for_topic_apify", fake_apify)
+    monkeypatch.setattr(x_by_topics, "_post_cache", x_by_topics.TTLCache(ttl=60))
+    start = time.monotonic()
+    result = x_by_topics.fetch_posts_by_topics(["a", "b", "c", "d", "e", " "])
+    assert time.monotonic() - start < 0.5
+    assert [r["topic"] for r in result] == ["a", "b", "c", "d", "e"]
+    assert result[1]["post"]["url"] == "https://x.com/b/status/1"
+    x_by_topics.fetch_posts_by_topics(["A", "b "])
+    assert sorted(calls) == ["a", "b", "c", "d", "e"]
+
+
+class _InFlight:
+    """Counts concurrent calls and remembers the peak."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.now = 0
+        self.peak = 0
+
+    def __enter__(self):
+        with self.lock:
+            self.now += 1
+            self.peak = max(self.peak, self.now)
+
+    def __exit__(self, *exc):
+        with self.lock:
+            self.now -= 1
+
+
+def _limit_apify_runs(monkeypatch, slots, run):
+    monkeypatch.setattr(x_by_topics.settings, "apify_api_token", "token")
+    monkeypatch.setattr(x_by_topics, "_post_cache", x_by_topics.TTLCache(ttl=60))
+    monkeypatch.setattr(apify_client, "_run_slots", threading.BoundedSemaphore(slots))
+    monkeypatch.setattr(apify_client, "_run_actor", run)
+
+
+def test_apify_runs_are_limited_by_their_own_run_slots(monkeypatch):
+    runs = _InFlight()
+
+    def fake_run(actor_id, payload, api_token, *, run_timeout, max_wait):
+        with runs:
+            time.sleep(0.05)
+        return ([{"postUrl": f"https://x.com/i/status/{payload['query']}", "postText": "post"}], None)
+
+    def no_nitter(topic):
+        raise AssertionError("Nitter should not be called")
+
+    _limit_apify_runs(monkeypatch, 2, fake_run)
+    monkeypatch.setattr(x_by_topics, "_fetch_post_for_topic_nitter", no_nitter)
+    result = x_by_topics.fetch_posts_by_topics([f"topic{n}" for n in range(8)])
+    assert runs.peak == 2
+    assert all(r["post"]["url"].endswith(r["topic"]) for r in result)
+
+
+def test_nitter_fallback_does_not_hold_apify_run_slots(monkeypatch):
+    nitter = _InFlight()
+
+    def fake_nitter(topic):
+        with nitter:
+            time.sleep(0.05)
+        return ({"url": f"https://x.com/i/status/{topic}", "title": topic, "published_at": None}, None)
+
+    _limit_apify_runs(monkeypatch, 1, lambda *args, **kwargs: ([], None))
+    monkeypatch.setattr(x_by_topics, "_fetch_post_for_topic_nitter", fake_nitter)
+    result = x_by_topics.fetch_posts_by_topics([f"topic{n}" for n in range(6)])
+    assert nitter.peak > 1
+    assert [r["post"]["title"] for r in result] == [f"topic{n}" for n in range(6)]
+
+
+def test_failed_topic_search_is_not_cached(monkeypatch):
+    monkeypatch.setattr(x_by_topics.settings, "apify_api_token", "")
+    monkeypatch.setattr(x_by_topics, "_post_cache", x_by_topics.TTLCache(ttl=60))
+    monkeypatch.setattr(x_by_topics, "_fetch_post_for_topic_nitter", lambda topic: (None, "Nitter search failed"))
+    assert x_by_topics.fetch_post_for_topic("ai") == (None, "Nitter search failed")
+    monkeypatch.setattr(x_by_topics, "_fetch_post_for_topic_nitter", lambda topic: (None, None))
+    assert x_by_topics.fetch_post_for_topic("ai") == (None, None)
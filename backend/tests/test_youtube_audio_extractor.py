@@ -0,0 +1,106 @@
+"""
+Tests for YouTube channel resolution (app.models.scrapper.youtube_audio_extractor).
+"""
+import httpx
+import pytest
+
+from app.models.database import YoutubeChannel
+from app.models.scrapper import youtube_audio_extractor as yt
+
+
+def _channel_id(n):
+    return f"UC{n:022d}"
+
+
+def _channel_url(n):
+    return f"https://www.youtube.com/channel/{_channel_id(n)}"
+
+
+class FakeClient:
+    """Answers channels.list from a {channel_id: uploads_id or None} table; records each call."""
+
+    def __init__(self, uploads, fail_batches=()):
+        self.uploads = uploads
+        self.fail_batches = set(fail_batches)
+        self.calls = []
+
+    def get(self, url, params=None):
+        assert url == yt.YT_CHANNELS_URL
+        ids = params["id"].split(",")
+        self.calls.append(ids)
+        request = httpx.Request("GET", url)
+        if len(self.calls) - 1 in self.fail_batches:
+            return httpx.Response(500, request=request)
+        items = []
+        for cid in ids:
+            if cid not in self.uploads:
+                continue
+            uploads_id = self.uploads[cid]
+            details = {"relatedPlaylists": {"uploads": uploads_id}} if uploads_id else {}
+            items.append({"id": cid, "contentDetails": details})
+        return httpx.Response(200, json={"items": items}, request=request)
+
+
+@pytest.fixture
+def fake_youtube(monkeypatch, db_session):
+    monkeypatch.setattr(yt, "_get_youtube_api_key", lambda: "key")
+    monkeypatch.setattr(yt.youtube_quota, "spend", lambda endpoint: True)
+
+    def install(client):
+        monkeypatch.setattr(yt, "get_client", lambda url: client)
+        return client
+
+    return install
+
+
+def test_channels_list_batches_fifty_ids_per_call(fake_youtube):
+    uploads = {_channel_id(n): f"UU{n}" for n in range(120)}
+    client = fake_youtube(FakeClient(uploads))
+    urls = [_channel_url(n) for n in range(120)]
+    out = yt.resolve_uploads_playlists(urls + urls[:3])
+    assert [len(ids) for ids in client.calls] == [50, 50, 20]
+    assert sorted(cid for ids in client.calls for cid in ids) == sorted(uploads)
+    assert out[_channel_url(7)] == ("UU7", None)
+    assert len(out) == 120
+
+
+def test_resolved_channels_are_cached(fake_youtube, db_session):
+    client = fake_youtube(FakeClient({_channel_id(1): "UU1", _channel_id(2): "UU2"}))
+    urls = [_channel_url(1), _channel_url(2)]
+    assert yt.resolve_uploads_playlists(urls) == {urls[0]: ("UU1", None), urls[1]: ("UU2", None)}
+    assert len(client.calls) == 1
+    assert db_session.query(YoutubeChannel).count() == 2
+
+    # Same channels written differently (no scheme, trailing slash) hit the cache
+    again = ["youtube.com/channel/" + _channel_id(1) + "/", urls[1]]
+    assert yt.resolve_uploads_playlists(again) == {again[0]: ("UU1", None), again[1]: ("UU2", None)}
+    assert len(client.calls) == 1
+
+
+def test_only_uncached_channels_are_requested(fake_youtube):
+    client = fake_youtube(FakeClient({_channel_id(1): "UU1", _channel_id(2): "UU2"}))
+    yt.resolve_uploads_playlists([_channel_url(1)])
+    yt.resolve_uploads_playlists([_channel_url(1), _channel_url(2)])
+    assert client.calls == [[_channel_id(1)], [_channel_id(2)]]
+
+
+def test_missing_and_partial_items_are_reported_and_not_cached(fake_youtube, db_session):
+    # Channel 2 has no contentDetails.uploads, channel 3 is absent from the response
+    client = fake_youtube(FakeClient({_channel_id(1): "UU1", _channel_id(2): None}))
+    urls = [_channel_url(n) for n in (1, 2, 3)]
+    out = yt.resolve_uploads_playlists(urls)
+    assert out[urls[0]] == ("UU1", None)
+    assert out[urls[1]] == (None, "Channel has no uploads playlist")
+    assert out[urls[2]] == (None, "Channel has no uploads playlist")
+    assert [r.channel_id for r in db_session.query(YoutubeChannel)] == [_channel_id(1)]
+    yt.resolve_uploads_playlists(urls)
+    assert client.calls[-1] == [_channel_id(2), _channel_id(3)]
+
+
+def test_failed_batch_reports_error_and_keeps_other_batches(fake_youtube):
+    uploads = {_channel_id(n): f"UU{n}" for n in range(60)}
+    fake_youtube(FakeClient(uploads, fail_batches=[0]))
+    out = yt.resolve_uploads_playlists([_channel_url(n) for n in range(60)])
+    assert out[_channel_url(0)][0] is None
+    assert out[_channel_url(0)][1].startswith("YouTube API channels failed")
+    assert out[_channel_url(55)] == ("UU55", None)
@@ -0,0 +1,53 @@
+"""
+Tests for YouTube videos by topic (app.services.youtube_by_topics).
+"""
+from app.services import youtube_by_topics
+
+
+def test_best_video_merges_statistics_and_caches_searches(monkeypatch):
+    searches, stats_calls = [], []
+
+    def fake_search(topic, api_key):
+        searches.append(topic)
+        return [(f"{topic}{i}", {"title": f"{topic} {i}"}) for i in range(3)]
+
+    def fake_views(video_ids, api_key):
+        stats_calls.append(video_ids)
+        return {"b1": 50_000, "a0": 20_000}
+
+    monkeypatch.setattr(youtube_by_topics, "_get_youtube_api_key", lambda: "key")
+    monkeypatch.setattr(youtube_by_topics, "_search_topic", fake_search)
+    monkeypatch.setattr(youtube_by_topics, "_fetch_view_counts", fake_views)
+    monkeypatch.setattr(youtube_by_topics, "_search_cache", youtube_by_topics.TTLCache(ttl=60))
+    best, err = youtube_by_topics.fetch_single_best_video_by_topics(["a", "b", ""])
+    assert err is None
+    assert best["topic"] == "b" and best["video"]["view_count"] == 50_000
+    assert stats_calls == [["a0", "a1", "a2", "b0", "b1", "b2"]]
+    youtube_by_topics.fetch_single_best_video_by_topics(["A ", "b"])
+    assert sorted(searches) == ["a", "b"]
+
+
+def test_view_counts_are_fetched_fifty_ids_per_call(monkeypatch):
+    requested = []
+
+    class FakeResponse:
+        status_code = 200
+
+        def __init__(self, ids):
+            self._ids = ids
+
+        def json(self):
+            return {"items": [{"id": i, "statistics": {"viewCount": "7"}} for i in self._ids]}
+
+    class FakeClient:
+        def get(self, url, params):
+            ids = params["id"].split(",")
+            requested.append(len(ids))
+            return FakeResponse(ids)
+
+    monkeypatch.setattr(youtube_by_topics, "get_client", lambda url: FakeClient())
+    monkeypatch.setattr(youtube_by_topics.youtube_quota, "spend", lambda endpoint: True)
+    ids = [f"v{i}" for i in range(120)] + ["v0"]
+    stats = youtube_by_topics._fetch_view_counts(ids, "key")
+    assert requested == [50, 50, 20]
+    assert len(stats) == 120 and stats["v119"] == 7
@@ -0,0 +1,101 @@
+"""
+Tests for the YouTube API quota budget (app.services.youtube_quota).
+"""
+from app.config import settings
+from app.services import youtube_quota
+
+
+def test_background_work_leaves_interactive_reserve(monkeypatch):
+    monkeypatch.setattr(youtube_quota, "_persist", lambda day, units: None)
+    monkeypatch.setattr(youtube_quota, "_load_used", lambda day: 0)
+    for name, value in (("_day", None), ("_used", 0), ("_by_endpoint", {}), ("_exhausted", False)):
+        monkeypatch.setattr(youtube_quota, name, value)
+    monkeypatch.setattr(settings, "youtube_daily_quota", 300)
+    monkeypatch.setattr(settings, "youtube_quota_interactive_reserve", 150)
+
+    with youtube_quota.quota_priority(youtube_quota.BACKGROUND):
+        assert youtube_quota.spend("search")
+        assert not youtube_quota.spend("search")
+        assert youtube_quota.spend("videos")
+    assert youtube_quota.spend("search")
+    assert not youtube_quota.spend("search")
+    status = youtube_quota.quota_status()
+    assert status["used"] == 201
+    assert status["by_endpoint"] == {"search": 200, "videos": 1}
+
+
+def _reset(monkeypatch, day="2026-01-01"):
+    for name, value in (
+        ("_day", None), ("_used", 0), ("_by_endpoint", {}), ("_exhausted", False),
+        ("_persisted", 0), ("_last_persist", 0.0),
+    ):
+        monkeypatch.setattr(youtube_quota, name, value)
+    monkeypatch.setattr(youtube_quota, "_today", lambda: day)
+    monkeypatch.setattr(settings, "youtube_daily_quota", 10000)
+    monkeypatch.setattr(settings, "youtube_quota_interactive_reserve", 0)
+
+
+def test_usage_is_persisted_periodically_not_per_call(monkeypatch):
+    _reset(monkeypatch)
+    writes = []
+
+    def persist(day, units):
+        assert not youtube_quota._lock.locked()
+        writes.append((day, units))
+        return True
+
+    def load(day):
+        assert not youtube_quota._lock.locked()
+        return 40
+
+    monkeypatch.setattr(youtube_quota, "_persist", persist)
+    monkeypatch.setattr(youtube_quota, "_load_used", load)
+    monkeypatch.setattr(settings, "youtube_quota_persist_interval_seconds", 3600)
+    for _ in range(5):
+        assert youtube_quota.spend("videos")
+    assert writes == []
+    youtube_quota.flush()
+    assert writes == [("2026-01-01", 45)]
+    youtube_quota.flush()
+    assert len(writes) == 1
+
+    monkeypatch.setattr(settings, "youtube_quota_persist_interval_seconds", 0)
+    assert youtube_quota.spend("search")
+    assert writes[-1] == ("2026-01-01", 145)
+
+
+def test_day_rollover_persists_previous_day(monkeypatch):
+    _reset(monkeypatch)
+    writes = []
+    monkeypatch.setattr(youtube_quota, "_persist", lambda day, units: writes.append((day, units)) or True)
+    monkeypatch.setattr(youtube_quota, "_load_used", lambda day: 0)
+    monkeypatch.setattr(settings, "youtube_quota_persist_interval_seconds", 3600)
+    assert youtube_quota.spend("search")
+    monkeypatch.setattr(youtube_quota, "_today", lambda: "2026-01-02")
+    assert youtube_quota.spend("videos")
+    assert writes == [("2026-01-01", 100)]
+    assert youtube_quota.quota_status()["used"] == 1
+
+
+def test_persist_failure_is_logged(monkeypatch, caplog):
+    _reset(monkeypatch)
+
+    class BrokenSession:
+        def __enter__(self):
+            raise RuntimeError("database is down")
+
+        def __exit__(self, *exc):
+            return False
+
+    import app.db
+
+    monkeypatch.setattr(app.db, "SessionLocal", BrokenSession)
+    monkeypatch.setattr(settings, "youtube_quota_persist_interval_seconds", 3600)
+    with caplog.at_level("WARNING", logger=youtube_quota.__name__):
+        assert youtube_quota.spend("videos")
+        youtube_quota.flush()
+    messages = [r.getMessage() for r in caplog.records]
+    assert any("could not load usage" in m for m in messages)
+    assert any("could not persist 1 units" in m for m in messages)
+    # Not marked as written, so the next flush tries again
+    assert youtube_quota._persisted == 0